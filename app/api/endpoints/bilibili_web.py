@@ -131,6 +131,55 @@ async def fetch_user_post_videos(request: Request,
         raise HTTPException(status_code=status_code, detail=detail.dict())
 
 
+# 一次获取用户发布视频作品的多页数据
+@router.get("/fetch_user_post_videos_pages", response_model=ResponseModel,
+            summary="一次获取用户主页作品的多页数据/Get several pages of user homepage video data")
+async def fetch_user_post_videos_pages(request: Request,
+                                       uid: str = Query(example="178360345", description="用户UID"),
+                                       pn: int = Query(default=1, ge=1, description="起始页码/First page number"),
+                                       pages: int = Query(default=5, ge=1, le=20, description="页数/Number of pages"),):
+    """
+    # [中文]
+    ### 用途:
+    - 一次获取用户发布视频的多页数据，各页整批签名后并发请求
+    ### 参数:
+    - uid: 用户UID
+    - pn: 起始页码
+    - pages: 页数，最多20页
+    ### 返回:
+    - 按页码顺序的列表，每项为 {input, data, error}，input 为页码
+    - 单页失败不影响其余页
+
+    # [English]
+    ### Purpose:
+    - Get several pages of a user's videos at once, the pages are signed in one go and requested concurrently
+    ### Parameters:
+    - uid: User UID
+    - pn: First page number
+    - pages: Number of pages, at most 20
+    ### Return:
+    - A list in page order, each item is {input, data, error} with the page number as input
+    - One failed page does not affect the others
+
+    # [示例/Example]
+    uid = "178360345"
+    pn = 1
+    pages = 5
+    """
+    try:
+        data = await bilibili_web_crawler.fetch_user_post_videos_pages(uid, list(range(pn, pn + pages)))
+        return ResponseModel(code=200,
+                             router=request.url.path,
+                             data=data)
+    except Exception as e:
+        status_code = 400
+        detail = ErrorResponseModel(code=status_code,
+                                    router=request.url.path,
+                                    params=dict(request.query_params),
+                                    )
+        raise HTTPException(status_code=status_code, detail=detail.dict())
+
+
 # 获取用户所有收藏夹信息
 @router.get("/fetch_collect_folders", response_model=ResponseModel,
             summary="获取用户所有收藏夹信息/Get user collection folders")
@@ -7,6 +7,7 @@ from fastapi import APIRouter, Body, Query, Request, HTTPException
 from app.api.models.APIResponseModel import ResponseModel, ErrorResponseModel
 
 from crawlers.douyin.web.web_crawler import DouyinWebCrawler
+from crawlers.utils.projection import compile_fields, project_fields
 
 from path_config import setup_project_paths
 setup_project_paths()
@@ -18,9 +19,11 @@ douyin_crawler = DouyinWebCrawler()
 
 @router.get("/fetch_one_video", response_model=ResponseModel, summary="获取单个作品数据/Get single video data")
 async def fetch_one_video(request: Request,
-                          aweme_id: str = Query(example="7372484719365098803", description="作品id/Video id")):
+                          aweme_id: str = Query(example="7372484719365098803", description="作品id/Video id"),
+                          fields: str = Query(default=None, description="逗号分隔的字段路径，只返回这些字段/Comma-separated field paths to return")):
     try:
         data = await douyin_crawler.fetch_one_video(aweme_id)
+        data = project_fields(data, fields)
         return ResponseModel(code=200, router=request.url.path, data=data)
     except Exception as e:
         status_code = 400
@@ -31,9 +34,43 @@ async def fetch_one_video(request: Request,
 async def fetch_user_post_videos(request: Request,
                                  sec_user_id: str = Query(example="MS4wLjABAAAANXSltcLCzDGmdNFI2Q_QixVTr67NiYzjKOIP5s03CAE", description="用户sec_user_id/User sec_user_id"),
                                  max_cursor: int = Query(default=0, description="最大游标/Maximum cursor"),
-                                 count: int = Query(default=20, description="每页数量/Number per page")):
+                                 count: int = Query(default=20, description="每页数量/Number per page"),
+                                 fields: str = Query(default=None, description="逗号分隔的字段路径，应用于 aweme_list 中的每个作品/Comma-separated field paths applied to each item of aweme_list")):
     try:
-        data = await douyin_crawler.fetch_user_post_videos(sec_user_id, max_cursor, count)
+        if fields:
+            # 边读取边投影作品，不构建完整的响应树；游标等分页字段原样保留
+            # Project the posts while streaming without building the full response tree; paging fields are kept as is
+            projection = compile_fields(fields)
+            envelope = {}
+            aweme_list = [aweme async for aweme in douyin_crawler.stream_user_post_videos(
+                sec_user_id, max_cursor, count, project=projection, envelope=envelope)]
+            data = dict(envelope, aweme_list=aweme_list)
+        else:
+            data = await douyin_crawler.fetch_user_post_videos(sec_user_id, max_cursor, count)
+        return ResponseModel(code=200, router=request.url.path, data=data)
+    except Exception as e:
+        status_code = 400
+        detail = ErrorResponseModel(code=status_code, router=request.url.path, params=dict(request.query_params))
+        raise HTTPException(status_code=status_code, detail=detail.dict())
+
+@router.post("/fetch_many_user_post_videos", response_model=ResponseModel, summary="批量获取多个用户的主页作品数据/Get homepage videos of many users")
+async def fetch_many_user_post_videos(request: Request,
+                                      sec_user_ids: List[str] = Body(example=["MS4wLjABAAAANXSltcLCzDGmdNFI2Q_QixVTr67NiYzjKOIP5s03CAE"], description="用户sec_user_id列表/User sec_user_id list"),
+                                      max_cursor: int = Body(default=0, description="最大游标/Maximum cursor"),
+                                      count: int = Body(default=20, description="每页数量/Number per page")):
+    try:
+        data = await douyin_crawler.fetch_many_user_post_videos(sec_user_ids, max_cursor, count)
+        return ResponseModel(code=200, router=request.url.path, data=data)
+    except Exception as e:
+        status_code = 400
+        detail = ErrorResponseModel(code=status_code, router=request.url.path, params=dict(request.query_params))
+        raise HTTPException(status_code=status_code, detail=detail.dict())
+
+@router.post("/fetch_many_user_profiles", response_model=ResponseModel, summary="批量获取多个用户的信息/Get profiles of many users")
+async def fetch_many_user_profiles(request: Request,
+                                   sec_user_ids: List[str] = Body(example=["MS4wLjABAAAANXSltcLCzDGmdNFI2Q_QixVTr67NiYzjKOIP5s03CAE"], description="用户sec_user_id列表/User sec_user_id list", embed=True)):
+    try:
+        data = await douyin_crawler.fetch_many_user_profiles(sec_user_ids)
         return ResponseModel(code=200, router=request.url.path, data=data)
     except Exception as e:
         status_code = 400
@@ -26,6 +26,9 @@ if str(project_root) not in sys.path:
 
 from database import db_manager
 from cookie_manager import cookie_manager
+from crawlers.utils.token_pool import token_pools
+from crawlers.utils.signing import signing_service
+from crawlers.utils.resolution_cache import resolution_cache
 
 router = APIRouter()
 
@@ -99,6 +102,9 @@ async def service_status():
                     "cookies_count": len(cookies)
                 },
                 "cookie": cookie_status,
+                "token_pools": token_pools.stats(),
+                "signing": signing_service.stats(),
+                "resolution_cache": resolution_cache.stats(),
                 "features": {
                     "douyin_parsing": True,
                     "tiktok_parsing": True,
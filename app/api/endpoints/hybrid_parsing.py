@@ -1,11 +1,16 @@
 import asyncio
+from typing import List
 
 from fastapi import APIRouter, Body, Query, Request, HTTPException  # 导入FastAPI组件
+from fastapi.responses import StreamingResponse  # 导入流式响应
 
 from app.api.models.APIResponseModel import ResponseModel, ErrorResponseModel  # 导入响应模型
 
 # 爬虫/Crawler
 from crawlers.hybrid.hybrid_crawler import HybridCrawler  # 导入混合爬虫
+from crawlers.utils.batch import batch_runner  # 导入批量执行器
+from crawlers.utils.json_codec import dumps  # 导入JSON编码
+from crawlers.utils.projection import compile_fields, project_fields  # 导入字段投影
 
 HybridCrawler = HybridCrawler()  # 实例化混合爬虫
 
@@ -16,13 +21,17 @@ router = APIRouter()
             summary="混合解析单一视频接口/Hybrid parsing single video endpoint")
 async def hybrid_parsing_single_video(request: Request,
                                       url: str = Query(example="https://v.douyin.com/L4FJNR3/"),
-                                      minimal: bool = Query(default=False)):
+                                      minimal: bool = Query(default=False),
+                                      fields: str = Query(default=None,
+                                                          example="aweme_id,desc,video_data.nwm_video_url_HQ")):
     """
     # [中文]
     ### 用途:
     - 该接口用于解析抖音/TikTok单一视频的数据。
     ### 参数:
     - `url`: 视频链接、分享链接、分享文本。
+    - `minimal`: 是否只返回最小数据。
+    - `fields`: 可选，逗号分隔的字段路径，只返回这些字段，例如 `author.nickname`、`images[*].url_list[0]`。
     ### 返回:
     - `data`: 视频数据。
 
@@ -31,6 +40,8 @@ async def hybrid_parsing_single_video(request: Request,
     - This endpoint is used to parse data of a single Douyin/TikTok video.
     ### Parameters:
     - `url`: Video link, share link, or share text.
+    - `minimal`: Whether to return minimal data only.
+    - `fields`: Optional comma-separated field paths to return, e.g. `author.nickname`, `images[*].url_list[0]`.
     ### Returns:
     - `data`: Video data.
 
@@ -40,6 +51,8 @@ async def hybrid_parsing_single_video(request: Request,
     try:
         # 解析视频/Parse video
         data = await HybridCrawler.hybrid_parsing_single_video(url=url, minimal=minimal)
+        # 按需投影字段/Project the requested fields
+        data = project_fields(data, fields)
         # 返回数据/Return data
         return ResponseModel(code=200,
                              router=request.url.path,
@@ -51,3 +64,75 @@ async def hybrid_parsing_single_video(request: Request,
                                     params=dict(request.query_params),
                                     )
         raise HTTPException(status_code=status_code, detail=detail.dict())
+
+
+@router.post("/video_data_batch", tags=["Hybrid-API"],
+             summary="混合解析批量视频接口/Hybrid parsing batch video endpoint",
+             response_class=StreamingResponse,
+             responses={200: {"content": {"application/x-ndjson": {}}}})
+async def hybrid_parsing_batch_video(request: Request,
+                                     urls: List[str] = Body(example=["https://v.douyin.com/L4FJNR3/",
+                                                                     "https://www.tiktok.com/@taylorswift/video/7359655005701311786"]),
+                                     minimal: bool = Body(default=False),
+                                     fields: str = Body(default=None, example="aweme_id,desc"),
+                                     concurrency: int = Body(default=None, ge=1)):
+    """
+    # [中文]
+    ### 用途:
+    - 该接口用于批量解析抖音/TikTok视频的数据，每个链接解析完成后立即以一行JSON（NDJSON）返回。
+    ### 参数:
+    - `urls`: 视频链接、分享链接、分享文本列表，重复的链接只解析一次。
+    - `minimal`: 是否只返回最小数据。
+    - `fields`: 可选，逗号分隔的字段路径，只返回这些字段。
+    - `concurrency`: 可选，同时解析的最大数量，不能超过服务端配置。
+    ### 返回:
+    - 每行一个对象：`index` 为输入下标，`input` 为输入链接，成功时 `data` 为视频数据，失败时 `error` 为错误信息。
+    - 行的顺序为完成顺序，不是输入顺序。
+
+    # [English]
+    ### Purpose:
+    - This endpoint parses a batch of Douyin/TikTok videos and returns each one as a JSON line (NDJSON) as soon as it is parsed.
+    ### Parameters:
+    - `urls`: Video links, share links, or share texts; duplicate links are parsed once.
+    - `minimal`: Whether to return minimal data only.
+    - `fields`: Optional comma-separated field paths to return.
+    - `concurrency`: Optional maximum number parsed at once, capped by the server setting.
+    ### Returns:
+    - One object per line: `index` is the input index, `input` the input link, `data` the video data on success and `error` the error on failure.
+    - Lines arrive in completion order, not input order.
+
+    # [Example]
+    urls = ["https://v.douyin.com/L4FJNR3/", "https://www.tiktok.com/@taylorswift/video/7359655005701311786"]
+    """
+    # 响应开始后无法再返回错误状态码，先校验请求 / Validate first, the status code cannot change once streaming starts
+    try:
+        if not urls:
+            raise ValueError("urls must not be empty")
+        if len(urls) > batch_runner.max_items:
+            raise ValueError("urls must not exceed {0} items".format(batch_runner.max_items))
+        projection = compile_fields(fields) if fields else None
+    except Exception as e:
+        status_code = 400
+        detail = ErrorResponseModel(code=status_code,
+                                    message=str(e),
+                                    router=request.url.path,
+                                    params=dict(request.query_params),
+                                    )
+        raise HTTPException(status_code=status_code, detail=detail.dict())
+
+    concurrency = min(concurrency or batch_runner.concurrency, batch_runner.concurrency)
+
+    async def lines():
+        results = HybridCrawler.hybrid_parsing_videos(urls, minimal=minimal, concurrency=concurrency)
+        try:
+            async for index, result in results:
+                line = result.to_dict()
+                line["index"] = index
+                if projection is not None and result.ok:
+                    line["data"] = projection(result.data)
+                yield dumps(line) + b"\n"
+        finally:
+            # 客户端断开时取消剩余的解析 / Cancel the remaining parses when the client disconnects
+            await results.aclose()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
@@ -6,6 +6,7 @@ from fastapi import APIRouter, Query, Body, Request, HTTPException  # 导入Fast
 from app.api.models.APIResponseModel import ResponseModel, ErrorResponseModel  # 导入响应模型
 
 from crawlers.tiktok.web.web_crawler import TikTokWebCrawler  # 导入TikTokWebCrawler
+from crawlers.utils.projection import compile_fields  # 导入字段投影
 
 router = APIRouter()
 tiktok_web_crawler = TikTokWebCrawler()
@@ -106,7 +107,8 @@ async def fetch_user_post(request: Request,
                                               description="用户secUid/User secUid"),
                           cursor: int = Query(default=0, description="翻页游标标/Page cursor"),
                           count: int = Query(default=35, description="每页数量/Number per page"),
-                          coverFormat: int = Query(default=2, description="封面格式/Cover format")):
+                          coverFormat: int = Query(default=2, description="封面格式/Cover format"),
+                          fields: str = Query(default=None, description="逗号分隔的字段路径，应用于 itemList 中的每个作品/Comma-separated field paths applied to each item of itemList")):
     """
     # [中文]
     ### 用途
@@ -116,6 +118,7 @@ async def fetch_user_post(request: Request,
     - cursor: 翻页游标标
     - count: 每页数量
     - coverFormat: 封面格式
+    - fields: 可选，只返回每个作品的这些字段，作品边读取边投影
     ### 返回:
     - 用户的作品列表
 
@@ -127,6 +130,7 @@ async def fetch_user_post(request: Request,
     - cursor: Page cursor
     - count: Number per page
     - coverFormat: Cover format
+    - fields: Optional, only return these fields of each post, projected while the response streams in
     ### Return:
     - User posts
 
@@ -137,7 +141,70 @@ async def fetch_user_post(request: Request,
     coverFormat = 2
     """
     try:
-        data = await tiktok_web_crawler.fetch_user_post(secUid, cursor, count, coverFormat)
+        if fields:
+            # 边读取边投影作品，游标等分页字段原样保留 / Project posts while streaming, paging fields are kept as is
+            projection = compile_fields(fields)
+            envelope = {}
+            item_list = [item async for item in tiktok_web_crawler.stream_user_post(
+                secUid, cursor, count, coverFormat, project=projection, envelope=envelope)]
+            data = dict(envelope, itemList=item_list)
+        else:
+            data = await tiktok_web_crawler.fetch_user_post(secUid, cursor, count, coverFormat)
+        return ResponseModel(code=200,
+                             router=request.url.path,
+                             data=data)
+    except Exception as e:
+        status_code = 400
+        detail = ErrorResponseModel(code=status_code,
+                                    router=request.url.path,
+                                    params=dict(request.query_params),
+                                    )
+        raise HTTPException(status_code=status_code, detail=detail.dict())
+
+
+# 批量获取多个用户的作品列表
+@router.post("/fetch_many_user_post",
+             response_model=ResponseModel,
+             summary="批量获取多个用户的作品列表/Get posts of many users")
+async def fetch_many_user_post(request: Request,
+                               secUids: List[str] = Body(example=["MS4wLjABAAAAv7iSuuXDJGDvJkmH_vz1qkDZYo1apxgzaxdBSeIuPiM"],
+                                                         description="用户secUid列表/User secUid list"),
+                               cursor: int = Body(default=0, description="翻页游标标/Page cursor"),
+                               count: int = Body(default=35, description="每页数量/Number per page"),
+                               coverFormat: int = Body(default=2, description="封面格式/Cover format")):
+    """
+    # [中文]
+    ### 用途
+    - 批量获取多个用户的作品列表，整批请求一次签名
+    ### 参数:
+    - secUids: 用户secUid列表
+    - cursor: 翻页游标标
+    - count: 每页数量
+    - coverFormat: 封面格式
+    ### 返回:
+    - 与输入顺序一致的列表，每项为 {input, data, error}
+    - 单个用户失败不影响其余用户
+
+    # [English]
+    ### Purpose:
+    - Get the posts of many users, the whole batch is signed in one go
+    ### Parameters:
+    - secUids: User secUid list
+    - cursor: Page cursor
+    - count: Number per page
+    - coverFormat: Cover format
+    ### Return:
+    - A list in input order, each item is {input, data, error}
+    - One failed user does not affect the others
+
+    # [示例/Example]
+    secUids = ["MS4wLjABAAAAv7iSuuXDJGDvJkmH_vz1qkDZYo1apxgzaxdBSeIuPiM"]
+    cursor = 0
+    count = 35
+    coverFormat = 2
+    """
+    try:
+        data = await tiktok_web_crawler.fetch_many_user_post(secUids, cursor, count, coverFormat)
         return ResponseModel(code=200,
                              router=request.url.path,
                              data=data)
@@ -757,7 +824,10 @@ async def get_all_sec_user_id(request: Request,
     ### 参数:
     - url: 用户主页链接
     ### 返回:
-    - 用户id
+    - 与输入顺序一致的列表，每项为 {input, data, error}
+    - 成功时 data 为用户id，error 为 null；失败时 data 为 null，error 为 {type, message}
+    - 单个链接失败不影响其余链接
+    - 注意：此前每项直接是用户id字符串，且任一链接失败时整个请求返回400
 
     # [English]
     ### Purpose:
@@ -765,10 +835,24 @@ async def get_all_sec_user_id(request: Request,
     ### Parameters:
     - url: User homepage link
     ### Return:
-    - User id
+    - A list in input order, each item is {input, data, error}
+    - On success data is the user id and error is null; on failure data is null and error is {type, message}
+    - One failed link does not affect the others
+    - Note: each item used to be the bare user id string, and any failed link turned the whole request into a 400
 
     # [示例/Example]
     url = ["https://www.tiktok.com/@tiktok"]
+
+    # [返回示例/Response example]
+    data = [
+        {"input": "https://www.tiktok.com/@tiktok",
+         "data": "MS4wLjABAAAAv7iSuuXDJGDvJkmH_vz1qkDZYo1apxgzaxdBSeIuPiM",
+         "error": null},
+        {"input": "https://www.tiktok.com/@unavailable_user",
+         "data": null,
+         "error": {"type": "APINotFoundError",
+                   "message": "API Not Found Error: 页面不可用，可能是由于区域限制（代理）造成的。类名: SecUserIdFetcher."}}
+    ]
     """
     try:
         data = await tiktok_web_crawler.get_all_sec_user_id(url)
@@ -841,7 +925,10 @@ async def get_all_aweme_id(request: Request,
     ### 参数:
     - url: 作品链接
     ### 返回:
-    - 作品id
+    - 与输入顺序一致的列表，每项为 {input, data, error}
+    - 成功时 data 为作品id，error 为 null；失败时 data 为 null，error 为 {type, message}
+    - 单个链接失败不影响其余链接
+    - 注意：此前每项直接是作品id字符串，且任一链接失败时整个请求返回400
 
     # [English]
     ### Purpose:
@@ -849,10 +936,24 @@ async def get_all_aweme_id(request: Request,
     ### Parameters:
     - url: Video link
     ### Return:
-    - Video id
+    - A list in input order, each item is {input, data, error}
+    - On success data is the video id and error is null; on failure data is null and error is {type, message}
+    - One failed link does not affect the others
+    - Note: each item used to be the bare video id string, and any failed link turned the whole request into a 400
 
     # [示例/Example]
     url = ["https://www.tiktok.com/@owlcitymusic/video/7218694761253735723"]
+
+    # [返回示例/Response example]
+    data = [
+        {"input": "https://www.tiktok.com/@owlcitymusic/video/7218694761253735723",
+         "data": "7218694761253735723",
+         "error": null},
+        {"input": "https://vm.tiktok.com/ZMexample/",
+         "data": null,
+         "error": {"type": "APIResponseError",
+                   "message": "API Response Error: 未在响应中找到 aweme_id 或 photo_id."}}
+    ]
     """
     try:
         data = await tiktok_web_crawler.get_all_aweme_id(url)
@@ -925,7 +1026,10 @@ async def get_all_unique_id(request: Request,
     ### 参数:
     - url: 用户主页链接
     ### 返回:
-    - unique_id
+    - 与输入顺序一致的列表，每项为 {input, data, error}
+    - 成功时 data 为unique_id，error 为 null；失败时 data 为 null，error 为 {type, message}
+    - 单个链接失败不影响其余链接
+    - 注意：此前每项直接是unique_id字符串，且任一链接失败时整个请求返回400
 
     # [English]
     ### Purpose:
@@ -933,10 +1037,24 @@ async def get_all_unique_id(request: Request,
     ### Parameters:
     - url: User homepage link
     ### Return:
-    - unique_id
+    - A list in input order, each item is {input, data, error}
+    - On success data is the unique_id and error is null; on failure data is null and error is {type, message}
+    - One failed link does not affect the others
+    - Note: each item used to be the bare unique_id string, and any failed link turned the whole request into a 400
 
     # [示例/Example]
     url = ["https://www.tiktok.com/@tiktok"]
+
+    # [返回示例/Response example]
+    data = [
+        {"input": "https://www.tiktok.com/@tiktok",
+         "data": "tiktok",
+         "error": null},
+        {"input": "https://www.tiktok.com/@unavailable_user",
+         "data": null,
+         "error": {"type": "APINotFoundError",
+                   "message": "API Not Found Error: 页面不可用，可能是由于区域限制（代理）造成的。类名: SecUserIdFetcher."}}
+    ]
     """
     try:
         data = await tiktok_web_crawler.get_all_unique_id(url)
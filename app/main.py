@@ -149,6 +149,21 @@ app = FastAPI(
 # API router
 app.include_router(api_router, prefix="/api")
 
+# 共享HTTP客户端池与响应缓存 / Shared HTTP client pool and response cache
+from crawlers.utils.client_pool import client_pool
+from crawlers.utils.cache import response_cache
+from crawlers.utils.signing import signing_service
+from crawlers.utils.resolution_cache import resolution_cache
+
+
+@app.on_event("shutdown")
+async def close_shared_clients():
+    """应用关闭时释放共享的上游连接、落盘缓存并关闭签名线程池 (Release shared upstream connections, flush the cache and stop the signing pool on shutdown)"""
+    await client_pool.aclose()
+    await response_cache.aclose()
+    resolution_cache.close()
+    signing_service.shutdown()
+
 # Health check router (直接注册到根路径)
 from app.api.endpoints import health
 app.include_router(health.router, tags=["Health-Check"])
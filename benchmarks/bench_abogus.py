@@ -0,0 +1,103 @@
+# ==============================================================================
+# Copyright (C) 2021 Evil0ctal
+#
+# This file is part of the Douyin_TikTok_Download_API project.
+#
+# This project is licensed under the Apache License 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+# 　　　　 　　  ＿＿
+# 　　　 　　 ／＞　　フ
+# 　　　 　　| 　_　 _ l
+# 　 　　 　／` ミ＿xノ
+# 　　 　 /　　　 　 |       Feed me Stars ⭐
+# 　　　 /　 ヽ　　 ﾉ
+# 　 　 │　　|　|　|
+# 　／￣|　　 |　|　|
+# 　| (￣ヽ＿_ヽ_)__)
+# 　＼二つ
+# ==============================================================================
+#
+# Contributor Link:
+# - https://github.com/Evil0ctal
+# - https://github.com/Johnserf-Seed
+#
+# ==============================================================================
+
+"""
+a_bogus 签名基准测试 (Benchmark of a_bogus signing)
+
+用法 (Usage):
+    python -m benchmarks.bench_abogus
+"""
+
+import argparse
+
+from benchmarks.harness import measure, report
+from crawlers.douyin.web.abogus import ABogus
+from crawlers.douyin.web.sm3 import get_backend
+from tests.fixtures import FIXED, PARAMS
+
+
+class LegacyABogus(ABogus):
+    """改动前的实现：gmssl 计算SM3，每次签名都重新计算方法码与RC4密钥编排
+    (Pre-change behaviour: SM3 through gmssl and no memoization)"""
+
+    sm3_backend = staticmethod(get_backend("gmssl"))
+
+    def generate_method_code(self, method: str = "GET") -> list:
+        return self.sm3_to_array(self.sm3_to_array(method + "cus"))
+
+    @staticmethod
+    def rc4_encrypt(plaintext, key):
+        s = list(range(256))
+        j = 0
+        for i in range(256):
+            j = (j + s[i] + ord(key[i % len(key)])) % 256
+            s[i], s[j] = s[j], s[i]
+        i = 0
+        j = 0
+        cipher = []
+        for k in range(len(plaintext)):
+            i = (i + 1) % 256
+            j = (j + s[i]) % 256
+            s[i], s[j] = s[j], s[i]
+            t = (s[i] + s[j]) % 256
+            cipher.append(chr(s[t] ^ ord(plaintext[k])))
+        return "".join(cipher)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--platform", default=None, help="浏览器平台字符串，如 Win32 (Browser platform string, e.g. Win32)")
+    args = parser.parse_args()
+
+    signer = ABogus.signer(args.platform)
+    legacy = LegacyABogus()
+    legacy.browser, legacy.browser_len, legacy.browser_code = signer.browser, signer.browser_len, signer.browser_code
+    if legacy.get_value(PARAMS, **FIXED) != signer.get_value(PARAMS, **FIXED):
+        raise SystemExit("签名结果不一致 (Signatures differ)")
+
+    def new_instance_per_call():
+        # 改动前 BogusManager 每次请求都新建 ABogus / BogusManager used to build a new ABogus per request
+        instance = LegacyABogus(args.platform)
+        instance.browser, instance.browser_len, instance.browser_code = legacy.browser, legacy.browser_len, legacy.browser_code
+        return instance.get_value(PARAMS)
+
+    results = [
+        measure("legacy (new ABogus per call)", new_instance_per_call),
+        measure("ABogus.signer()", lambda: signer.get_value(PARAMS)),
+    ]
+    report(results, baseline="legacy (new ABogus per call)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# ==============================================================================
+# Copyright (C) 2021 Evil0ctal
+#
+# This file is part of the Douyin_TikTok_Download_API project.
+#
+# This project is licensed under the Apache License 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+# 　　　　 　　  ＿＿
+# 　　　 　　 ／＞　　フ
+# 　　　 　　| 　_　 _ l
+# 　 　　 　／` ミ＿xノ
+# 　　 　 /　　　 　 |       Feed me Stars ⭐
+# 　　　 /　 ヽ　　 ﾉ
+# 　 　 │　　|　|　|
+# 　／￣|　　 |　|　|
+# 　| (￣ヽ＿_ヽ_)__)
+# 　＼二つ
+# ==============================================================================
+#
+# Contributor Link:
+# - https://github.com/Evil0ctal
+# - https://github.com/Johnserf-Seed
+#
+# ==============================================================================
+
+
+"""
+BaseCrawler.parse_json 解码路径基准测试 (Benchmark of the BaseCrawler.parse_json decode paths)
+
+用法 (Usage):
+    python -m benchmarks.bench_json                          # 合成的 aweme_list 页面 / synthetic aweme_list page
+    python -m benchmarks.bench_json --payload page.json ...  # 录制的响应 / recorded responses
+"""
+
+import argparse
+import json
+import random
+import re
+
+from benchmarks.harness import measure, report
+from crawlers.utils import json_codec
+from crawlers.utils.json_codec import extract_json_object, loads_embedded
+
+
+def synthetic_aweme_page(count: int = 30, seed: int = 0) -> bytes:
+    """生成结构接近抖音 aweme_list 的合成响应 (Build a synthetic response shaped like a Douyin aweme_list page)"""
+    rng = random.Random(seed)
+
+    def url_list(n=3):
+        return ["https://v{0}.douyinvod.com/{1:x}/video/tos/cn/{2:x}/?a=6383&br=1024".format(
+            i, rng.getrandbits(64), rng.getrandbits(64)) for i in range(n)]
+
+    def image(n=3):
+        return {"uri": "tos-cn-i-0813/{0:x}".format(rng.getrandbits(64)), "url_list": url_list(n),
+                "width": 720, "height": 1280}
+
+    awemes = []
+    for i in range(count):
+        aweme_id = str(7300000000000000000 + rng.getrandbits(48))
+        awemes.append({
+            "aweme_id": aweme_id,
+            "desc": "合成数据 synthetic description #{0} ".format(i) * 3,
+            "create_time": 1700000000 + i,
+            "aweme_type": 0,
+            "author": {
+                "uid": str(rng.getrandbits(50)),
+                "sec_uid": "MS4wLjABAAAA" + "".join(rng.choice("abcdefghijklmnopqrstuvwxyz0123456789_-") for _ in range(55)),
+                "nickname": "用户{0}".format(i),
+                "avatar_thumb": image(), "avatar_medium": image(), "avatar_larger": image(),
+                "signature": "签名\n第二行 \"quoted\" {braces}",
+            },
+            "music": {"id": rng.getrandbits(60), "title": "原声", "play_url": image(2), "cover_hd": image()},
+            "video": {
+                "play_addr": image(4), "download_addr": image(4), "cover": image(), "origin_cover": image(),
+                "dynamic_cover": image(),
+                "bit_rate": [{"gear_name": "normal_{0}".format(q), "bit_rate": 1000000 + q, "play_addr": image(4)}
+                             for q in (540, 720, 1080)],
+                "duration": 15000 + i, "width": 1080, "height": 1920,
+            },
+            "statistics": {"digg_count": rng.randint(0, 10 ** 7), "comment_count": rng.randint(0, 10 ** 5),
+                           "share_count": rng.randint(0, 10 ** 5), "play_count": 0},
+            "text_extra": [{"hashtag_name": "tag{0}".format(t), "hashtag_id": str(rng.getrandbits(50))}
+                           for t in range(4)],
+        })
+    page = {"status_code": 0, "min_cursor": 0, "max_cursor": 1700000000000, "has_more": 1, "aweme_list": awemes}
+    return json.dumps(page, ensure_ascii=False).encode("utf-8")
+
+
+def legacy_parse(content: bytes):
+    """旧实现：先按文本解析，失败时用贪婪正则 (Previous implementation: parse the text, then a greedy regex)"""
+    text = content.decode("utf-8")
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        match = re.search(r"\{.*\}", text)
+        return json.loads(match.group())
+
+
+def run_payload(label: str, content: bytes):
+    print("\n== {0} ({1:.1f} KB)".format(label, len(content) / 1024))
+
+    # 前后混入非JSON内容，触发回退路径；第二种在尾部带有花括号，只能靠括号扫描
+    # Wrap with non-JSON content to exercise the fallbacks; the second has trailing braces and needs the object scan
+    wrapped = b"/**/callback(" + content + b");\n<!-- trailing html -->"
+    wrapped_braces = wrapped + b"<script>var a = {};</script>"
+
+    # 先确认各解码路径结果一致 / Check every path returns the same result first
+    expected = json.loads(content)
+    assert legacy_parse(wrapped) == expected
+    for decoder in json_codec.DECODERS.values():
+        assert decoder(content) == expected
+        assert loads_embedded(wrapped, decoder) == expected
+        assert loads_embedded(wrapped_braces, decoder) == expected
+
+    results = [
+        measure("legacy text + json.loads", lambda: legacy_parse(content)),
+    ]
+    for name, decoder in json_codec.DECODERS.items():
+        results.append(measure("{0} bytes".format(name), lambda d=decoder: d(content)))
+    results.append(measure("legacy regex fallback", lambda: legacy_parse(wrapped)))
+    for name, decoder in json_codec.DECODERS.items():
+        results.append(measure("{0} embedded fallback".format(name),
+                               lambda d=decoder: loads_embedded(wrapped, d)))
+    # 尾部带花括号时首尾截取失败，走对象扫描 / Trailing braces defeat the first-to-last span and take the object scan
+    for name, decoder in json_codec.DECODERS.items():
+        results.append(measure("{0} trailing-brace fallback".format(name),
+                               lambda d=decoder: loads_embedded(wrapped_braces, d)))
+    results.append(measure("object scan only", lambda: extract_json_object(wrapped_braces)))
+    report(results, baseline="legacy text + json.loads")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--payload", nargs="*", default=[], help="录制的JSON响应文件 (Recorded JSON response files)")
+    parser.add_argument("--count", type=int, default=30, help="合成页面的作品数 (Posts per synthetic page)")
+    args = parser.parse_args()
+
+    if not args.payload:
+        run_payload("synthetic aweme_list x{0}".format(args.count), synthetic_aweme_page(args.count))
+    for file in args.payload:
+        with open(file, "rb") as f:
+            run_payload(file, f.read())
+
+
+if __name__ == "__main__":
+    main()
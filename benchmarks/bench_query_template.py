@@ -0,0 +1,128 @@
+# ==============================================================================
+# Copyright (C) 2021 Evil0ctal
+#
+# This file is part of the Douyin_TikTok_Download_API project.
+#
+# This project is licensed under the Apache License 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+# 　　　　 　　  ＿＿
+# 　　　 　　 ／＞　　フ
+# 　　　 　　| 　_　 _ l
+# 　 　　 　／` ミ＿xノ
+# 　　 　 /　　　 　 |       Feed me Stars ⭐
+# 　　　 /　 ヽ　　 ﾉ
+# 　 　 │　　|　|　|
+# 　／￣|　　 |　|　|
+# 　| (￣ヽ＿_ヽ_)__)
+# 　＼二つ
+# ==============================================================================
+#
+# Contributor Link:
+# - https://github.com/Evil0ctal
+# - https://github.com/Johnserf-Seed
+#
+# ==============================================================================
+
+"""
+请求模型查询模板的校验与基准测试 (Check and benchmark of request model query templates)
+
+先确认抖音与TikTok所有请求模型的模板输出与 urlencode(model.dict()) 及原始拼接一致，
+再比较单次生成查询字符串的速度。
+(First verifies that, for every Douyin and TikTok request model, the template
+output matches urlencode(model.dict()) and the raw join, then compares the
+speed of building one query string.)
+
+用法 (Usage):
+    python -m benchmarks.bench_query_template
+"""
+
+import inspect
+from urllib.parse import urlencode
+
+from pydantic import BaseModel
+
+from benchmarks.harness import measure, report
+from crawlers.douyin.web import models as douyin_models
+from crawlers.tiktok.web import models as tiktok_models
+from crawlers.utils.query_template import QueryTemplate
+
+# 必填字段的示例值，包含需要转义的字符 / Sample values for required fields, including characters that need escaping
+SAMPLES = {int: 17, str: "a b/&=+中文"}
+
+# 轮换令牌固定取值，使两种方式可比较 / Rotating tokens are pinned so both paths are comparable
+PINNED = {"msToken": "tok=+/", "verifyFp": "verify_fixed"}
+
+
+def request_models():
+    """列出两个平台的所有查询参数模型 (List every query parameter model of both platforms)"""
+    for module in (douyin_models, tiktok_models):
+        for _, model in inspect.getmembers(module, inspect.isclass):
+            if not issubclass(model, BaseModel) or model.__module__ != module.__name__:
+                continue
+            # 跳过 URL_List 等非查询参数的模型 / Skip models such as URL_List that are not query parameters
+            if all(field.annotation in SAMPLES for field in model.model_fields.values() if field.is_required()):
+                yield model
+
+
+def sample_values(model, override: bool) -> dict:
+    """生成模型的示例参数，override 时同时覆盖常量字段 (Build sample values, also overriding a constant field when asked)"""
+    values = {}
+    for name, field in model.model_fields.items():
+        if field.is_required():
+            values[name] = SAMPLES.get(field.annotation, "v")
+        elif name in PINNED:
+            values[name] = PINNED[name]
+    if override:
+        constant = next((name for name, field in model.model_fields.items()
+                         if field.annotation is str and not field.is_required() and field.default_factory is None), None)
+        if constant is not None:
+            values[constant] = "override value"
+    return values
+
+
+def check():
+    """校验模板输出与模型一致，不一致时退出 (Verify template output matches the models, exit on mismatch)"""
+    count = 0
+    for model in request_models():
+        template = QueryTemplate.of(model)
+        for override in (False, True):
+            values = sample_values(model, override)
+            params = model(**values).dict()
+            if template.encode(**values) != urlencode(params):
+                raise SystemExit("encode 不一致 (encode differs): {0}".format(model.__name__))
+            if template.join(**values) != "&".join(f"{k}={v}" for k, v in params.items()):
+                raise SystemExit("join 不一致 (join differs): {0}".format(model.__name__))
+            count += 1
+    print("查询模板一致 (query templates match): {0} cases\n".format(count))
+
+
+def main():
+    check()
+
+    template = QueryTemplate.of(douyin_models.PostDetail)
+    xb_template = QueryTemplate.of(tiktok_models.UserPost)
+    results = [
+        measure("PostDetail().dict() + urlencode",
+                lambda: urlencode(douyin_models.PostDetail(aweme_id="7372484719365098803", msToken="").dict())),
+        measure("QueryTemplate.encode",
+                lambda: template.encode(aweme_id="7372484719365098803", msToken="")),
+        measure("UserPost().dict() + join",
+                lambda: "&".join(f"{k}={v}" for k, v in tiktok_models.UserPost(
+                    secUid="MS4wLjABAAAA", cursor=0, count=35, coverFormat=2, msToken="t").dict().items())),
+        measure("QueryTemplate.join",
+                lambda: xb_template.join(secUid="MS4wLjABAAAA", cursor=0, count=35, coverFormat=2, msToken="t")),
+    ]
+    report(results, baseline="PostDetail().dict() + urlencode")
+
+
+if __name__ == "__main__":
+    main()
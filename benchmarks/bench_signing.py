@@ -0,0 +1,247 @@
+# ==============================================================================
+# Copyright (C) 2021 Evil0ctal
+#
+# This file is part of the Douyin_TikTok_Download_API project.
+#
+# This project is licensed under the Apache License 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+# 　　　　 　　  ＿＿
+# 　　　 　　 ／＞　　フ
+# 　　　 　　| 　_　 _ l
+# 　 　　 　／` ミ＿xノ
+# 　　 　 /　　　 　 |       Feed me Stars ⭐
+# 　　　 /　 ヽ　　 ﾉ
+# 　 　 │　　|　|　|
+# 　／￣|　　 |　|　|
+# 　| (￣ヽ＿_ヽ_)__)
+# 　＼二つ
+# ==============================================================================
+#
+# Contributor Link:
+# - https://github.com/Evil0ctal
+# - https://github.com/Johnserf-Seed
+#
+# ==============================================================================
+
+"""
+签名代码的基准测试套件 (Benchmark suite for the signing code)
+
+覆盖 ABogus、XBogus、w_rid 三种签名以及 BogusManager / WridManager 的完整Endpoint构建，
+报告吞吐量、单次耗时的 p50/p99 与每次调用的内存分配。随机数种子与时间戳固定，
+可离线运行，每个用例记录输出摘要，用于确认优化前后签名结果不变。
+(Covers the ABogus, XBogus and w_rid signers and the full endpoint builders
+of BogusManager / WridManager, reporting throughput, p50/p99 per call and
+allocations per call. Seeds and timestamps are fixed and nothing touches
+the network; each case records a digest of its output so optimisations can
+be checked for unchanged signatures.)
+
+用法 (Usage):
+    python -m benchmarks.bench_signing
+    python -m benchmarks.bench_signing --save before.json
+    python -m benchmarks.bench_signing --compare before.json --save after.json
+    python -m benchmarks.bench_signing --filter sign_many
+    python -m benchmarks.bench_signing --lag                 # 各执行方式下的事件循环延迟 / loop lag per execution mode
+"""
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import random
+import time
+from unittest import mock
+
+from benchmarks.bench_wrid import run_sync
+from benchmarks.harness import load_results, profile, report_profile, save_results
+from crawlers.bilibili.web import wrid
+from crawlers.bilibili.web.models import UserPostVideos
+from crawlers.bilibili.web.utils import WridManager
+from crawlers.douyin.web import abogus
+from crawlers.douyin.web.abogus import ABogus
+from crawlers.douyin.web.models import UserPost
+from crawlers.douyin.web.utils import BogusManager as DouyinBogusManager
+from crawlers.douyin.web.xbogus import XBogus
+from crawlers.tiktok.web.models import UserPost as TikTokUserPost
+from crawlers.tiktok.web.utils import BogusManager as TikTokBogusManager
+from crawlers.utils.query_template import QueryTemplate
+from crawlers.utils.signing import SigningService
+from tests.fixtures import FIXED, PARAMS
+
+SEED = 20240612
+# 固定的时间戳(秒) / Fixed timestamp (seconds)
+FIXED_TIME = 1718000000
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) " \
+             "Chrome/130.0.0.0 Safari/537.36"
+MS_TOKEN = "p9Y7fUBuq9DKvAuN27Peml6JbaMqG2ZcXfFiyDv1jcHrCN00uidYqUgSuLsKl1onC-E_n82m-aKKYE0QGEmxIWZx9iueQ6WLbvzPfqnMk4GB"
+DOUYIN_POST = "https://www.douyin.com/aweme/v1/web/aweme/post/"
+TIKTOK_POST = "https://www.tiktok.com/api/post/item_list/"
+BATCH = 20
+
+
+@contextlib.contextmanager
+def fixed_clock():
+    """固定签名代码读取的时间 (Pin the clock read by the signing code)"""
+    with mock.patch("time.time", lambda: float(FIXED_TIME)), \
+            mock.patch.object(abogus, "time", lambda: float(FIXED_TIME)):
+        yield
+
+
+def digest(value) -> str:
+    """输出摘要 (Output digest)"""
+    return hashlib.sha256(repr(value).encode("utf-8")).hexdigest()[:16]
+
+
+def build_cases() -> list:
+    """构造 (名称, 无参函数) 用例列表 (Build the list of (name, zero-argument function) cases)"""
+    random.seed(SEED)
+    ab_signer = ABogus()
+    xb_signer = XBogus(USER_AGENT)
+
+    ab_query = QueryTemplate.of(UserPost).encode(sec_user_id="MS4wLjABAAAA", max_cursor=0, count=18, msToken="")
+    xb_query = QueryTemplate.of(UserPost).join(sec_user_id="MS4wLjABAAAA", max_cursor=0, count=18, msToken=MS_TOKEN)
+    tiktok_query = QueryTemplate.of(TikTokUserPost).join(
+        secUid="MS4wLjABAAAA", cursor=0, count=35, coverFormat=2, msToken=MS_TOKEN
+    )
+    bilibili_params = UserPostVideos(mid="178360345", pn=1).dict()
+    bilibili_params["wts"] = str(FIXED_TIME)
+    bilibili_query = WridManager.encode_query(bilibili_params)
+
+    ab_batch = [QueryTemplate.of(UserPost).encode(sec_user_id=str(i), max_cursor=0, count=18, msToken="")
+                for i in range(BATCH)]
+    xb_batch = [QueryTemplate.of(UserPost).join(sec_user_id=str(i), max_cursor=0, count=18, msToken=MS_TOKEN)
+                for i in range(BATCH)]
+    tiktok_batch = [QueryTemplate.of(TikTokUserPost).join(
+        secUid=str(i), cursor=0, count=35, coverFormat=2, msToken=MS_TOKEN) for i in range(BATCH)]
+    bilibili_batch = [dict(bilibili_params, mid=str(i)) for i in range(BATCH)]
+
+    return [
+        # 签名算法本身 / The signers themselves
+        ("ABogus.get_value", lambda: ab_signer.get_value(PARAMS, **FIXED)),
+        ("XBogus.getXBogus", lambda: xb_signer.getXBogus(xb_query, FIXED_TIME)),
+        ("wrid.get_wrid", lambda: wrid.get_wrid(bilibili_query)),
+        # 完整的Endpoint构建 / Full endpoint builders
+        ("douyin ab_model_2_endpoint", lambda: DouyinBogusManager.ab_model_2_endpoint(ab_query, USER_AGENT)),
+        ("douyin xb_model_2_endpoint",
+         lambda: DouyinBogusManager.xb_model_2_endpoint(DOUYIN_POST, xb_query, USER_AGENT)),
+        ("douyin xb_str_2_endpoint",
+         lambda: DouyinBogusManager.xb_str_2_endpoint(f"{DOUYIN_POST}?{xb_query}", USER_AGENT)),
+        ("tiktok model_2_endpoint",
+         lambda: TikTokBogusManager.model_2_endpoint(TIKTOK_POST, tiktok_query, USER_AGENT)),
+        ("bilibili wrid_model_endpoint", lambda: run_sync(WridManager.wrid_model_endpoint(dict(bilibili_params)))),
+        # 批量签名，每次调用签 BATCH 个 / Batch signing, BATCH items per call
+        (f"douyin ab_sign_many[{BATCH}]",
+         lambda: DouyinBogusManager.ab_sign_many(ab_batch, DOUYIN_POST, USER_AGENT)),
+        (f"douyin xb_sign_many[{BATCH}]",
+         lambda: DouyinBogusManager.xb_sign_many(xb_batch, DOUYIN_POST, USER_AGENT)),
+        (f"tiktok sign_many[{BATCH}]", lambda: TikTokBogusManager.sign_many(tiktok_batch, TIKTOK_POST, USER_AGENT)),
+        (f"bilibili sign_many[{BATCH}]", lambda: WridManager.sign_many(bilibili_batch)),
+    ]
+
+
+async def _loop_lag(mode: str, requests: int, concurrency: int) -> dict:
+    # 阈值为负时每次都交给执行器，只比较执行方式本身 / A negative threshold always offloads, comparing only the modes
+    service = SigningService(mode=mode, inline_max_lag=-1.0)
+    query = QueryTemplate.of(UserPost).encode(sec_user_id="MS4wLjABAAAA", max_cursor=0, count=18, msToken="")
+
+    async def sign():
+        async with semaphore:
+            return await service.run(DouyinBogusManager.ab_model_2_endpoint, query, USER_AGENT)
+
+    # 预热执行器，进程池的启动不计入结果 / Warm the executor so pool start-up is not measured
+    semaphore = asyncio.Semaphore(concurrency)
+    await asyncio.gather(*(sign() for _ in range(service.max_workers)))
+
+    # 每1ms唤醒一次，实际唤醒的延迟即事件循环被阻塞的时间 / Wake every 1ms, how late each wake-up is measures the blocked loop
+    lags = []
+    done = asyncio.Event()
+
+    async def tick():
+        while not done.is_set():
+            expected = time.perf_counter() + 0.001
+            await asyncio.sleep(0.001)
+            lags.append(max(0.0, time.perf_counter() - expected))
+
+    ticker = asyncio.ensure_future(tick())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    await asyncio.gather(*(sign() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await ticker
+    service.shutdown()
+
+    lags.sort()
+    return {
+        "mode": mode,
+        "per_sec": requests / elapsed,
+        "p50_ms": lags[len(lags) // 2] * 1000,
+        "p99_ms": lags[min(len(lags) - 1, int(len(lags) * 0.99))] * 1000,
+        "max_ms": lags[-1] * 1000,
+    }
+
+
+def report_loop_lag(requests: int, concurrency: int):
+    """同一批签名在 inline / thread / process 下的吞吐与事件循环延迟
+    (Throughput and event loop lag of the same signing burst in inline / thread / process mode)
+    """
+    print("{0} x douyin ab_model_2_endpoint, concurrency {1}".format(requests, concurrency))
+    print("{0:<10}{1:>12}{2:>14}{3:>14}{4:>14}".format("mode", "sig/sec", "lag p50 (ms)", "lag p99 (ms)", "lag max (ms)"))
+    for mode in (SigningService.INLINE, SigningService.THREAD, SigningService.PROCESS):
+        r = asyncio.run(_loop_lag(mode, requests, concurrency))
+        print("{mode:<10}{per_sec:>12.0f}{p50_ms:>14.2f}{p99_ms:>14.2f}{max_ms:>14.2f}".format(**r))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="", help="只运行名称包含该字符串的用例 (Only run cases whose name contains this)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="每轮最少运行的秒数 (Minimum seconds per round)")
+    parser.add_argument("--calls", type=int, default=2000, help="逐次计时的调用次数 (Calls timed one by one)")
+    parser.add_argument("--save", help="把结果写入JSON文件 (Write results to a JSON file)")
+    parser.add_argument("--compare", help="与之前保存的JSON结果对比 (Compare with previously saved JSON results)")
+    parser.add_argument("--lag", action="store_true", help="测量各执行方式下的事件循环延迟 (Measure loop lag per execution mode)")
+    parser.add_argument("--requests", type=int, default=400, help="--lag 的签名次数 (Signatures for --lag)")
+    parser.add_argument("--concurrency", type=int, default=16, help="--lag 的并发数 (Concurrency for --lag)")
+    args = parser.parse_args()
+
+    if args.lag:
+        report_loop_lag(args.requests, args.concurrency)
+        return
+
+    previous = load_results(args.compare) if args.compare else None
+    results = []
+    with fixed_clock():
+        for name, func in build_cases():
+            if args.filter not in name:
+                continue
+            # 重新播种后的首次输出可在不同提交间比较 / The first output after reseeding is comparable across commits
+            random.seed(SEED)
+            output = digest(func())
+            result = profile(name, func, min_time=args.min_time, calls=args.calls)
+            result["digest"] = output
+            results.append(result)
+
+    report_profile(results, previous)
+
+    if previous:
+        changed = [r["name"] for r in results
+                   for old in previous["results"]
+                   if old["name"] == r["name"] and old.get("digest") != r["digest"]]
+        if changed:
+            print("\n输出发生变化 (outputs changed): {0}".format(", ".join(changed)))
+
+    if args.save:
+        save_results(args.save, results, seed=SEED, fixed_time=FIXED_TIME, user_agent=USER_AGENT)
+        print("\n结果已保存 (results saved): {0}".format(args.save))
+
+
+if __name__ == "__main__":
+    main()
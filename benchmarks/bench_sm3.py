@@ -0,0 +1,73 @@
+# ==============================================================================
+# Copyright (C) 2021 Evil0ctal
+#
+# This file is part of the Douyin_TikTok_Download_API project.
+#
+# This project is licensed under the Apache License 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+# 　　　　 　　  ＿＿
+# 　　　 　　 ／＞　　フ
+# 　　　 　　| 　_　 _ l
+# 　 　　 　／` ミ＿xノ
+# 　　 　 /　　　 　 |       Feed me Stars ⭐
+# 　　　 /　 ヽ　　 ﾉ
+# 　 　 │　　|　|　|
+# 　／￣|　　 |　|　|
+# 　| (￣ヽ＿_ヽ_)__)
+# 　＼二つ
+# ==============================================================================
+#
+# Contributor Link:
+# - https://github.com/Evil0ctal
+# - https://github.com/Johnserf-Seed
+#
+# ==============================================================================
+
+"""
+SM3 后端基准测试 (SM3 backend benchmark)
+
+比较各后端计算SM3与生成 a_bogus 的速度，结果一致性由 tests/test_sm3.py 校验。
+(Compares how fast each backend hashes and signs a_bogus; tests/test_sm3.py checks that
+their results agree.)
+
+用法 (Usage):
+    python -m benchmarks.bench_sm3
+"""
+
+from benchmarks.harness import measure, report
+from crawlers.douyin.web.abogus import ABogus
+from crawlers.douyin.web.sm3 import BACKENDS
+from tests.fixtures import PARAMS
+
+
+def signer_for(backend: str) -> ABogus:
+    """使用指定SM3后端的签名对象 (Signer using the given SM3 backend)"""
+    cls = type("ABogus_" + backend, (ABogus,), {"sm3_backend": staticmethod(BACKENDS[backend])})
+    return cls()
+
+
+def main():
+    # 与 a_bogus 中参数哈希相近的输入长度 / Input length similar to the a_bogus params hash
+    data = b"device_platform=webapp&aid=6383&aweme_id=7345492945006595379" * 6 + b"cus"
+    results = [measure("sm3 " + name, lambda digest=digest: digest(data)) for name, digest in BACKENDS.items()]
+    report(results, baseline="sm3 gmssl" if "gmssl" in BACKENDS else None)
+    print()
+
+    results = [
+        measure("a_bogus " + name, lambda signer=signer_for(name): signer.get_value(PARAMS))
+        for name in BACKENDS
+    ]
+    report(results, baseline="a_bogus gmssl" if "gmssl" in BACKENDS else None)
+
+
+if __name__ == "__main__":
+    main()
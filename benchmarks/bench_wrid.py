@@ -0,0 +1,75 @@
+# ==============================================================================
+# Copyright (C) 2021 Evil0ctal
+#
+# This file is part of the Douyin_TikTok_Download_API project.
+#
+# This project is licensed under the Apache License 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+# 　　　　 　　  ＿＿
+# 　　　 　　 ／＞　　フ
+# 　　　 　　| 　_　 _ l
+# 　 　　 　／` ミ＿xノ
+# 　　 　 /　　　 　 |       Feed me Stars ⭐
+# 　　　 /　 ヽ　　 ﾉ
+# 　 　 │　　|　|　|
+# 　／￣|　　 |　|　|
+# 　| (￣ヽ＿_ヽ_)__)
+# 　＼二つ
+# ==============================================================================
+#
+# Contributor Link:
+# - https://github.com/Evil0ctal
+# - https://github.com/Johnserf-Seed
+#
+# ==============================================================================
+
+"""
+Bilibili w_rid 签名基准测试 (Benchmark of Bilibili w_rid signing)
+
+比较 hashlib 版与JS移植版的速度，两者结果一致由 tests/test_wrid.py 校验。
+(Compares the speed of the hashlib signer and the JS port; tests/test_wrid.py checks that
+their results match.)
+
+用法 (Usage):
+    python -m benchmarks.bench_wrid
+"""
+
+from benchmarks.harness import measure, report
+from crawlers.bilibili.web import wrid
+from crawlers.bilibili.web.models import UserPostVideos
+from crawlers.bilibili.web.utils import WridManager
+from tests.fixtures import legacy_encode_query
+
+
+def run_sync(coro):
+    """同步驱动不会挂起的协程 (Drive a coroutine that never suspends)"""
+    try:
+        coro.send(None)
+    except StopIteration as e:
+        return e.value
+    raise RuntimeError("协程发生了挂起 (coroutine suspended)")
+
+
+def main():
+    params = UserPostVideos(mid="178360345", pn=1).dict()
+    query = legacy_encode_query(params)
+    results = [
+        measure("get_wrid_js", lambda: wrid.get_wrid_js(query)),
+        measure("get_wrid", lambda: wrid.get_wrid(query)),
+        measure("legacy encode + get_wrid_js", lambda: wrid.get_wrid_js(legacy_encode_query(params))),
+        measure("encode + get_wrid", lambda: wrid.get_wrid(run_sync(WridManager.get_encode_query(params)))),
+    ]
+    report(results, baseline="get_wrid_js")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+# ==============================================================================
+# Copyright (C) 2021 Evil0ctal
+#
+# This file is part of the Douyin_TikTok_Download_API project.
+#
+# This project is licensed under the Apache License 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+# 　　　　 　　  ＿＿
+# 　　　 　　 ／＞　　フ
+# 　　　 　　| 　_　 _ l
+# 　 　　 　／` ミ＿xノ
+# 　　 　 /　　　 　 |       Feed me Stars ⭐
+# 　　　 /　 ヽ　　 ﾉ
+# 　 　 │　　|　|　|
+# 　／￣|　　 |　|　|
+# 　| (￣ヽ＿_ヽ_)__)
+# 　＼二つ
+# ==============================================================================
+#
+# Contributor Link:
+# - https://github.com/Evil0ctal
+# - https://github.com/Johnserf-Seed
+#
+# ==============================================================================
+
+
+"""
+基准测试公共工具 (Shared benchmark helpers)
+
+在项目根目录运行，例如 (Run from the project root, e.g.):
+    python -m benchmarks.bench_json
+"""
+
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, List, Optional
+
+
+def measure(name: str, func: Callable[[], object], min_time: float = 0.2, repeat: int = 5) -> dict:
+    """测量函数的吞吐量与单次耗时 (Measure the throughput and per-call latency of a function)
+
+    Args:
+        name (str): 用例名称 (Case name)
+        func (Callable): 无参函数 (Zero-argument function)
+        min_time (float): 每轮最少运行的秒数 (Minimum seconds per round)
+        repeat (int): 轮数 (Number of rounds)
+
+    Returns:
+        dict: 统计结果，耗时单位为微秒 (Statistics, latencies in microseconds)
+    """
+    # 预热并估算每轮的调用次数 / Warm up and estimate calls per round
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time / 10 or number >= 1 << 20:
+            break
+        number *= 2
+    number = max(1, int(number * (min_time / max(elapsed, 1e-9))))
+
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - started) / number * 1e6)
+
+    return {
+        "name": name,
+        "calls": number * repeat,
+        "ops_per_sec": 1e6 / statistics.median(samples),
+        "p50_us": statistics.median(samples),
+        "best_us": min(samples),
+    }
+
+
+def report(results: List[dict], baseline: str = None):
+    """打印结果表格 (Print a result table)
+
+    Args:
+        results (list): measure() 的返回值列表 (List of measure() results)
+        baseline (str): 作为对比基准的用例名称 (Name of the case used as the baseline)
+    """
+    base = next((r for r in results if r["name"] == baseline), None)
+    width = max(len(r["name"]) for r in results)
+    print("{0:<{w}}  {1:>12}  {2:>12}  {3:>8}".format("case", "ops/sec", "p50 (us)", "speedup", w=width))
+    for r in results:
+        speedup = base["p50_us"] / r["p50_us"] if base else 1.0
+        print("{0:<{w}}  {1:>12.1f}  {2:>12.2f}  {3:>7.2f}x".format(
+            r["name"], r["ops_per_sec"], r["p50_us"], speedup, w=width)
+        )
+
+
+def latency(func: Callable[[], object], calls: int = 2000) -> dict:
+    """逐次计时，得到单次调用耗时的分位数 (Time calls one by one for per-call latency percentiles)
+
+    Args:
+        func (Callable): 无参函数 (Zero-argument function)
+        calls (int): 计时的调用次数 (Number of timed calls)
+
+    Returns:
+        dict: p50/p99 耗时，单位为微秒 (p50/p99 latency in microseconds)
+    """
+    timer = time.perf_counter_ns
+    samples = []
+    for _ in range(calls):
+        started = timer()
+        func()
+        samples.append(timer() - started)
+    samples.sort()
+    return {
+        "p50_us": samples[len(samples) // 2] / 1e3,
+        "p99_us": samples[min(len(samples) - 1, len(samples) * 99 // 100)] / 1e3,
+    }
+
+
+def allocations(func: Callable[[], object], calls: int = 200) -> dict:
+    """用 tracemalloc 统计每次调用的内存分配 (Per-call memory allocation measured with tracemalloc)
+
+    tracemalloc 只记录当前占用，因此以单次调用期间的峰值增量近似分配量，另记录调用后未释放的部分。
+    (tracemalloc only tracks live memory, so the peak growth during one call
+    stands in for its allocations; memory still held afterwards is reported
+    separately.)
+
+    Args:
+        func (Callable): 无参函数 (Zero-argument function)
+        calls (int): 统计的调用次数 (Number of traced calls)
+
+    Returns:
+        dict: 峰值与残留字节数的中位数 (Median peak and retained bytes per call)
+    """
+    # 先调用一次，排除首次调用填充缓存的分配 / Call once first so cache warm-up is not counted
+    func()
+    tracemalloc.start()
+    try:
+        peaks, retained = [], []
+        for _ in range(calls):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            func()
+            after, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            retained.append(after - before)
+    finally:
+        tracemalloc.stop()
+    return {
+        "alloc_peak_bytes": statistics.median(peaks),
+        "alloc_retained_bytes": statistics.median(retained),
+    }
+
+
+def profile(name: str, func: Callable[[], object], min_time: float = 0.2, repeat: int = 5,
+            calls: int = 2000) -> dict:
+    """吞吐量、单次耗时分位数与内存分配的完整测量 (Full measurement: throughput, latency percentiles and allocations)
+
+    Returns:
+        dict: measure() 的结果，p50 以逐次计时为准并加入 p99 与分配量
+        (measure() results with the per-call p50, plus p99 and allocations)
+    """
+    result = measure(name, func, min_time=min_time, repeat=repeat)
+    result.update(latency(func, calls=calls))
+    result.update(allocations(func, calls=max(1, calls // 10)))
+    return result
+
+
+def report_profile(results: List[dict], previous: Optional[dict] = None):
+    """打印 profile() 的结果表格，可与之前保存的结果对比
+    (Print a table of profile() results, optionally compared with saved results)
+
+    Args:
+        results (list): profile() 的返回值列表 (List of profile() results)
+        previous (dict): load_results() 读取的旧结果，按用例名称对比 (Older results from load_results(), matched by case name)
+    """
+    previous = {r["name"]: r for r in (previous or {}).get("results", [])}
+    width = max(len(r["name"]) for r in results)
+    print("{0:<{w}}  {1:>12}  {2:>10}  {3:>10}  {4:>10}  {5:>9}".format(
+        "case", "ops/sec", "p50 (us)", "p99 (us)", "peak (B)", "vs prev", w=width)
+    )
+    for r in results:
+        old = previous.get(r["name"])
+        change = "{0:>8.2f}x".format(old["p50_us"] / r["p50_us"]) if old else "{0:>9}".format("-")
+        print("{0:<{w}}  {1:>12.1f}  {2:>10.2f}  {3:>10.2f}  {4:>10.0f}  {5}".format(
+            r["name"], r["ops_per_sec"], r["p50_us"], r["p99_us"], r["alloc_peak_bytes"], change, w=width)
+        )
+
+
+def git_revision() -> Optional[str]:
+    """当前提交的哈希，不在git仓库中时返回None (Current commit hash, None outside a git checkout)"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(path: str, results: List[dict], **meta):
+    """把结果与运行环境写入JSON文件 (Write results and the run environment to a JSON file)"""
+    document = {
+        "meta": {
+            "revision": git_revision(),
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            **meta,
+        },
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, ensure_ascii=False, indent=2)
+
+
+def load_results(path: str) -> dict:
+    """读取 save_results() 写入的文件 (Read a file written by save_results())"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
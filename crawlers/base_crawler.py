@@ -33,13 +33,21 @@
 # ==============================================================================
 
 import httpx
-import json
 import asyncio
-import re
+import time
+from typing import Any, AsyncIterator, Callable
 
 from httpx import Response
 
 from crawlers.utils.logger import logger
+from crawlers.utils.client_pool import client_pool
+from crawlers.utils.rate_limiter import rate_limiter, parse_retry_after
+from crawlers.utils.retry import RetryPolicy
+from crawlers.utils.single_flight import single_flight, canonical_endpoint
+from crawlers.utils.cache import response_cache
+from crawlers.utils.token_pool import token_pools
+from crawlers.utils import json_codec
+from crawlers.utils.json_codec import loads_embedded, JSONArrayStream
 from crawlers.utils.api_exceptions import (
     APIError,
     APIConnectionError,
@@ -66,6 +74,9 @@ class BaseCrawler:
             timeout: int = 10,
             max_tasks: int = 50,
             crawler_headers: dict = {},
+            platform: str = None,
+            retry_policy: RetryPolicy = None,
+            json_loads=None,
     ):
         if isinstance(proxies, dict):
             self.proxies = proxies
@@ -76,9 +87,12 @@ class BaseCrawler:
         # 爬虫请求头 / Crawler request header
         self.crawler_headers = crawler_headers or {}
 
-        # 异步的任务数 / Number of asynchronous tasks
+        # 所属平台，指定后复用进程级共享客户端 / Platform name, reuses the shared client when set
+        self.platform = platform
+
+        # 异步的任务数，共享客户端按平台共用上限 / Number of asynchronous tasks, shared clients share one cap per platform
         self._max_tasks = max_tasks
-        self.semaphore = asyncio.Semaphore(max_tasks)
+        self.semaphore = client_pool.get_semaphore(platform) if platform else asyncio.Semaphore(max_tasks)
 
         # 限制最大连接数 / Limit the maximum number of connections
         self._max_connections = max_connections
@@ -86,20 +100,35 @@ class BaseCrawler:
 
         # 业务逻辑重试次数 / Business logic retry count
         self._max_retries = max_retries
-        # 底层连接重试次数 / Underlying connection retry count
-        self.atransport = httpx.AsyncHTTPTransport(retries=max_retries)
+
+        # 重试策略，默认读取配置并沿用 max_retries / Retry policy, defaults to the config with max_retries attempts
+        self.retry_policy = retry_policy or RetryPolicy.from_config(max_attempts=max_retries)
+
+        # JSON解码器，默认在安装了 orjson 时使用它 / JSON decoder, defaults to orjson when installed
+        self.json_loads = json_loads or json_codec.loads
+        # 最近一次流式请求的外层对象 / Envelope of the last streamed response
+        self.last_envelope = None
 
         # 超时等待时间 / Timeout waiting time
         self._timeout = timeout
         self.timeout = httpx.Timeout(timeout)
-        # 异步客户端 / Asynchronous client
-        self.aclient = httpx.AsyncClient(
-            headers=self.crawler_headers,
-            proxies=self.proxies,
-            timeout=self.timeout,
-            limits=self.limits,
-            transport=self.atransport,
-        )
+
+        if self.platform:
+            # 共享客户端由连接池管理，不随爬虫实例关闭 / Shared clients are owned by the pool, not closed with the crawler
+            self._owns_client = False
+            self.aclient = client_pool.get_client(self.platform, self.proxies, self.crawler_headers)
+        else:
+            self._owns_client = True
+            # 底层连接重试次数 / Underlying connection retry count
+            self.atransport = httpx.AsyncHTTPTransport(retries=max_retries)
+            # 异步客户端 / Asynchronous client
+            self.aclient = httpx.AsyncClient(
+                headers=self.crawler_headers,
+                proxies=self.proxies,
+                timeout=self.timeout,
+                limits=self.limits,
+                transport=self.atransport,
+            )
 
     async def fetch_response(self, endpoint: str) -> Response:
         """获取数据 (Get data)
@@ -121,8 +150,62 @@ class BaseCrawler:
         Returns:
             dict: 解析后的JSON数据 (Parsed JSON data)
         """
+        if not self.platform:
+            response = await self.get_fetch_data(endpoint)
+            return self.parse_json(response)
+
+        key = self.request_key(endpoint)
+        ttl = response_cache.ttl_for(endpoint)
+
+        if ttl is not None:
+            entry = await response_cache.aget(key)
+            if entry is not None:
+                # 过期条目先返回旧值，再在后台刷新 / Serve stale entries now and refresh them in the background
+                if not entry.is_fresh(time.monotonic()):
+                    response_cache.refresh(
+                        key, lambda: single_flight.do(key, lambda: self._fetch_get_json(endpoint, key, ttl))
+                    )
+                return entry.value
+
+        # 共享客户端的相同请求合并为一次上游调用 / Identical requests on shared clients collapse into one upstream call
+        return await single_flight.do(key, lambda: self._fetch_get_json(endpoint, key, ttl))
+
+    async def _fetch_get_json(self, endpoint: str, key: tuple, ttl: float = None) -> dict:
         response = await self.get_fetch_data(endpoint)
-        return self.parse_json(response)
+        data = self.parse_json(response)
+        if ttl is not None and self.is_cacheable(data) and response_cache.accepts(endpoint, data):
+            response_cache.set(key, data, ttl, len(response.content))
+        return data
+
+    @staticmethod
+    def is_cacheable(data: dict) -> bool:
+        """业务状态码为成功时才缓存 (Only cache payloads whose business status code is success)
+
+        Args:
+            data (dict): 解析后的JSON数据 (Parsed JSON data)
+
+        Returns:
+            bool: 是否可以缓存 (Whether the payload may be cached)
+        """
+        if not isinstance(data, dict) or not data:
+            return False
+        for field in ("status_code", "statusCode", "code"):
+            if data.get(field) not in (None, 0):
+                return False
+        return True
+
+    def request_key(self, endpoint: str) -> tuple:
+        """生成与签名无关的请求键 (Build a request key that ignores signatures)
+
+        Args:
+            endpoint (str): 接口地址 (Endpoint URL)
+
+        Returns:
+            tuple: (平台, 代理, 请求头, 规范化端点) (Platform, proxies, headers, canonical endpoint)
+        """
+        return client_pool.make_key(self.platform, self.proxies, self.crawler_headers) + (
+            canonical_endpoint(endpoint),
+        )
 
     async def fetch_post_json(self, endpoint: str, params: dict = {}, data=None) -> dict:
         """获取 JSON 数据 (Post JSON data)
@@ -136,6 +219,47 @@ class BaseCrawler:
         response = await self.post_fetch_data(endpoint, params, data)
         return self.parse_json(response)
 
+    async def stream_get_json_items(
+            self,
+            endpoint: str,
+            field: str,
+            project: Callable[[dict], Any] = None,
+    ) -> AsyncIterator[Any]:
+        """流式获取JSON数组字段中的元素 (Stream the elements of a JSON array field)
+
+        按块读取响应并逐个解析数组元素，不在内存中构建完整的响应树；不经过响应缓存。
+        读取结束后，去掉该数组的外层对象保存在 self.last_envelope 中，用于获取游标等分页信息。
+        (Reads the body in chunks and parses array elements one at a time without
+        building the full response tree; bypasses the response cache. Afterwards
+        the envelope without the array is kept in self.last_envelope for cursors
+        and other pagination fields.)
+
+        Args:
+            endpoint (str): 接口地址 (Endpoint URL)
+            field (str): 顶层数组字段名，例如 aweme_list (Top-level array field, e.g. aweme_list)
+            project (Callable): 对每个元素应用的投影函数 (Projection applied to each element)
+
+        Yields:
+            Any: 数组元素或其投影 (Array elements or their projections)
+        """
+        self.last_envelope = None
+        parser = JSONArrayStream(field, self.json_loads)
+        response = await self._request_with_retry("GET", endpoint, stream=True)
+        try:
+            async for chunk in response.aiter_bytes():
+                for item in parser.feed(chunk):
+                    yield project(item) if project else item
+            self.last_envelope = parser.close()
+        except ValueError as e:
+            logger.error("解析 {0} 接口 JSON 失败： {1}".format(response.url, e))
+            raise APIResponseError("解析JSON数据失败")
+        except httpx.RequestError:
+            raise APIConnectionError("连接端点失败，检查网络环境或代理：{0} 代理：{1} 类名：{2}"
+                                     .format(endpoint, self.proxies, self.__class__.__name__)
+                                     )
+        finally:
+            await response.aclose()
+
     def parse_json(self, response: Response) -> dict:
         """解析JSON响应对象 (Parse JSON response object)
 
@@ -150,14 +274,15 @@ class BaseCrawler:
                 and isinstance(response, Response)
                 and response.status_code == 200
         ):
+            # 直接解码字节，避免生成 response.text / Decode the bytes directly without materialising response.text
+            content = response.content
             try:
-                return response.json()
-            except json.JSONDecodeError as e:
-                # 尝试使用正则表达式匹配response.text中的json数据
-                match = re.search(r"\{.*\}", response.text)
+                return self.json_loads(content)
+            except ValueError:
+                # 响应中混有非JSON内容时截取JSON对象 / Cut out the JSON object when the body has extra content
                 try:
-                    return json.loads(match.group())
-                except json.JSONDecodeError as e:
+                    return loads_embedded(content, self.json_loads)
+                except ValueError as e:
                     logger.error("解析 {0} 接口 JSON 失败： {1}".format(response.url, e))
                     raise APIResponseError("解析JSON数据失败")
 
@@ -181,38 +306,7 @@ class BaseCrawler:
         Returns:
             response: 响应内容 (Response content)
         """
-        for attempt in range(self._max_retries):
-            try:
-                response = await self.aclient.get(url, follow_redirects=True)
-                if not response.text.strip() or not response.content:
-                    error_message = "第 {0} 次响应内容为空, 状态码: {1}, URL:{2}".format(attempt + 1,
-                                                                                         response.status_code,
-                                                                                         response.url)
-
-                    logger.warning(error_message)
-
-                    if attempt == self._max_retries - 1:
-                        raise APIRetryExhaustedError(
-                            "获取端点数据失败, 次数达到上限"
-                        )
-
-                    await asyncio.sleep(self._timeout)
-                    continue
-
-                # logger.info("响应状态码: {0}".format(response.status_code))
-                response.raise_for_status()
-                return response
-
-            except httpx.RequestError:
-                raise APIConnectionError("连接端点失败，检查网络环境或代理：{0} 代理：{1} 类名：{2}"
-                                         .format(url, self.proxies, self.__class__.__name__)
-                                         )
-
-            except httpx.HTTPStatusError as http_error:
-                self.handle_http_status_error(http_error, url, attempt + 1)
-
-            except APIError as e:
-                e.display_error()
+        return await self._request_with_retry("GET", url, follow_redirects=True)
 
     async def post_fetch_data(self, url: str, params: dict = {}, data=None):
         """
@@ -225,44 +319,120 @@ class BaseCrawler:
         Returns:
             response: 响应内容 (Response content)
         """
-        for attempt in range(self._max_retries):
+        return await self._request_with_retry(
+            "POST",
+            url,
+            json=None if not params else dict(params),
+            data=None if not data else data,
+            follow_redirects=True,
+        )
+
+    async def _request_with_retry(
+            self,
+            method: str,
+            url: str,
+            stream: bool = False,
+            follow_redirects: bool = True,
+            **kwargs,
+    ) -> Response:
+        """
+        按重试策略发送请求 (Send a request following the retry policy)
+
+        空响应、连接失败、5xx 与 429 按 RetryPolicy 指数退避重试，其余状态码直接抛出。
+        (Empty bodies, connection failures, 5xx and 429 are retried with the
+        RetryPolicy's exponential backoff, other status codes raise immediately.)
+
+        Args:
+            method (str): 请求方法 (HTTP method)
+            url (str): 端点URL (Endpoint URL)
+            stream (bool): 只读取响应头，由调用方读取并关闭响应；此时不检查空响应
+            (Read only the headers and leave reading and closing the body to the
+            caller; empty bodies are not detected in this mode)
+            follow_redirects (bool): 是否跟随重定向 (Whether to follow redirects)
+
+        Returns:
+            Response: 响应对象 (Response object)
+        """
+        policy = self.retry_policy
+        started = time.monotonic()
+        attempt = 0
+
+        while True:
+            attempt += 1
+            min_delay = 0
+            limiter_waits = False
             try:
-                response = await self.aclient.post(
-                    url,
-                    json=None if not params else dict(params),
-                    data=None if not data else data,
-                    follow_redirects=True
+                async with self.semaphore:
+                    await rate_limiter.acquire(url)
+                    request = self.aclient.build_request(method, url, **kwargs)
+                    response = await self.aclient.send(request, stream=stream, follow_redirects=follow_redirects)
+            except httpx.RequestError as e:
+                error_class = RetryPolicy.CONNECT_ERROR
+                error_message = "第 {0} 次连接失败：{1}, URL:{2}".format(attempt, e.__class__.__name__, url)
+            else:
+                if response.status_code == 429:
+                    error_class = RetryPolicy.RATE_LIMITED
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    min_delay, limiter_waits = rate_limiter.penalize(url, retry_after)
+                elif response.status_code >= 500:
+                    error_class = RetryPolicy.SERVER_ERROR
+                elif not stream and not response.content.strip():
+                    error_class = RetryPolicy.EMPTY_BODY
+                    # 上游拒绝令牌时通常返回空响应 / Upstream usually answers rejected tokens with an empty body
+                    token_pools.reject(url)
+                else:
+                    try:
+                        response.raise_for_status()
+                    except httpx.HTTPStatusError as http_error:
+                        if response.status_code in (401, 403):
+                            token_pools.reject(url)
+                        if stream:
+                            await response.aclose()
+                        self.handle_http_status_error(http_error, url, attempt)
+                    return response
+                error_message = "第 {0} 次请求失败, 状态码: {1}, URL:{2}".format(
+                    attempt, response.status_code, response.url
                 )
-                if not response.text.strip() or not response.content:
-                    error_message = "第 {0} 次响应内容为空, 状态码: {1}, URL:{2}".format(attempt + 1,
-                                                                                         response.status_code,
-                                                                                         response.url)
+                if stream:
+                    await response.aclose()
 
-                    logger.warning(error_message)
+            logger.warning(error_message)
 
-                    if attempt == self._max_retries - 1:
-                        raise APIRetryExhaustedError(
-                            "获取端点数据失败, 次数达到上限"
-                        )
+            # 等待时间过长的 429 直接失败 / Fail fast on 429s that ask for too long a wait
+            delay = None
+            if min_delay <= rate_limiter.max_retry_after:
+                delay = policy.next_delay(error_class, attempt, started, min_delay)
 
-                    await asyncio.sleep(self._timeout)
-                    continue
+            if delay is None:
+                self.raise_for_exhausted(error_class, url, attempt, response)
 
-                # logger.info("响应状态码: {0}".format(response.status_code))
-                response.raise_for_status()
-                return response
+            # 限速器暂停了该域名时 429 的等待由它完成，这里只叠加退避；否则完整等待
+            # When the limiter paused the host it enforces the 429 wait and only the backoff is slept here, otherwise sleep it all
+            await asyncio.sleep(delay - min_delay if limiter_waits else delay)
 
-            except httpx.RequestError:
-                raise APIConnectionError(
-                    "连接端点失败，检查网络环境或代理：{0} 代理：{1} 类名：{2}".format(url, self.proxies,
-                                                                                   self.__class__.__name__)
-                )
-
-            except httpx.HTTPStatusError as http_error:
-                self.handle_http_status_error(http_error, url, attempt + 1)
+    def raise_for_exhausted(self, error_class: str, url: str, attempt: int, response: Response = None):
+        """
+        重试结束后抛出对应的异常 (Raise the matching error once retrying stops)
 
-            except APIError as e:
-                e.display_error()
+        Args:
+            error_class (str): 最后一次失败的错误类别 (Error class of the last failure)
+            url (str): 端点URL (Endpoint URL)
+            attempt (int): 尝试次数 (Number of attempts)
+            response (Response): 最后一次的响应对象 (Last response object)
+        """
+        if error_class == RetryPolicy.CONNECT_ERROR:
+            raise APIConnectionError("连接端点失败，检查网络环境或代理：{0} 代理：{1} 类名：{2}"
+                                     .format(url, self.proxies, self.__class__.__name__)
+                                     )
+        if error_class == RetryPolicy.EMPTY_BODY:
+            raise APIRetryExhaustedError("获取端点数据失败, 次数达到上限")
+
+        self.handle_http_status_error(
+            httpx.HTTPStatusError("HTTP Status Code {0}".format(response.status_code),
+                                  request=response.request, response=response),
+            url,
+            attempt,
+        )
 
     async def head_fetch_data(self, url: str):
         """
@@ -275,7 +445,9 @@ class BaseCrawler:
             response: 响应内容 (Response content)
         """
         try:
-            response = await self.aclient.head(url)
+            async with self.semaphore:
+                await rate_limiter.acquire(url)
+                response = await self.aclient.head(url)
             # logger.info("响应状态码: {0}".format(response.status_code))
             response.raise_for_status()
             return response
@@ -340,10 +512,11 @@ class BaseCrawler:
             raise APIResponseError(f"HTTP状态错误: {status_code}")
 
     async def close(self):
-        await self.aclient.aclose()
+        if self._owns_client:
+            await self.aclient.aclose()
 
     async def __aenter__(self):
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.aclient.aclose()
+        await self.close()
@@ -1,5 +1,8 @@
+from functools import lru_cache
+from operator import itemgetter
 from urllib.parse import urlencode
 from crawlers.bilibili.web import wrid
+from crawlers.bilibili.web.models import BaseRequestsModel
 from crawlers.utils.logger import logger
 from crawlers.bilibili.web.endpoints import BilibiliAPIEndpoints
 
@@ -50,29 +53,94 @@ class EndpointGenerator:
 
 
 class WridManager:
+    # WBI 签名追加在 wts 之后的混合密钥 (Mixin key appended to wts for WBI signing)
+    MIXIN_KEY = "ea1db124af3c7062474693fa704f4ff8"
+    # 需要从参数值中过滤的字符 (Characters filtered out of parameter values)
+    _FILTER = str.maketrans("", "", "!'()*")
+    # 请求模型中带固定默认值、每次请求都相同的字段，mid、pn、bvid、wts 等不在其中
+    # (Fields with a fixed default in the request models, identical on every request; mid, pn, bvid, wts etc. are not)
+    CONSTANT_FIELDS = frozenset(
+        name
+        for model in BaseRequestsModel.__subclasses__()
+        for name, field in model.model_fields.items()
+        if name != "wts" and not field.is_required() and field.default_factory is None
+    )
+
+    @classmethod
+    def encode_items(cls, items) -> tuple:
+        """
+        过滤并逐项编码参数，保留原始键用于排序
+        (Filter and encode the parameters one by one, keeping the raw key for sorting)
+
+        Returns:
+            tuple: (原始键, 已编码的 "键=值") ((raw key, encoded "key=value"))
+        """
+        return tuple((k, urlencode(((k, v.translate(cls._FILTER)),))) for k, v in items)
+
+    @classmethod
+    @lru_cache(maxsize=64)
+    def get_static_query(cls, items: tuple) -> tuple:
+        """
+        编码模型的常量字段，按常量字段的取值缓存
+        (Encode the constant fields of a model, cached by their values)
+
+        只有 CONSTANT_FIELDS 中的参数进入缓存键，同一模型的请求都会命中；mid、pn、bvid 等每次
+        都不同的参数由 encode_query 单独编码后按键合并进来。
+        (Only parameters in CONSTANT_FIELDS make up the cache key, so every request of a model hits it;
+        per-request values such as mid, pn and bvid are encoded separately and merged in by key in encode_query.)
+
+        Returns:
+            tuple: 按键排序的 (原始键, 已编码的 "键=值") (Sorted (raw key, encoded "key=value") pairs)
+        """
+        return tuple(sorted(cls.encode_items(items)))
+
+    @classmethod
+    @lru_cache(maxsize=16)
+    def get_encoded_wts(cls, wts: str) -> str:
+        """编码追加了混合密钥的 wts，同一秒内的请求共用 (Encode wts with the mixin key, shared within one second)"""
+        return urlencode({"wts": (wts + cls.MIXIN_KEY).translate(cls._FILTER)})
+
+    @classmethod
+    def encode_query(cls, params: dict) -> str:
+        constant, dynamic = [], []
+        for k, v in params.items():
+            if k in cls.CONSTANT_FIELDS:
+                constant.append((k, str(v)))
+            elif k != "wts":
+                dynamic.append((k, str(v)))
+        wts = ("wts", cls.get_encoded_wts(str(params["wts"])))
+        pairs = sorted(cls.get_static_query(tuple(constant)) + cls.encode_items(dynamic) + (wts,), key=itemgetter(0))
+        return "&".join(pair for _, pair in pairs)
+
     @classmethod
     async def get_encode_query(cls, params: dict) -> str:
-        params['wts'] = params['wts'] + "ea1db124af3c7062474693fa704f4ff8"
-        params = dict(sorted(params.items()))  # 按照 key 重排参数
-        # 过滤 value 中的 "!'()*" 字符
-        params = {
-            k: ''.join(filter(lambda chr: chr not in "!'()*", str(v)))
-            for k, v
-            in params.items()
-        }
-        query = urlencode(params)  # 序列化参数
-        return query
+        return cls.encode_query(params)
 
     @classmethod
     async def wrid_model_endpoint(cls, params: dict) -> str:
-        wts = params["wts"]
-        encode_query = await cls.get_encode_query(params)
-        # 获取w_rid参数
-        w_rid = wrid.get_wrid(e=encode_query)
-        params["wts"] = wts
-        params["w_rid"] = w_rid
+        # 复制一份再追加w_rid，不修改调用方的字典 (Copy before adding w_rid so the caller's dict is left untouched)
+        params = dict(params)
+        encode_query = cls.encode_query(params)
+        # 获取w_rid参数，hashlib 计算足够快，无需交给签名服务
+        # Get w_rid, hashlib is fast enough to skip the signing service
+        params["w_rid"] = wrid.get_wrid(encode_query)
         return "&".join(f"{k}={v}" for k, v in params.items())
 
+    @classmethod
+    def sign_many(cls, params_list: list) -> list:
+        """
+        批量生成带w_rid参数的查询字符串，结果与 params_list 顺序一致，不修改传入的字典
+        (Build w_rid-signed queries for a batch in the order of params_list, without mutating the dicts)
+
+        同一秒内的请求共用 wts 编码。
+        (Requests within the same second share the encoded wts.)
+        """
+        queries = []
+        for params in params_list:
+            w_rid = wrid.get_wrid(cls.encode_query(params))
+            queries.append("&".join(f"{k}={v}" for k, v in params.items()) + "&w_rid=" + w_rid)
+        return queries
+
 # BV号转为对应av号
 async def bv2av(bv_id: str) -> int:
     table = "fZodR9XQDSUm21yCkr6zBqiveYah8bt4xsWpHnJE7jL5VG3guMTKNPAwcF"
@@ -39,9 +39,13 @@ import yaml  # 配置文件
 
 # 基础爬虫客户端和哔哩哔哩API端点
 from crawlers.base_crawler import BaseCrawler
+from crawlers.utils.batch import batch_runner
+from crawlers.utils.cache import response_cache
+from crawlers.utils.negative_cache import negative_cache, NegativeCache
+from crawlers.utils.api_exceptions import APINotFoundError
 from crawlers.bilibili.web.endpoints import BilibiliAPIEndpoints
 # 哔哩哔哩工具类
-from crawlers.bilibili.web.utils import EndpointGenerator, bv2av, ResponseAnalyzer
+from crawlers.bilibili.web.utils import EndpointGenerator, WridManager, bv2av, ResponseAnalyzer
 # 数据请求模型
 from crawlers.bilibili.web.models import UserPostVideos, UserProfile, ComPopular, UserDynamic, PlayUrl
 
@@ -52,6 +56,15 @@ path = os.path.abspath(os.path.dirname(__file__))
 with open(f"{path}/config.yaml", "r", encoding="utf-8") as f:
     config = yaml.safe_load(f)
 
+# 各端点的响应缓存时间(秒)，未注册的端点及使用用户Cookie的接口不缓存
+# Response cache TTLs per endpoint (seconds), unregistered endpoints and user-cookie handlers are not cached
+response_cache.register(BilibiliAPIEndpoints.POST_DETAIL, ttl=3600)  # 作品详情 / Post detail
+response_cache.register(BilibiliAPIEndpoints.VIDEO_PARTS, ttl=3600)  # 视频分P / Video parts
+response_cache.register(BilibiliAPIEndpoints.USER_DETAIL, ttl=600)  # 用户信息 / User profile
+response_cache.register(BilibiliAPIEndpoints.USER_POST, ttl=300)  # 用户作品 / User posts
+response_cache.register(BilibiliAPIEndpoints.VIDEO_COMMENTS, ttl=120)  # 视频评论 / Video comments
+response_cache.register(BilibiliAPIEndpoints.COM_POPULAR, ttl=120)  # 热门视频 / Popular videos
+
 
 class BilibiliWebCrawler:
 
@@ -74,15 +87,28 @@ class BilibiliWebCrawler:
 
     # 获取单个视频详情信息
     async def fetch_one_video(self, bv_id: str) -> dict:
+        # 已确认删除或不可见的稿件直接失败 / Known deleted or hidden videos fail fast
+        negative_cache.check(NegativeCache.BV_ID, bv_id)
         # 获取请求头信息
         kwargs = await self.get_bilibili_headers()
         # 创建基础爬虫对象
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="bilibili")
         async with base_crawler as crawler:
             # 创建请求endpoint
             endpoint = f"{BilibiliAPIEndpoints.POST_DETAIL}?bvid={bv_id}"
             # 发送请求，获取请求响应结果
-            response = await crawler.fetch_get_json(endpoint)
+            try:
+                response = await crawler.fetch_get_json(endpoint)
+            except APINotFoundError:
+                negative_cache.add(NegativeCache.BV_ID, bv_id, "稿件不存在")
+                raise
+
+        # -404: 稿件不存在, 62002: 稿件不可见, 62012: 仅UP主自己可见
+        # -404: not found, 62002: invisible, 62012: visible to the uploader only
+        if response.get("code") in (-404, 62002, 62012):
+            reason = response.get("message") or "稿件不存在或不可见"
+            negative_cache.add(NegativeCache.BV_ID, bv_id, reason)
+            raise APINotFoundError("{0}：{1}".format(reason, bv_id))
         return response
 
     # 获取视频流地址
@@ -90,7 +116,7 @@ class BilibiliWebCrawler:
         # 获取请求头信息
         kwargs = await self.get_bilibili_headers()
         # 创建基础爬虫对象
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="bilibili")
         async with base_crawler as crawler:
             # 通过模型生成基本请求参数
             params = PlayUrl(bvid=bv_id, cid=cid, qn=qn)
@@ -111,7 +137,7 @@ class BilibiliWebCrawler:
         # 获取请求头信息
         kwargs = await self.get_bilibili_headers()
         # 创建基础爬虫对象
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="bilibili")
         async with base_crawler as crawler:
             # 通过模型生成基本请求参数
             params = UserPostVideos(mid=uid, pn=pn)
@@ -122,12 +148,38 @@ class BilibiliWebCrawler:
             response = await crawler.fetch_get_json(endpoint)
         return response
 
+    # 一次获取用户发布视频的多页数据，页码事先已知，整批一次签名后由批量执行器并发请求，结果与页码顺序一致
+    # Fetch several pages of a user's videos: page numbers are known up front, so the pages are signed in one go
+    # and requested by the batch runner; results keep the order of pns
+    async def fetch_user_post_videos_pages(self, uid: str, pns: list) -> list:
+        """
+        :param uid: 用户uid
+        :param pns: 页码列表
+        :return: 每页一项，包含 input、data、error
+        """
+        # 获取请求头信息
+        kwargs = await self.get_bilibili_headers()
+        # 创建基础爬虫对象
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="bilibili")
+        async with base_crawler as crawler:
+            unique_pns = list(dict.fromkeys(pns))
+            # 整批签名，同一模型的常量字段与同一秒的 wts 只编码一次
+            params_list = [UserPostVideos(mid=uid, pn=pn).dict() for pn in unique_pns]
+            queries = WridManager.sign_many(params_list)
+            endpoints = {pn: f"{BilibiliAPIEndpoints.USER_POST}?{query}" for pn, query in zip(unique_pns, queries)}
+
+            async def fetch(pn: int) -> dict:
+                return await crawler.fetch_get_json(endpoints[pn])
+
+            results = await batch_runner.run(pns, fetch)
+        return [result.to_dict() for result in results]
+
     # 获取用户所有收藏夹信息
     async def fetch_collect_folders(self, uid: str) -> dict:
         # 获取请求头信息
         kwargs = await self.get_bilibili_headers()
         # 创建基础爬虫对象
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="bilibili")
         async with base_crawler as crawler:
             # 创建请求endpoint
             endpoint = f"{BilibiliAPIEndpoints.COLLECT_FOLDERS}?up_mid={uid}"
@@ -147,7 +199,7 @@ class BilibiliWebCrawler:
         # 获取请求头信息
         kwargs = await self.get_bilibili_headers()
         # 创建基础爬虫对象
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="bilibili")
         # 发送请求，获取请求响应结果
         async with base_crawler as crawler:
             endpoint = f"{BilibiliAPIEndpoints.COLLECT_VIDEOS}?media_id={folder_id}&pn={pn}&ps=20&keyword=&order=mtime&type=0&tid=0&platform=web"
@@ -159,7 +211,7 @@ class BilibiliWebCrawler:
         # 获取请求头信息
         kwargs = await self.get_bilibili_headers()
         # 创建基础爬虫对象
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="bilibili")
         async with base_crawler as crawler:
             # 通过模型生成基本请求参数
             params = UserProfile(mid=uid)
@@ -175,7 +227,7 @@ class BilibiliWebCrawler:
         # 获取请求头信息
         kwargs = await self.get_bilibili_headers()
         # 创建基础爬虫对象
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="bilibili")
         async with base_crawler as crawler:
             # 通过模型生成基本请求参数
             params = ComPopular(pn=pn)
@@ -193,7 +245,7 @@ class BilibiliWebCrawler:
         # 获取请求头信息
         kwargs = await self.get_bilibili_headers()
         # 创建基础爬虫对象
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="bilibili")
         async with base_crawler as crawler:
             # 创建请求endpoint
             endpoint = f"{BilibiliAPIEndpoints.VIDEO_COMMENTS}?type=1&oid={bv_id}&sort={sort}&nohot=0&ps=20&pn={pn}"
@@ -212,7 +264,7 @@ class BilibiliWebCrawler:
         # 获取请求头信息
         kwargs = await self.get_bilibili_headers()
         # 创建基础爬虫对象
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="bilibili")
         async with base_crawler as crawler:
             # 创建请求endpoint
             endpoint = f"{BilibiliAPIEndpoints.COMMENT_REPLY}?type=1&oid={bv_id}&root={rpid}&&ps=20&pn={pn}"
@@ -225,7 +277,7 @@ class BilibiliWebCrawler:
         # 获取请求头信息
         kwargs = await self.get_bilibili_headers()
         # 创建基础爬虫对象
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="bilibili")
         async with base_crawler as crawler:
             # 通过模型生成基本请求参数
             params = UserDynamic(host_mid=uid, offset=offset)
@@ -242,7 +294,7 @@ class BilibiliWebCrawler:
         # 获取请求头信息
         kwargs = await self.get_bilibili_headers()
         # 创建基础爬虫对象
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="bilibili")
         async with base_crawler as crawler:
             # 创建请求endpoint
             endpoint = f"https://comment.bilibili.com/{cid}.xml"
@@ -255,7 +307,7 @@ class BilibiliWebCrawler:
         # 获取请求头信息
         kwargs = await self.get_bilibili_headers()
         # 创建基础爬虫对象
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="bilibili")
         async with base_crawler as crawler:
             # 创建请求endpoint
             endpoint = f"{BilibiliAPIEndpoints.LIVEROOM_DETAIL}?room_id={room_id}"
@@ -268,7 +320,7 @@ class BilibiliWebCrawler:
         # 获取请求头信息
         kwargs = await self.get_bilibili_headers()
         # 创建基础爬虫对象
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="bilibili")
         async with base_crawler as crawler:
             # 创建请求endpoint
             endpoint = f"{BilibiliAPIEndpoints.LIVE_VIDEOS}?cid={room_id}&quality=4"
@@ -281,7 +333,7 @@ class BilibiliWebCrawler:
         # 获取请求头信息
         kwargs = await self.get_bilibili_headers()
         # 创建基础爬虫对象
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="bilibili")
         async with base_crawler as crawler:
             # 创建请求endpoint
             endpoint = f"{BilibiliAPIEndpoints.LIVE_STREAMER}?platform=web&parent_area_id={area_id}&page={pn}"
@@ -301,7 +353,7 @@ class BilibiliWebCrawler:
         # 获取请求头信息
         kwargs = await self.get_bilibili_headers()
         # 创建基础爬虫对象
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="bilibili")
         async with base_crawler as crawler:
             # 创建请求endpoint
             endpoint = f"{BilibiliAPIEndpoints.VIDEO_PARTS}?bvid={bv_id}"
@@ -314,7 +366,7 @@ class BilibiliWebCrawler:
         # 获取请求头信息
         kwargs = await self.get_bilibili_headers()
         # 创建基础爬虫对象
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="bilibili")
         async with base_crawler as crawler:
             # 创建请求endpoint
             endpoint = BilibiliAPIEndpoints.LIVE_AREAS
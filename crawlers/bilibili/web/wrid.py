@@ -1,3 +1,4 @@
+import hashlib
 import urllib.parse
 
 def srotl(t, e):
@@ -180,7 +181,21 @@ def tbytes_to_hex(t):
         e.append(hex(t[n] & 15)[2:])
     return ''.join(e)
 
-def get_wrid(e):
+# 从JS移植的MD5实现，仅作为 get_wrid 的对照保留
+# MD5 ported from JS, kept only as a reference for get_wrid
+def get_wrid_js(e):
     n = None
     i = twords_to_bytes(o(e, n))
     return tbytes_to_hex(i)
+
+def get_wrid(e: str) -> str:
+    """
+    使用 hashlib 计算 w_rid，结果与 get_wrid_js 相同
+    (Compute w_rid with hashlib, matching get_wrid_js)
+    """
+    try:
+        data = e.encode("ascii")
+    except UnicodeEncodeError:
+        # 与JS版一致，非ASCII字符只取低8位 / Like the JS port, keep only the low 8 bits of non-ASCII chars
+        data = bytes(ord(c) & 255 for c in e)
+    return hashlib.md5(data).hexdigest()
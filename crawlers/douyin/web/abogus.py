@@ -22,7 +22,8 @@ from re import compile
 from time import time
 from urllib.parse import urlencode
 from urllib.parse import quote
-from gmssl import sm3, func
+
+from crawlers.douyin.web.sm3 import sm3_digest
 
 __all__ = ["ABogus", ]
 
@@ -51,6 +52,19 @@ class ABogus:
         "s3": "ckdp1h4ZKsUB80/Mfvw36XIgR25+WQAlEi7NLboqYTOPuzmFjJnryx9HVGDaStCe",
         "s4": "Dkdpgh2ZmsQB80/MfvV36XI1R45-WUAlEixNLwoqYTOPuzKFjJnry79HbGcaStCe",
     }
+    # Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36
+    __ua_code = (
+        76, 98, 15, 131, 97, 245, 224, 133,
+        122, 199, 241, 166, 79, 34, 90, 191,
+        128, 126, 122, 98, 66, 11, 14, 40,
+        49, 110, 110, 173, 67, 96, 138, 252,
+    )
+    # 与输入无关的中间结果，进程内只计算一次 (Input-independent intermediates, computed once per process)
+    __method_codes = {}
+    __rc4_schedules = {}
+    __signers = {}
+    # SM3 后端，默认使用 OpenSSL (SM3 backend, OpenSSL by default)
+    sm3_backend = staticmethod(sm3_digest)
 
     def __init__(self,
                  # user_agent: str = USERAGENT,
@@ -59,45 +73,37 @@ class ABogus:
         self.size = 0
         self.reg = self.__reg[:]
         # self.ua_code = self.generate_ua_code(user_agent)
-        # Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36
-        self.ua_code = [
-            76,
-            98,
-            15,
-            131,
-            97,
-            245,
-            224,
-            133,
-            122,
-            199,
-            241,
-            166,
-            79,
-            34,
-            90,
-            191,
-            128,
-            126,
-            122,
-            98,
-            66,
-            11,
-            14,
-            40,
-            49,
-            110,
-            110,
-            173,
-            67,
-            96,
-            138,
-            252]
+        self.ua_code = self.__ua_code
         self.browser = self.generate_browser_info(
             platform) if platform else self.__browser
         self.browser_len = len(self.browser)
         self.browser_code = self.char_code_at(self.browser)
 
+    def __init_subclass__(cls, **kwargs):
+        """
+        子类可能替换 sm3_backend，缓存按类分开，避免复用父类用其他后端算出的结果
+        (Subclasses may swap sm3_backend, so each class gets its own caches instead of reusing results
+        computed by the parent's backend)
+        """
+        super().__init_subclass__(**kwargs)
+        cls.__method_codes = {}
+        cls.__rc4_schedules = {}
+        cls.__signers = {}
+
+    @classmethod
+    def signer(cls, platform: str = None) -> "ABogus":
+        """
+        获取按平台字符串缓存的签名对象，ua_code 与 browser_code 只生成一次
+        (Get the signer cached per platform string so ua_code and browser_code are built once)
+
+        get_value 不修改实例状态，同一个对象可以在多个线程中复用。
+        (get_value does not mutate instance state, so one object is safe to share across threads.)
+        """
+        signer = cls.__signers.get(platform)
+        if signer is None:
+            signer = cls.__signers.setdefault(platform, cls(platform))
+        return signer
+
     @classmethod
     def list_1(cls, random_num=None, a=170, b=85, c=45, ) -> list:
         return cls.random_list(
@@ -514,7 +520,11 @@ class ABogus:
         return [int(i) & 255 for i in a]
 
     def generate_method_code(self, method: str = "GET") -> list[int]:
-        return self.sm3_to_array(self.sm3_to_array(method + self.__end_string))
+        # 请求方法只有少数几种，两次SM3的结果按方法缓存 / Only a few methods exist, cache their double SM3
+        code = self.__method_codes.get(method)
+        if code is None:
+            code = self.__method_codes[method] = self.sm3_to_array(self.sm3_to_array(method + self.__end_string))
+        return code
         # return self.sum(self.sum(method + self.__end_string))
 
     def generate_params_code(self, params: str) -> list[int]:
@@ -541,11 +551,8 @@ class ABogus:
         else:
             b = bytes(data)  # 将 List[int] 转换为字节数组
 
-        # 将字节数组转换为适合 sm3.sm3_hash 函数处理的列表格式
-        h = sm3.sm3_hash(func.bytes_to_list(b))
-
-        # 将十六进制字符串结果转换为十进制整数列表
-        return [int(h[i: i + 2], 16) for i in range(0, len(h), 2)]
+        # 摘要的每个字节即为一个整数 (Each byte of the digest is one integer)
+        return list(cls.sm3_backend(b))
 
     @classmethod
     def generate_browser_info(cls, platform: str = "Win32") -> str:
@@ -576,14 +583,23 @@ class ABogus:
         ]
         return "|".join(str(i) for i in value_list)
 
-    @staticmethod
-    def rc4_encrypt(plaintext, key):
-        s = list(range(256))
-        j = 0
+    @classmethod
+    def rc4_key_schedule(cls, key: str) -> list:
+        # 密钥固定，初始置换按密钥缓存 / The key is constant, cache its initial permutation
+        schedule = cls.__rc4_schedules.get(key)
+        if schedule is None:
+            s = list(range(256))
+            j = 0
+
+            for i in range(256):
+                j = (j + s[i] + ord(key[i % len(key)])) % 256
+                s[i], s[j] = s[j], s[i]
+            schedule = cls.__rc4_schedules[key] = s
+        return schedule
 
-        for i in range(256):
-            j = (j + s[i] + ord(key[i % len(key)])) % 256
-            s[i], s[j] = s[j], s[i]
+    @classmethod
+    def rc4_encrypt(cls, plaintext, key):
+        s = cls.rc4_key_schedule(key)[:]
 
         i = 0
         j = 0
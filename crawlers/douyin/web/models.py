@@ -1,7 +1,7 @@
 from typing import Any, List
 from pydantic import BaseModel, Field
 
-from crawlers.douyin.web.utils import TokenManager, VerifyFpManager
+from crawlers.douyin.web.utils import TokenManager, VerifyFpManager, ms_token_pool, verify_fp_pool
 
 
 # Base Model
@@ -39,7 +39,7 @@ class BaseRequestModel(BaseModel):
     time_list_query: str = "0"
     whale_cut_token: str = ""
     update_version_code: str = "170400"
-    msToken: str = TokenManager.gen_real_msToken()
+    msToken: str = Field(default_factory=ms_token_pool.current)
 
 
 class BaseLiveModel(BaseModel):
@@ -62,13 +62,13 @@ class BaseLiveModel(BaseModel):
 
 
 class BaseLiveModel2(BaseModel):
-    verifyFp: str = VerifyFpManager.gen_verify_fp()
+    verifyFp: str = Field(default_factory=verify_fp_pool.current)
     type_id: str = "0"
     live_id: str = "1"
     sec_user_id: str = ""
     version_code: str = "99.99.99"
     app_id: str = "1128"
-    msToken: str = TokenManager.gen_real_msToken()
+    msToken: str = Field(default_factory=ms_token_pool.current)
 
 
 class BaseLoginModel(BaseModel):
@@ -0,0 +1,140 @@
+# ==============================================================================
+# Copyright (C) 2021 Evil0ctal
+#
+# This file is part of the Douyin_TikTok_Download_API project.
+#
+# This project is licensed under the Apache License 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+# 　　　　 　　  ＿＿
+# 　　　 　　 ／＞　　フ
+# 　　　 　　| 　_　 _ l
+# 　 　　 　／` ミ＿xノ
+# 　　 　 /　　　 　 |       Feed me Stars ⭐
+# 　　　 /　 ヽ　　 ﾉ
+# 　 　 │　　|　|　|
+# 　／￣|　　 |　|　|
+# 　| (￣ヽ＿_ヽ_)__)
+# 　＼二つ
+# ==============================================================================
+#
+# Contributor Link:
+# - https://github.com/Evil0ctal
+# - https://github.com/Johnserf-Seed
+#
+# ==============================================================================
+
+
+"""
+a_bogus 使用的 SM3 哈希后端 (SM3 hash backends used by a_bogus)
+
+优先使用 OpenSSL 提供的 hashlib.new("sm3")，不可用时使用基于 bytes 与 int 运算的纯Python实现。
+(Prefers hashlib.new("sm3") from OpenSSL and falls back to a pure-Python
+implementation working on bytes and ints.)
+"""
+
+import hashlib
+import struct
+from typing import Callable
+
+try:
+    from gmssl import sm3 as gmssl_sm3, func as gmssl_func
+except ImportError:  # gmssl 仅用于对照 / gmssl is only kept for comparison
+    gmssl_sm3 = None
+
+_MASK = 0xFFFFFFFF
+_IV = (0x7380166F, 0x4914B2B9, 0x172442D7, 0xDA8A0600, 0xA96F30BC, 0x163138AA, 0xE38DEE4D, 0xB0FB0E4E)
+
+
+def _rotl(x: int, n: int) -> int:
+    n %= 32
+    return ((x << n) & _MASK) | (x >> (32 - n))
+
+
+# 每轮循环左移后的常量 T_j / Round constants T_j already rotated by j
+_T = tuple(_rotl(0x79CC4519 if j < 16 else 0x7A879D8A, j) for j in range(64))
+
+
+def _compress(v: tuple, block: bytes) -> tuple:
+    w = list(struct.unpack(">16I", block))
+    for j in range(16, 68):
+        x = w[j - 16] ^ w[j - 9] ^ (((w[j - 3] << 15) & _MASK) | (w[j - 3] >> 17))
+        x ^= (((x << 15) & _MASK) | (x >> 17)) ^ (((x << 23) & _MASK) | (x >> 9))
+        w.append(x ^ (((w[j - 13] << 7) & _MASK) | (w[j - 13] >> 25)) ^ w[j - 6])
+
+    a, b, c, d, e, f, g, h = v
+    for j in range(64):
+        a12 = ((a << 12) & _MASK) | (a >> 20)
+        ss1 = (a12 + e + _T[j]) & _MASK
+        ss1 = ((ss1 << 7) & _MASK) | (ss1 >> 25)
+        ss2 = ss1 ^ a12
+        if j < 16:
+            tt1 = ((a ^ b ^ c) + d + ss2 + (w[j] ^ w[j + 4])) & _MASK
+            tt2 = ((e ^ f ^ g) + h + ss1 + w[j]) & _MASK
+        else:
+            tt1 = (((a & b) | (a & c) | (b & c)) + d + ss2 + (w[j] ^ w[j + 4])) & _MASK
+            tt2 = (((e & f) | (~e & g)) + h + ss1 + w[j]) & _MASK
+        d = c
+        c = ((b << 9) & _MASK) | (b >> 23)
+        b = a
+        a = tt1
+        h = g
+        g = ((f << 19) & _MASK) | (f >> 13)
+        f = e
+        e = tt2 ^ (((tt2 << 9) & _MASK) | (tt2 >> 23)) ^ (((tt2 << 17) & _MASK) | (tt2 >> 15))
+
+    return (v[0] ^ a, v[1] ^ b, v[2] ^ c, v[3] ^ d, v[4] ^ e, v[5] ^ f, v[6] ^ g, v[7] ^ h)
+
+
+def _python_sm3(data: bytes) -> bytes:
+    length = len(data)
+    data += b"\x80" + b"\x00" * ((55 - length) % 64) + struct.pack(">Q", length * 8)
+    v = _IV
+    for i in range(0, len(data), 64):
+        v = _compress(v, data[i:i + 64])
+    return struct.pack(">8I", *v)
+
+
+def _hashlib_sm3(data: bytes) -> bytes:
+    return hashlib.new("sm3", data).digest()
+
+
+def _gmssl_sm3(data: bytes) -> bytes:
+    return bytes.fromhex(gmssl_sm3.sm3_hash(gmssl_func.bytes_to_list(data)))
+
+
+# 可用的后端，均返回32字节摘要 / Available backends, all return a 32-byte digest
+BACKENDS = {"python": _python_sm3}
+if "sm3" in hashlib.algorithms_available:
+    BACKENDS["hashlib"] = _hashlib_sm3
+if gmssl_sm3 is not None:
+    BACKENDS["gmssl"] = _gmssl_sm3
+
+
+def get_backend(backend: str = "auto") -> Callable[[bytes], bytes]:
+    """获取SM3后端 (Get an SM3 backend)
+
+    Args:
+        backend (str): "auto"、"hashlib"、"python" 或 "gmssl"，auto 在 OpenSSL 支持时使用 hashlib
+        ("auto", "hashlib", "python" or "gmssl", auto uses hashlib when OpenSSL supports it)
+
+    Returns:
+        Callable: 接受 bytes 返回摘要的函数 (Function taking bytes and returning the digest)
+    """
+    if backend == "auto":
+        backend = "hashlib" if "hashlib" in BACKENDS else "python"
+    if backend not in BACKENDS:
+        raise ValueError("不可用的SM3后端：{0}".format(backend))
+    return BACKENDS[backend]
+
+
+# 默认后端 (Default backend)
+sm3_digest = get_backend()
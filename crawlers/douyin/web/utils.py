@@ -31,7 +31,6 @@
 # - https://github.com/Johnserf-Seed
 #
 # ==============================================================================
-import asyncio
 import json
 import os
 import random
@@ -39,7 +38,7 @@ import re
 import time
 import urllib
 from pathlib import Path
-from typing import Union
+from typing import Optional, Union
 from urllib.parse import urlencode, quote
 
 # import execjs
@@ -59,10 +58,17 @@ from crawlers.utils.api_exceptions import (
     APINotFoundError,
 )
 from crawlers.utils.logger import logger
+from crawlers.utils.batch import batch_runner
+from crawlers.utils.client_pool import client_pool
+from crawlers.utils.negative_cache import negative_cache, NegativeCache
+from crawlers.utils.redirects import first_group, walk_redirects
+from crawlers.utils.resolution_cache import resolution_cache, ResolutionCache
+from crawlers.utils.token_pool import TokenPool, token_pools
 from crawlers.utils.utils import (
     gen_random_str,
     get_timestamp,
     extract_valid_urls,
+    match_canonical_url,
     split_filename,
 )
 
@@ -92,19 +98,7 @@ class TokenManager:
         (Generate a real msToken and return a false value when an error occurs)
         """
 
-        payload = json.dumps(
-            {
-                "magic": cls.token_conf["magic"],
-                "version": cls.token_conf["version"],
-                "dataType": cls.token_conf["dataType"],
-                "strData": cls.token_conf["strData"],
-                "tspFromClient": get_timestamp(),
-            }
-        )
-        headers = {
-            "User-Agent": cls.token_conf["User-Agent"],
-            "Content-Type": "application/json",
-        }
+        payload, headers = cls._ms_token_request()
 
         transport = httpx.HTTPTransport(retries=5)
         with httpx.Client(transport=transport, proxies=cls.proxies) as client:
@@ -150,6 +144,41 @@ class TokenManager:
                 logger.info("将使用本地生成的虚假msToken参数，以继续请求。")
                 return cls.gen_false_msToken()
 
+    @classmethod
+    def _ms_token_request(cls) -> tuple:
+        """构造msToken请求的内容与请求头 (Build the msToken request body and headers)"""
+        payload = json.dumps(
+            {
+                "magic": cls.token_conf["magic"],
+                "version": cls.token_conf["version"],
+                "dataType": cls.token_conf["dataType"],
+                "strData": cls.token_conf["strData"],
+                "tspFromClient": get_timestamp(),
+            }
+        )
+        headers = {
+            "User-Agent": cls.token_conf["User-Agent"],
+            "Content-Type": "application/json",
+        }
+        return payload, headers
+
+    @classmethod
+    async def agen_real_msToken(cls) -> str:
+        """
+        异步生成真实的msToken，出现错误时抛出异常，由调用方决定是否使用虚假的值
+        (Generate a real msToken asynchronously, raising on error so the caller decides on a fallback)
+        """
+        payload, headers = cls._ms_token_request()
+        transport = httpx.AsyncHTTPTransport(retries=5)
+        async with httpx.AsyncClient(transport=transport, proxies=cls.proxies) as client:
+            response = await client.post(cls.token_conf["url"], content=payload, headers=headers)
+            response.raise_for_status()
+
+        msToken = str(httpx.Cookies(response.cookies).get("msToken"))
+        if len(msToken) not in [120, 128]:
+            raise APIResponseError("响应内容：{0}， Douyin msToken API 的响应内容不符合要求。".format(msToken))
+        return msToken
+
     @classmethod
     def gen_false_msToken(cls) -> str:
         """生成随机msToken (Generate random msToken)"""
@@ -197,6 +226,15 @@ class TokenManager:
                     )
 
 
+# 轮换使用的msToken，首次使用时生成并在后台补充 (Rotating msTokens, generated on first use and refilled in the background)
+ms_token_pool = token_pools.register(
+    TokenPool.from_config("douyin_msToken", TokenManager.agen_real_msToken, TokenManager.gen_false_msToken),
+    param="msToken",
+)
+# ttwid 的生成没有本地备用值，失败时抛出异常 (ttwid has no local fallback and raises on failure)
+ttwid_pool = token_pools.register(TokenPool.from_config("douyin_ttwid", TokenManager.gen_ttwid))
+
+
 class VerifyFpManager:
     @classmethod
     def gen_verify_fp(cls) -> str:
@@ -233,13 +271,23 @@ class VerifyFpManager:
         return cls.gen_verify_fp()
 
 
+# verifyFp 与 s_v_web_id 在本地生成，入池后同样轮换使用 (verifyFp and s_v_web_id are generated locally and rotated the same way)
+verify_fp_pool = token_pools.register(
+    TokenPool.from_config("douyin_verify_fp", VerifyFpManager.gen_verify_fp, VerifyFpManager.gen_verify_fp),
+    param="verifyFp",
+)
+s_v_web_id_pool = token_pools.register(
+    TokenPool.from_config("douyin_s_v_web_id", VerifyFpManager.gen_s_v_web_id, VerifyFpManager.gen_s_v_web_id)
+)
+
+
 class BogusManager:
 
     # 字符串方法生成X-Bogus参数
     @classmethod
     def xb_str_2_endpoint(cls, endpoint: str, user_agent: str) -> str:
         try:
-            final_endpoint = XB(user_agent).getXBogus(endpoint)
+            final_endpoint = XB.signer(user_agent).getXBogus(endpoint)
         except Exception as e:
             raise RuntimeError("生成X-Bogus失败: {0})".format(e))
 
@@ -247,14 +295,17 @@ class BogusManager:
 
     # 字典方法生成X-Bogus参数
     @classmethod
-    def xb_model_2_endpoint(cls, base_endpoint: str, params: dict, user_agent: str) -> str:
-        if not isinstance(params, dict):
-            raise TypeError("参数必须是字典类型")
-
-        param_str = "&".join([f"{k}={v}" for k, v in params.items()])
+    def xb_model_2_endpoint(cls, base_endpoint: str, params: dict | str, user_agent: str) -> str:
+        # 也接受 QueryTemplate.join() 生成的查询字符串 (Also accepts a query string from QueryTemplate.join())
+        if isinstance(params, str):
+            param_str = params
+        elif isinstance(params, dict):
+            param_str = "&".join([f"{k}={v}" for k, v in params.items()])
+        else:
+            raise TypeError("参数必须是字典或字符串类型")
 
         try:
-            xb_value = XB(user_agent).getXBogus(param_str)
+            xb_value = XB.signer(user_agent).getXBogus(param_str)
         except Exception as e:
             raise RuntimeError("生成X-Bogus失败: {0})".format(e))
 
@@ -292,22 +343,93 @@ class BogusManager:
 
     # 字典方法生成A-Bogus参数，感谢 @JoeanAmier 提供的纯Python版本算法。
     @classmethod
-    def ab_model_2_endpoint(cls, params: dict, user_agent: str) -> str:
-        if not isinstance(params, dict):
-            raise TypeError("参数必须是字典类型")
+    def ab_model_2_endpoint(cls, params: dict | str, user_agent: str) -> str:
+        # 也接受 QueryTemplate.encode() 生成的查询字符串 (Also accepts a query string from QueryTemplate.encode())
+        if not isinstance(params, (dict, str)):
+            raise TypeError("参数必须是字典或字符串类型")
 
         try:
-            ab_value = AB().get_value(params, )
+            ab_value = AB.signer().get_value(params, )
         except Exception as e:
             raise RuntimeError("生成A-Bogus失败: {0})".format(e))
 
         return quote(ab_value, safe='')
 
+    # 批量生成带X-Bogus参数的Endpoint，同一UA的签名器只取一次，整批共用一个时间戳
+    # Batch X-Bogus endpoints, the UA signer is looked up once and the batch shares one timestamp
+    @classmethod
+    def xb_sign_many(cls, params_list: list, base_endpoint: str, user_agent: str) -> list:
+        """
+        批量签名，结果与 params_list 顺序一致 (Sign a batch, results keep the order of params_list)
+
+        Args:
+            params_list (list): 参数字典或 QueryTemplate.join() 生成的查询字符串 (Param dicts or QueryTemplate.join() queries)
+            base_endpoint (str): 接口地址 (Endpoint base URL)
+            user_agent (str): 用户代理 (User agent)
+
+        Returns:
+            list: 带X-Bogus参数的Endpoint (Endpoints carrying X-Bogus)
+        """
+        signer = XB.signer(user_agent)
+        separator = "&" if "?" in base_endpoint else "?"
+        timer = int(time.time())
+
+        endpoints = []
+        for params in params_list:
+            param_str = params if isinstance(params, str) else "&".join([f"{k}={v}" for k, v in params.items()])
+            try:
+                xb_value = signer.getXBogus(param_str, timer)
+            except Exception as e:
+                raise RuntimeError("生成X-Bogus失败: {0})".format(e))
+            endpoints.append(f"{base_endpoint}{separator}{param_str}&X-Bogus={xb_value[1]}")
+        return endpoints
+
+    # 批量生成带a_bogus参数的Endpoint，签名器与常量中间结果整批共用
+    # Batch a_bogus endpoints, the signer and its memoized constants are shared by the batch
+    @classmethod
+    def ab_sign_many(cls, params_list: list, base_endpoint: str, user_agent: str) -> list:
+        """
+        批量签名，结果与 params_list 顺序一致 (Sign a batch, results keep the order of params_list)
+
+        Args:
+            params_list (list): 参数字典或 QueryTemplate.encode() 生成的查询字符串 (Param dicts or QueryTemplate.encode() queries)
+            base_endpoint (str): 接口地址 (Endpoint base URL)
+            user_agent (str): 用户代理 (User agent)
+
+        Returns:
+            list: 带a_bogus参数的Endpoint (Endpoints carrying a_bogus)
+        """
+        signer = AB.signer()
+        separator = "&" if "?" in base_endpoint else "?"
+
+        endpoints = []
+        for params in params_list:
+            query = params if isinstance(params, str) else urlencode(params)
+            try:
+                ab_value = signer.get_value(query, )
+            except Exception as e:
+                raise RuntimeError("生成A-Bogus失败: {0})".format(e))
+            endpoints.append(f"{base_endpoint}{separator}{query}&a_bogus={quote(ab_value, safe='')}")
+        return endpoints
+
 
 class SecUserIdFetcher:
     # 预编译正则表达式
     _DOUYIN_URL_PATTERN = re.compile(r"user/([^/?]*)")
     _REDIRECT_URL_PATTERN = re.compile(r"sec_uid=([^&]*)")
+    _SEC_USER_ID_PATTERN = re.compile(r"[\w-]{16,}")
+    # 作品页路径，短链接确定指向作品时不是用户主页 (Post page paths, a short link landing there is not a profile)
+    _POST_PAGE_PATTERN = re.compile(r"/(?:share/)?(?:video|note)/\d+")
+
+    # 可在本地解析的规范域名 (Canonical hosts that can be parsed locally)
+    _CANONICAL_HOSTS = frozenset({"www.douyin.com", "douyin.com", "www.iesdouyin.com", "iesdouyin.com"})
+
+    @classmethod
+    def match_local(cls, url: str) -> Optional[str]:
+        """从规范的用户主页链接中直接提取sec_user_id (Extract sec_user_id from a canonical profile link directly)"""
+        return match_canonical_url(
+            url, cls._CANONICAL_HOSTS, (cls._DOUYIN_URL_PATTERN, cls._REDIRECT_URL_PATTERN), cls._SEC_USER_ID_PATTERN
+        )
 
     @classmethod
     async def get_sec_user_id(cls, url: str) -> str:
@@ -332,6 +454,22 @@ class SecUserIdFetcher:
                 APINotFoundError("输入的URL不合法。类名：{0}".format(cls.__name__))
             )
 
+        # 规范链接在本地提取，只有短链接或未知格式才请求网络 / Canonical links are parsed locally, only short links or unknown shapes hit the network
+        sec_user_id = cls.match_local(url)
+        if sec_user_id is not None:
+            return sec_user_id
+
+        # 已确认无法解析的链接直接失败 / Links known to be unresolvable fail fast
+        negative_cache.check(NegativeCache.SHORT_URL, url)
+
+        # 同一链接总是解析出同一ID，优先使用缓存 / A link always resolves to the same ID, prefer the cache
+        return await resolution_cache.resolve(
+            ResolutionCache.DOUYIN_SEC_USER_ID, url, lambda: cls._fetch_sec_user_id(url)
+        )
+
+    @classmethod
+    async def _fetch_sec_user_id(cls, url: str) -> str:
+        """逐跳跟随重定向，从地址中提取sec_user_id (Follow redirects hop by hop and extract sec_user_id from the URL)"""
         pattern = (
             cls._REDIRECT_URL_PATTERN
             if "v.douyin.com" in url
@@ -339,42 +477,39 @@ class SecUserIdFetcher:
         )
 
         try:
-            transport = httpx.AsyncHTTPTransport(retries=5)
-            async with httpx.AsyncClient(
-                    transport=transport, proxies=TokenManager.proxies, timeout=10
-            ) as client:
-                response = await client.get(url, follow_redirects=True)
-                # 444一般为Nginx拦截，不返回状态 (444 is generally intercepted by Nginx and does not return status)
-                if response.status_code in {200, 444}:
-                    match = pattern.search(str(response.url))
-                    if match:
-                        return match.group(1)
-                    else:
-                        raise APIResponseError(
-                            "未在响应的地址中找到sec_user_id，检查链接是否为用户主页类名：{0}"
-                            .format(cls.__name__)
-                        )
-
-                elif response.status_code == 401:
-                    raise APIUnauthorizedError("未授权的请求。类名：{0}".format(cls.__name__)
-                                               )
-                elif response.status_code == 404:
-                    raise APINotFoundError("未找到API端点。类名：{0}".format(cls.__name__)
-                                           )
-                elif response.status_code == 503:
-                    raise APIUnavailableError("API服务不可用。类名：{0}".format(cls.__name__)
-                                              )
-                else:
-                    raise APIResponseError("链接：{0}，状态码 {1}：{2} ".format(
-                        response.url, response.status_code, response.text
-                    )
-                    )
-
+            client = client_pool.get_client("douyin_resolve", proxies=TokenManager.proxies)
+            result = await walk_redirects(client, url, first_group(pattern))
         except httpx.RequestError as exc:
             raise APIConnectionError("请求端点失败，请检查当前网络环境。 链接：{0}，代理：{1}，异常类名：{2}，异常详细信息：{3}"
                                      .format(url, TokenManager.proxies, cls.__name__, exc)
                                      )
 
+        if result.match is not None:
+            return result.match
+
+        # 444一般为Nginx拦截，不返回状态 (444 is generally intercepted by Nginx and does not return status)
+        if result.status_code in {200, 444}:
+            # 只有确定跳转到了作品页才记录，验证码等中间页可能只是暂时的
+            # Only record a confirmed redirect to a post page, captcha and interstitial pages may be transient
+            if result.landed_on(cls._CANONICAL_HOSTS, cls._POST_PAGE_PATTERN):
+                negative_cache.add(NegativeCache.SHORT_URL, url, "链接不是用户主页")
+            raise APIResponseError(
+                "未在响应的地址中找到sec_user_id，检查链接是否为用户主页类名：{0}"
+                .format(cls.__name__)
+            )
+        elif result.status_code == 401:
+            raise APIUnauthorizedError("未授权的请求。类名：{0}".format(cls.__name__)
+                                       )
+        elif result.status_code in (404, 410):
+            negative_cache.add(NegativeCache.SHORT_URL, url, "链接不存在")
+            raise APINotFoundError("未找到API端点。类名：{0}".format(cls.__name__)
+                                   )
+        elif result.status_code == 503:
+            raise APIUnavailableError("API服务不可用。类名：{0}".format(cls.__name__)
+                                      )
+        else:
+            raise APIResponseError("链接：{0}，状态码 {1}".format(result.url, result.status_code))
+
     @classmethod
     async def get_all_sec_user_id(cls, urls: list) -> list:
         """
@@ -385,6 +520,7 @@ class SecUserIdFetcher:
 
         Return:
             sec_user_ids: list: 用户sec_user_id列表 (User sec_user_id list)
+                每项包含 input、data、error (Each item has input, data and error)
         """
 
         if not isinstance(urls, list):
@@ -399,8 +535,10 @@ class SecUserIdFetcher:
                                  )
             )
 
-        sec_user_ids = [cls.get_sec_user_id(url) for url in urls]
-        return await asyncio.gather(*sec_user_ids)
+        # 有并发上限地逐项解析，单个链接失败不影响其余结果
+        # Resolve each link under a concurrency cap; one failing link does not affect the others
+        results = await batch_runner.run(urls, cls.get_sec_user_id)
+        return [result.to_dict() for result in results]
 
 
 class AwemeIdFetcher:
@@ -409,6 +547,29 @@ class AwemeIdFetcher:
     _DOUYIN_VIDEO_URL_PATTERN_NEW = re.compile(r"[?&]vid=(\d+)")
     _DOUYIN_NOTE_URL_PATTERN = re.compile(r"note/([^/?]*)")
     _DOUYIN_DISCOVER_URL_PATTERN = re.compile(r"modal_id=([0-9]+)")
+    _AWEME_ID_PATTERN = re.compile(r"\d+")
+    # 用户主页与直播间路径，短链接确定指向这些页面时不是作品 (Profile and live room paths, a short link landing there is not a post)
+    _NON_POST_PAGE_PATTERN = re.compile(r"^/(?:share/)?user/|^/\d+/?$|^/webcast/")
+
+    # 可在本地解析的规范域名 (Canonical hosts that can be parsed locally)
+    _CANONICAL_HOSTS = frozenset({
+        "www.douyin.com", "douyin.com", "m.douyin.com", "www.iesdouyin.com", "iesdouyin.com"
+    })
+
+    @classmethod
+    def match_local(cls, url: str) -> Optional[str]:
+        """从规范的作品链接中直接提取aweme_id (Extract aweme_id from a canonical post link directly)"""
+        return match_canonical_url(
+            url,
+            cls._CANONICAL_HOSTS,
+            (
+                cls._DOUYIN_VIDEO_URL_PATTERN,
+                cls._DOUYIN_VIDEO_URL_PATTERN_NEW,
+                cls._DOUYIN_NOTE_URL_PATTERN,
+                cls._DOUYIN_DISCOVER_URL_PATTERN,
+            ),
+            cls._AWEME_ID_PATTERN,
+        )
 
     @classmethod
     async def get_aweme_id(cls, url: str) -> str:
@@ -425,39 +586,50 @@ class AwemeIdFetcher:
         if not isinstance(url, str):
             raise TypeError("参数必须是字符串类型")
 
-        # 重定向到完整链接
-        transport = httpx.AsyncHTTPTransport(retries=5)
-        async with httpx.AsyncClient(
-                transport=transport, proxy=None, timeout=10
-        ) as client:
-            try:
-                response = await client.get(url, follow_redirects=True)
-                response.raise_for_status()
+        # 规范链接在本地提取，只有短链接或未知格式才请求网络 / Canonical links are parsed locally, only short links or unknown shapes hit the network
+        aweme_id = cls.match_local(url)
+        if aweme_id is not None:
+            return aweme_id
 
-                response_url = str(response.url)
+        # 已确认无法解析的链接直接失败 / Links known to be unresolvable fail fast
+        negative_cache.check(NegativeCache.SHORT_URL, url)
 
-                # 按顺序尝试匹配视频ID
-                for pattern in [
-                    cls._DOUYIN_VIDEO_URL_PATTERN,
-                    cls._DOUYIN_VIDEO_URL_PATTERN_NEW,
-                    cls._DOUYIN_NOTE_URL_PATTERN,
-                    cls._DOUYIN_DISCOVER_URL_PATTERN
-                ]:
-                    match = pattern.search(response_url)
-                    if match:
-                        return match.group(1)
+        # 同一链接总是解析出同一ID，优先使用缓存 / A link always resolves to the same ID, prefer the cache
+        return await resolution_cache.resolve(
+            ResolutionCache.DOUYIN_AWEME_ID, url, lambda: cls._fetch_aweme_id(url)
+        )
 
-                raise APIResponseError("未在响应的地址中找到 aweme_id，检查链接是否为作品页")
+    @classmethod
+    async def _fetch_aweme_id(cls, url: str) -> str:
+        """逐跳跟随重定向，从地址中提取aweme_id (Follow redirects hop by hop and extract aweme_id from the URL)"""
+        try:
+            client = client_pool.get_client("douyin_resolve")
+            # 按顺序尝试匹配视频ID，Location 中出现即停止 / Try the ID patterns in order and stop at the first Location carrying one
+            result = await walk_redirects(client, url, first_group(
+                cls._DOUYIN_VIDEO_URL_PATTERN,
+                cls._DOUYIN_VIDEO_URL_PATTERN_NEW,
+                cls._DOUYIN_NOTE_URL_PATTERN,
+                cls._DOUYIN_DISCOVER_URL_PATTERN,
+            ))
+        except httpx.RequestError as exc:
+            raise APIConnectionError(
+                f"请求端点失败，请检查当前网络环境。链接：{url}，代理：{TokenManager.proxies}，异常类名：{cls.__name__}，异常详细信息：{exc}"
+            )
 
-            except httpx.RequestError as exc:
-                raise APIConnectionError(
-                    f"请求端点失败，请检查当前网络环境。链接：{url}，代理：{TokenManager.proxies}，异常类名：{cls.__name__}，异常详细信息：{exc}"
-                )
+        if result.match is not None:
+            return result.match
 
-            except httpx.HTTPStatusError as e:
-                raise APIResponseError(
-                    f"链接：{e.response.url}，状态码 {e.response.status_code}：{e.response.text}"
-                )
+        if result.status_code >= 400:
+            # 404/410 说明链接已失效，5xx 等临时错误不记录 / 404/410 mean a dead link, transient errors are not recorded
+            if result.status_code in (404, 410):
+                negative_cache.add(NegativeCache.SHORT_URL, url, "链接已失效")
+            raise APIResponseError(f"链接：{result.url}，状态码 {result.status_code}")
+
+        # 只有确定跳转到了用户主页或直播间才记录，验证码等中间页可能只是暂时的
+        # Only record a confirmed redirect to a profile or live room, captcha and interstitial pages may be transient
+        if result.landed_on(cls._CANONICAL_HOSTS | {"live.douyin.com"}, cls._NON_POST_PAGE_PATTERN):
+            negative_cache.add(NegativeCache.SHORT_URL, url, "链接不是作品页")
+        raise APIResponseError("未在响应的地址中找到 aweme_id，检查链接是否为作品页")
 
     @classmethod
     async def get_all_aweme_id(cls, urls: list) -> list:
@@ -469,6 +641,7 @@ class AwemeIdFetcher:
 
         Return:
             aweme_ids: list: 视频的唯一标识，返回列表 (The unique identifier of the video, return list)
+                每项包含 input、data、error (Each item has input, data and error)
         """
 
         if not isinstance(urls, list):
@@ -483,8 +656,10 @@ class AwemeIdFetcher:
                                  )
             )
 
-        aweme_ids = [cls.get_aweme_id(url) for url in urls]
-        return await asyncio.gather(*aweme_ids)
+        # 有并发上限地逐项解析，单个链接失败不影响其余结果
+        # Resolve each link under a concurrency cap; one failing link does not affect the others
+        results = await batch_runner.run(urls, cls.get_aweme_id)
+        return [result.to_dict() for result in results]
 
 
 class MixIdFetcher:
@@ -502,6 +677,20 @@ class WebCastIdFetcher:
     _DOUYIN_LIVE_URL_PATTERN2 = re.compile(r"http[s]?://live.douyin.com/(\d+)")
     # https://webcast.amemv.com/douyin/webcast/reflow/7318296342189919011?u_code=l1j9bkbd&did=MS4wLjABAAAAEs86TBQPNwAo-RGrcxWyCdwKhI66AK3Pqf3ieo6HaxI&iid=MS4wLjABAAAA0ptpM-zzoliLEeyvWOCUt-_dQza4uSjlIvbtIazXnCY&with_sec_did=1&use_link_command=1&ecom_share_track_params=&extra_params={"from_request_id":"20231230162057EC005772A8EAA0199906","im_channel_invite_id":"0"}&user_id=3644207898042206&liveId=7318296342189919011&from=share&style=share&enter_method=click_share&roomId=7318296342189919011&activity_info={}
     _DOUYIN_LIVE_URL_PATTERN3 = re.compile(r"reflow/([^/?]*)")
+    _WEBCAST_ID_PATTERN = re.compile(r"\d+")
+
+    # 可在本地解析的规范域名，reflow 链接返回的是room_id，仍走网络 (Canonical hosts parsed locally; reflow links carry a room_id and still go to the network)
+    _CANONICAL_HOSTS = frozenset({"live.douyin.com", "www.douyin.com", "douyin.com"})
+
+    @classmethod
+    def match_local(cls, url: str) -> Optional[str]:
+        """从规范的直播间链接中直接提取webcast_id (Extract webcast_id from a canonical live room link directly)"""
+        return match_canonical_url(
+            url,
+            cls._CANONICAL_HOSTS,
+            (cls._DOUYIN_LIVE_URL_PATTERN, cls._DOUYIN_LIVE_URL_PATTERN2),
+            cls._WEBCAST_ID_PATTERN,
+        )
 
     @classmethod
     async def get_webcast_id(cls, url: str) -> str:
@@ -525,46 +714,44 @@ class WebCastIdFetcher:
             raise (
                 APINotFoundError("输入的URL不合法。类名：{0}".format(cls.__name__))
             )
-        try:
-            # 重定向到完整链接
-            transport = httpx.AsyncHTTPTransport(retries=5)
-            async with httpx.AsyncClient(
-                    transport=transport, proxies=TokenManager.proxies, timeout=10
-            ) as client:
-                response = await client.get(url, follow_redirects=True)
-                response.raise_for_status()
-                url = str(response.url)
-
-                live_pattern = cls._DOUYIN_LIVE_URL_PATTERN
-                live_pattern2 = cls._DOUYIN_LIVE_URL_PATTERN2
-                live_pattern3 = cls._DOUYIN_LIVE_URL_PATTERN3
-
-                if live_pattern.search(url):
-                    match = live_pattern.search(url)
-                elif live_pattern2.search(url):
-                    match = live_pattern2.search(url)
-                elif live_pattern3.search(url):
-                    match = live_pattern3.search(url)
-                    logger.warning("该链接返回的是room_id，请使用`fetch_user_live_videos_by_room_id`接口"
 
-                                   )
-                else:
-                    raise APIResponseError("未在响应的地址中找到webcast_id，检查链接是否为直播页"
-                                           )
+        # 规范链接在本地提取，只有短链接或未知格式才请求网络 / Canonical links are parsed locally, only short links or unknown shapes hit the network
+        webcast_id = cls.match_local(url)
+        if webcast_id is not None:
+            return webcast_id
 
-                return match.group(1)
+        # 同一链接总是解析出同一ID，优先使用缓存 / A link always resolves to the same ID, prefer the cache
+        return await resolution_cache.resolve(
+            ResolutionCache.DOUYIN_WEBCAST_ID, url, lambda: cls._fetch_webcast_id(url)
+        )
 
+    @classmethod
+    async def _fetch_webcast_id(cls, url: str) -> str:
+        """逐跳跟随重定向，从地址中提取webcast_id (Follow redirects hop by hop and extract webcast_id from the URL)"""
+        try:
+            client = client_pool.get_client("douyin_resolve", proxies=TokenManager.proxies)
+            # reflow 链接可能继续重定向到直播间，只在最终地址上使用 / Reflow links may redirect on to the room, only use them at the end
+            result = await walk_redirects(
+                client, url, first_group(cls._DOUYIN_LIVE_URL_PATTERN, cls._DOUYIN_LIVE_URL_PATTERN2)
+            )
         except httpx.RequestError as exc:
             # 捕获所有与 httpx 请求相关的异常情况 (Captures all httpx request-related exceptions)
             raise APIConnectionError("请求端点失败，请检查当前网络环境。 链接：{0}，代理：{1}，异常类名：{2}，异常详细信息：{3}"
                                      .format(url, TokenManager.proxies, cls.__name__, exc)
                                      )
 
-        except httpx.HTTPStatusError as e:
-            raise APIResponseError("链接：{0}，状态码 {1}：{2} ".format(
-                e.response.url, e.response.status_code, e.response.text
-            )
-            )
+        if result.match is not None:
+            return result.match
+
+        if result.status_code >= 400:
+            raise APIResponseError("链接：{0}，状态码 {1}".format(result.url, result.status_code))
+
+        match = cls._DOUYIN_LIVE_URL_PATTERN3.search(result.url)
+        if match is None:
+            raise APIResponseError("未在响应的地址中找到webcast_id，检查链接是否为直播页"
+                                   )
+        logger.warning("该链接返回的是room_id，请使用`fetch_user_live_videos_by_room_id`接口")
+        return match.group(1)
 
     @classmethod
     async def get_all_webcast_id(cls, urls: list) -> list:
@@ -576,6 +763,7 @@ class WebCastIdFetcher:
 
         Return:
             webcast_ids: list: 直播的唯一标识，返回列表 (The unique identifier of the live, return list)
+                每项包含 input、data、error (Each item has input, data and error)
         """
 
         if not isinstance(urls, list):
@@ -590,8 +778,10 @@ class WebCastIdFetcher:
                                  )
             )
 
-        webcast_ids = [cls.get_webcast_id(url) for url in urls]
-        return await asyncio.gather(*webcast_ids)
+        # 有并发上限地逐项解析，单个链接失败不影响其余结果
+        # Resolve each link under a concurrency cap; one failing link does not affect the others
+        results = await batch_runner.run(urls, cls.get_webcast_id)
+        return [result.to_dict() for result in results]
 
 
 def format_file_name(
@@ -38,9 +38,16 @@ import os  # 系统操作
 import time  # 时间操作
 from urllib.parse import urlencode, quote  # URL编码
 import yaml  # 配置文件
+from typing import Any, Callable  # 类型注解
 
 # 基础爬虫客户端和抖音API端点
 from crawlers.base_crawler import BaseCrawler
+from crawlers.utils.batch import batch_runner
+from crawlers.utils.cache import first_page, response_cache
+from crawlers.utils.query_template import QueryTemplate
+from crawlers.utils.signing import signing_service
+from crawlers.utils.negative_cache import negative_cache, NegativeCache
+from crawlers.utils.api_exceptions import APINotFoundError
 from crawlers.douyin.web.endpoints import DouyinAPIEndpoints
 # 抖音接口数据请求模型
 from crawlers.douyin.web.models import (
@@ -56,7 +63,11 @@ from crawlers.douyin.web.utils import (AwemeIdFetcher,  # Aweme ID获取
                                        TokenManager,  # 令牌管理
                                        VerifyFpManager,  # 验证管理
                                        WebCastIdFetcher,  # 直播ID获取
-                                       extract_valid_urls  # URL提取
+                                       extract_valid_urls,  # URL提取
+                                       ms_token_pool,  # msToken令牌池
+                                       ttwid_pool,  # ttwid令牌池
+                                       verify_fp_pool,  # verifyFp令牌池
+                                       s_v_web_id_pool  # s_v_web_id令牌池
                                        )
 
 # 配置文件路径
@@ -66,6 +77,20 @@ path = os.path.abspath(os.path.dirname(__file__))
 with open(f"{path}/config.yaml", "r", encoding="utf-8") as f:
     config = yaml.safe_load(f)
 
+# 各端点的响应缓存时间(秒)，未注册的端点及使用用户Cookie的接口不缓存
+# Response cache TTLs per endpoint (seconds), unregistered endpoints and user-cookie handlers are not cached
+response_cache.register(
+    DouyinAPIEndpoints.POST_DETAIL, ttl=3600, validate=lambda data: data.get("aweme_detail") is not None
+)  # 作品详情，已删除/私密作品不缓存 / Post detail, deleted or private posts are not cached
+response_cache.register(DouyinAPIEndpoints.USER_DETAIL, ttl=600)  # 用户信息 / User profile
+response_cache.register(
+    DouyinAPIEndpoints.USER_POST, ttl=300, bypass=first_page("max_cursor")
+)  # 用户作品，第一页用于轮询最新作品，不缓存 / User posts, first pages poll for the latest posts and are not cached
+response_cache.register(DouyinAPIEndpoints.MIX_AWEME, ttl=600)  # 合集作品 / Mix posts
+response_cache.register(DouyinAPIEndpoints.POST_COMMENT, ttl=120)  # 作品评论 / Post comments
+response_cache.register(DouyinAPIEndpoints.POST_COMMENT_REPLY, ttl=120)  # 评论回复 / Comment replies
+response_cache.register(DouyinAPIEndpoints.DOUYIN_HOT_SEARCH, ttl=60)  # 热榜 / Hot search list
+
 
 class DouyinWebCrawler:
 
@@ -76,7 +101,12 @@ class DouyinWebCrawler:
         pass
 
     # 从配置文件中获取抖音的请求头
-    async def get_douyin_headers(self):
+    async def get_douyin_headers(self, ms_token: bool = True):
+        # 查询参数带msToken的接口在冷启动时等待首批令牌，之后由令牌池在后台补充；a_bogus 接口传空msToken，无需等待
+        # Endpoints sending msToken wait for the first tokens on a cold start, the pool refills in the background
+        # afterwards; a_bogus endpoints send an empty msToken and never wait
+        if ms_token:
+            await ms_token_pool.ready()
         douyin_config = config["TokenManager"]["douyin"]
         kwargs = {
             "headers": {
@@ -93,13 +123,16 @@ class DouyinWebCrawler:
 
     # 获取单个作品数据
     async def fetch_one_video(self, aweme_id: str):
+        # 已确认删除或私密的作品直接失败 / Known deleted or private posts fail fast
+        negative_cache.check(NegativeCache.AWEME_ID, aweme_id)
         # 获取抖音的实时Cookie
-        kwargs = await self.get_douyin_headers()
+        kwargs = await self.get_douyin_headers(ms_token=False)
         # 创建一个基础爬虫
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="douyin")
         async with base_crawler as crawler:
-            # 创建一个作品详情的BaseModel参数
-            params = PostDetail(aweme_id=aweme_id)
+            # 由作品详情模型的查询模板生成参数，常量字段只编码一次
+            # Render the PostDetail query from its template, constant fields are encoded once
+            params = QueryTemplate.of(PostDetail).encode(aweme_id=aweme_id, msToken="")
             # 生成一个作品详情的带有加密参数的Endpoint
             # 2024年6月12日22:41:44 由于XBogus加密已经失效，所以不再使用XBogus加密参数，转移至a_bogus加密参数。
             # endpoint = BogusManager.xb_model_2_endpoint(
@@ -107,49 +140,108 @@ class DouyinWebCrawler:
             # )
 
             # 生成一个作品详情的带有a_bogus加密参数的Endpoint
-            params_dict = params.dict()
-            params_dict["msToken"] = ''
-            a_bogus = BogusManager.ab_model_2_endpoint(params_dict, kwargs["headers"]["User-Agent"])
-            endpoint = f"{DouyinAPIEndpoints.POST_DETAIL}?{urlencode(params_dict)}&a_bogus={a_bogus}"
-
-            response = await crawler.fetch_get_json(endpoint)
+            a_bogus = await signing_service.run(
+                BogusManager.ab_model_2_endpoint, params, kwargs["headers"]["User-Agent"]
+            )
+            endpoint = f"{DouyinAPIEndpoints.POST_DETAIL}?{params}&a_bogus={a_bogus}"
+
+            try:
+                response = await crawler.fetch_get_json(endpoint)
+            except APINotFoundError:
+                negative_cache.add(NegativeCache.AWEME_ID, aweme_id, "作品不存在")
+                raise
+
+        # 作品已删除或不可见时只返回 filter_detail / Deleted or hidden posts only come back with filter_detail
+        if response.get("aweme_detail") is None and response.get("filter_detail"):
+            reason = response["filter_detail"].get("detail_msg") or "作品已删除或不可见"
+            negative_cache.add(NegativeCache.AWEME_ID, aweme_id, reason)
+            raise APINotFoundError("{0}：{1}".format(reason, aweme_id))
         return response
 
     # 获取用户发布作品数据
     async def fetch_user_post_videos(self, sec_user_id: str, max_cursor: int, count: int):
-        kwargs = await self.get_douyin_headers()
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        kwargs = await self.get_douyin_headers(ms_token=False)
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="douyin")
         async with base_crawler as crawler:
-            params = UserPost(sec_user_id=sec_user_id, max_cursor=max_cursor, count=count)
+            params = QueryTemplate.of(UserPost).encode(
+                sec_user_id=sec_user_id, max_cursor=max_cursor, count=count, msToken=""
+            )
             # endpoint = BogusManager.xb_model_2_endpoint(
             #     DouyinAPIEndpoints.USER_POST, params.dict(), kwargs["headers"]["User-Agent"]
             # )
             # response = await crawler.fetch_get_json(endpoint)
 
             # 生成一个用户发布作品数据的带有a_bogus加密参数的Endpoint
-            params_dict = params.dict()
-            params_dict["msToken"] = ''
-            a_bogus = BogusManager.ab_model_2_endpoint(params_dict, kwargs["headers"]["User-Agent"])
-            endpoint = f"{DouyinAPIEndpoints.USER_POST}?{urlencode(params_dict)}&a_bogus={a_bogus}"
+            a_bogus = await signing_service.run(
+                BogusManager.ab_model_2_endpoint, params, kwargs["headers"]["User-Agent"]
+            )
+            endpoint = f"{DouyinAPIEndpoints.USER_POST}?{params}&a_bogus={a_bogus}"
 
             response = await crawler.fetch_get_json(endpoint)
         return response
 
+    # 流式获取用户发布作品数据，逐个返回 aweme_list 中的作品，project 为可选的投影函数，
+    # 传入 envelope 字典时结束后写入 max_cursor、has_more 等分页字段
+    # Stream user posts one aweme_list item at a time, optionally projected;
+    # paging fields such as max_cursor and has_more are written into `envelope` when given
+    async def stream_user_post_videos(self, sec_user_id: str, max_cursor: int, count: int,
+                                      project: Callable[[dict], Any] = None, envelope: dict = None):
+        kwargs = await self.get_douyin_headers(ms_token=False)
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="douyin")
+        async with base_crawler as crawler:
+            params = QueryTemplate.of(UserPost).encode(
+                sec_user_id=sec_user_id, max_cursor=max_cursor, count=count, msToken=""
+            )
+            a_bogus = await signing_service.run(
+                BogusManager.ab_model_2_endpoint, params, kwargs["headers"]["User-Agent"]
+            )
+            endpoint = f"{DouyinAPIEndpoints.USER_POST}?{params}&a_bogus={a_bogus}"
+
+            async for aweme in crawler.stream_get_json_items(endpoint, "aweme_list", project):
+                yield aweme
+            if envelope is not None:
+                envelope.update(crawler.last_envelope or {})
+
+    # 批量获取多个用户的发布作品，整批查询一次签名，再由批量执行器有并发上限地请求，结果与输入顺序一致
+    # Fetch the posts of many users: the whole batch is signed in one go, then requested under the batch
+    # runner's concurrency cap; results keep the input order
+    async def fetch_many_user_post_videos(self, sec_user_ids: list, max_cursor: int = 0, count: int = 18) -> list:
+        kwargs = await self.get_douyin_headers(ms_token=False)
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="douyin")
+        async with base_crawler as crawler:
+            unique_ids = list(dict.fromkeys(sec_user_ids))
+            queries = [
+                QueryTemplate.of(UserPost).encode(sec_user_id=sec_user_id, max_cursor=max_cursor, count=count, msToken="")
+                for sec_user_id in unique_ids
+            ]
+            endpoints = await signing_service.run_many(
+                BogusManager.ab_sign_many, queries, DouyinAPIEndpoints.USER_POST, kwargs["headers"]["User-Agent"]
+            )
+            endpoints = dict(zip(unique_ids, endpoints))
+
+            async def fetch(sec_user_id: str) -> dict:
+                return await crawler.fetch_get_json(endpoints[sec_user_id])
+
+            results = await batch_runner.run(sec_user_ids, fetch)
+        return [result.to_dict() for result in results]
+
     # 获取用户喜欢作品数据
     async def fetch_user_like_videos(self, sec_user_id: str, max_cursor: int, count: int):
-        kwargs = await self.get_douyin_headers()
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        kwargs = await self.get_douyin_headers(ms_token=False)
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="douyin")
         async with base_crawler as crawler:
-            params = UserLike(sec_user_id=sec_user_id, max_cursor=max_cursor, count=count)
+            params = QueryTemplate.of(UserLike).encode(
+                sec_user_id=sec_user_id, max_cursor=max_cursor, count=count, msToken=""
+            )
             # endpoint = BogusManager.xb_model_2_endpoint(
             #     DouyinAPIEndpoints.USER_FAVORITE_A, params.dict(), kwargs["headers"]["User-Agent"]
             # )
             # response = await crawler.fetch_get_json(endpoint)
 
-            params_dict = params.dict()
-            params_dict["msToken"] = ''
-            a_bogus = BogusManager.ab_model_2_endpoint(params_dict, kwargs["headers"]["User-Agent"])
-            endpoint = f"{DouyinAPIEndpoints.USER_FAVORITE_A}?{urlencode(params_dict)}&a_bogus={a_bogus}"
+            a_bogus = await signing_service.run(
+                BogusManager.ab_model_2_endpoint, params, kwargs["headers"]["User-Agent"]
+            )
+            endpoint = f"{DouyinAPIEndpoints.USER_FAVORITE_A}?{params}&a_bogus={a_bogus}"
 
             response = await crawler.fetch_get_json(endpoint)
         return response
@@ -168,9 +260,10 @@ class DouyinWebCrawler:
         kwargs["headers"]["Cookie"] = cookie
         base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
         async with base_crawler as crawler:
-            params = UserCollection(cursor=cursor, count=count)
-            endpoint = BogusManager.xb_model_2_endpoint(
-                DouyinAPIEndpoints.USER_COLLECTION, params.dict(), kwargs["headers"]["User-Agent"]
+            params = QueryTemplate.of(UserCollection).join(cursor=cursor, count=count)
+            endpoint = await signing_service.run(
+                BogusManager.xb_model_2_endpoint,
+                DouyinAPIEndpoints.USER_COLLECTION, params, kwargs["headers"]["User-Agent"]
             )
             response = await crawler.fetch_post_json(endpoint)
         return response
@@ -178,23 +271,25 @@ class DouyinWebCrawler:
     # 获取用户合辑作品数据
     async def fetch_user_mix_videos(self, mix_id: str, cursor: int = 0, count: int = 20):
         kwargs = await self.get_douyin_headers()
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="douyin")
         async with base_crawler as crawler:
-            params = UserMix(mix_id=mix_id, cursor=cursor, count=count)
-            endpoint = BogusManager.xb_model_2_endpoint(
-                DouyinAPIEndpoints.MIX_AWEME, params.dict(), kwargs["headers"]["User-Agent"]
+            params = QueryTemplate.of(UserMix).join(mix_id=mix_id, cursor=cursor, count=count)
+            endpoint = await signing_service.run(
+                BogusManager.xb_model_2_endpoint,
+                DouyinAPIEndpoints.MIX_AWEME, params, kwargs["headers"]["User-Agent"]
             )
             response = await crawler.fetch_get_json(endpoint)
         return response
 
     # 获取用户直播流数据
     async def fetch_user_live_videos(self, webcast_id: str, room_id_str=""):
-        kwargs = await self.get_douyin_headers()
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        kwargs = await self.get_douyin_headers(ms_token=False)
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="douyin")
         async with base_crawler as crawler:
-            params = UserLive(web_rid=webcast_id, room_id_str=room_id_str)
-            endpoint = BogusManager.xb_model_2_endpoint(
-                DouyinAPIEndpoints.LIVE_INFO, params.dict(), kwargs["headers"]["User-Agent"]
+            params = QueryTemplate.of(UserLive).join(web_rid=webcast_id, room_id_str=room_id_str)
+            endpoint = await signing_service.run(
+                BogusManager.xb_model_2_endpoint,
+                DouyinAPIEndpoints.LIVE_INFO, params, kwargs["headers"]["User-Agent"]
             )
             response = await crawler.fetch_get_json(endpoint)
         return response
@@ -202,11 +297,12 @@ class DouyinWebCrawler:
     # 获取指定用户的直播流数据
     async def fetch_user_live_videos_by_room_id(self, room_id: str):
         kwargs = await self.get_douyin_headers()
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="douyin")
         async with base_crawler as crawler:
-            params = UserLive2(room_id=room_id)
-            endpoint = BogusManager.xb_model_2_endpoint(
-                DouyinAPIEndpoints.LIVE_INFO_ROOM_ID, params.dict(), kwargs["headers"]["User-Agent"]
+            params = QueryTemplate.of(UserLive2).join(room_id=room_id)
+            endpoint = await signing_service.run(
+                BogusManager.xb_model_2_endpoint,
+                DouyinAPIEndpoints.LIVE_INFO_ROOM_ID, params, kwargs["headers"]["User-Agent"]
             )
             response = await crawler.fetch_get_json(endpoint)
         return response
@@ -214,35 +310,78 @@ class DouyinWebCrawler:
     # 获取直播间送礼用户排行榜
     async def fetch_live_gift_ranking(self, room_id: str, rank_type: int = 30):
         kwargs = await self.get_douyin_headers()
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="douyin")
         async with base_crawler as crawler:
-            params = LiveRoomRanking(room_id=room_id, rank_type=rank_type)
-            endpoint = BogusManager.xb_model_2_endpoint(
-                DouyinAPIEndpoints.LIVE_GIFT_RANK, params.dict(), kwargs["headers"]["User-Agent"]
+            params = QueryTemplate.of(LiveRoomRanking).join(room_id=room_id, rank_type=rank_type)
+            endpoint = await signing_service.run(
+                BogusManager.xb_model_2_endpoint,
+                DouyinAPIEndpoints.LIVE_GIFT_RANK, params, kwargs["headers"]["User-Agent"]
             )
             response = await crawler.fetch_get_json(endpoint)
         return response
 
     # 获取指定用户的信息
     async def handler_user_profile(self, sec_user_id: str):
+        # 已确认不存在或被封禁的用户直接失败 / Known missing or banned users fail fast
+        negative_cache.check(NegativeCache.SEC_USER_ID, sec_user_id)
         kwargs = await self.get_douyin_headers()
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="douyin")
         async with base_crawler as crawler:
-            params = UserProfile(sec_user_id=sec_user_id)
-            endpoint = BogusManager.xb_model_2_endpoint(
-                DouyinAPIEndpoints.USER_DETAIL, params.dict(), kwargs["headers"]["User-Agent"]
+            params = QueryTemplate.of(UserProfile).join(sec_user_id=sec_user_id)
+            endpoint = await signing_service.run(
+                BogusManager.xb_model_2_endpoint,
+                DouyinAPIEndpoints.USER_DETAIL, params, kwargs["headers"]["User-Agent"]
             )
+            return await self._fetch_user_profile(crawler, sec_user_id, endpoint)
+
+    # 批量获取多个用户的信息，整批查询一次签名，已确认不存在的用户在请求前单独失败，结果与输入顺序一致
+    # Fetch the profiles of many users: the whole batch is signed in one go and known missing users fail on
+    # their own before any request; results keep the input order
+    async def fetch_many_user_profiles(self, sec_user_ids: list) -> list:
+        kwargs = await self.get_douyin_headers()
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="douyin")
+        async with base_crawler as crawler:
+            unique_ids = list(dict.fromkeys(sec_user_ids))
+            queries = [QueryTemplate.of(UserProfile).join(sec_user_id=sec_user_id) for sec_user_id in unique_ids]
+            endpoints = await signing_service.run_many(
+                BogusManager.xb_sign_many, queries, DouyinAPIEndpoints.USER_DETAIL, kwargs["headers"]["User-Agent"]
+            )
+            endpoints = dict(zip(unique_ids, endpoints))
+
+            async def fetch(sec_user_id: str) -> dict:
+                negative_cache.check(NegativeCache.SEC_USER_ID, sec_user_id)
+                return await self._fetch_user_profile(crawler, sec_user_id, endpoints[sec_user_id])
+
+            results = await batch_runner.run(sec_user_ids, fetch)
+        return [result.to_dict() for result in results]
+
+    # 请求用户信息，不存在或被封禁的用户记入失败缓存 / Request a user profile, remembering missing or banned users
+    @staticmethod
+    async def _fetch_user_profile(crawler: BaseCrawler, sec_user_id: str, endpoint: str) -> dict:
+        try:
             response = await crawler.fetch_get_json(endpoint)
+        except APINotFoundError:
+            negative_cache.add(NegativeCache.SEC_USER_ID, sec_user_id, "用户不存在")
+            raise
+
+        # 成功的响应中没有用户对象即用户不存在；风控返回空响应或非0状态码，不会走到这里
+        # A successful response without a user object means the user does not exist; risk control answers with an
+        # empty body or a non-zero status code and never gets here
+        if response.get("status_code") == 0 and not response.get("user"):
+            reason = response.get("status_msg") or "用户不存在或已被封禁"
+            negative_cache.add(NegativeCache.SEC_USER_ID, sec_user_id, reason)
+            raise APINotFoundError("{0}：{1}".format(reason, sec_user_id))
         return response
 
     # 获取指定视频的评论数据
     async def fetch_video_comments(self, aweme_id: str, cursor: int = 0, count: int = 20):
         kwargs = await self.get_douyin_headers()
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="douyin")
         async with base_crawler as crawler:
-            params = PostComments(aweme_id=aweme_id, cursor=cursor, count=count)
-            endpoint = BogusManager.xb_model_2_endpoint(
-                DouyinAPIEndpoints.POST_COMMENT, params.dict(), kwargs["headers"]["User-Agent"]
+            params = QueryTemplate.of(PostComments).join(aweme_id=aweme_id, cursor=cursor, count=count)
+            endpoint = await signing_service.run(
+                BogusManager.xb_model_2_endpoint,
+                DouyinAPIEndpoints.POST_COMMENT, params, kwargs["headers"]["User-Agent"]
             )
             response = await crawler.fetch_get_json(endpoint)
         return response
@@ -250,11 +389,12 @@ class DouyinWebCrawler:
     # 获取指定视频的评论回复数据
     async def fetch_video_comments_reply(self, item_id: str, comment_id: str, cursor: int = 0, count: int = 20):
         kwargs = await self.get_douyin_headers()
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="douyin")
         async with base_crawler as crawler:
-            params = PostCommentsReply(item_id=item_id, comment_id=comment_id, cursor=cursor, count=count)
-            endpoint = BogusManager.xb_model_2_endpoint(
-                DouyinAPIEndpoints.POST_COMMENT_REPLY, params.dict(), kwargs["headers"]["User-Agent"]
+            params = QueryTemplate.of(PostCommentsReply).join(item_id=item_id, comment_id=comment_id, cursor=cursor, count=count)
+            endpoint = await signing_service.run(
+                BogusManager.xb_model_2_endpoint,
+                DouyinAPIEndpoints.POST_COMMENT_REPLY, params, kwargs["headers"]["User-Agent"]
             )
             response = await crawler.fetch_get_json(endpoint)
         return response
@@ -262,11 +402,12 @@ class DouyinWebCrawler:
     # 获取抖音热榜数据
     async def fetch_hot_search_result(self):
         kwargs = await self.get_douyin_headers()
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="douyin")
         async with base_crawler as crawler:
-            params = BaseRequestModel()
-            endpoint = BogusManager.xb_model_2_endpoint(
-                DouyinAPIEndpoints.DOUYIN_HOT_SEARCH, params.dict(), kwargs["headers"]["User-Agent"]
+            params = QueryTemplate.of(BaseRequestModel).join()
+            endpoint = await signing_service.run(
+                BogusManager.xb_model_2_endpoint,
+                DouyinAPIEndpoints.DOUYIN_HOT_SEARCH, params, kwargs["headers"]["User-Agent"]
             )
             response = await crawler.fetch_get_json(endpoint)
         return response
@@ -276,34 +417,34 @@ class DouyinWebCrawler:
     # 生成真实msToken
     async def gen_real_msToken(self, ):
         result = {
-            "msToken": TokenManager().gen_real_msToken()
+            "msToken": await ms_token_pool.get()
         }
         return result
 
     # 生成ttwid
     async def gen_ttwid(self, ):
         result = {
-            "ttwid": TokenManager().gen_ttwid()
+            "ttwid": await ttwid_pool.get()
         }
         return result
 
     # 生成verify_fp
     async def gen_verify_fp(self, ):
         result = {
-            "verify_fp": VerifyFpManager.gen_verify_fp()
+            "verify_fp": await verify_fp_pool.get()
         }
         return result
 
     # 生成s_v_web_id
     async def gen_s_v_web_id(self, ):
         result = {
-            "s_v_web_id": VerifyFpManager.gen_s_v_web_id()
+            "s_v_web_id": await s_v_web_id_pool.get()
         }
         return result
 
     # 使用接口地址生成Xb参数
     async def get_x_bogus(self, url: str, user_agent: str):
-        url = BogusManager.xb_str_2_endpoint(url, user_agent)
+        url = await signing_service.run(BogusManager.xb_str_2_endpoint, url, user_agent)
         result = {
             "url": url,
             "x_bogus": url.split("&X-Bogus=")[1],
@@ -318,7 +459,7 @@ class DouyinWebCrawler:
         params = dict([i.split("=") for i in url.split("?")[1].split("&")])
         # 去除URL中的msToken参数
         params["msToken"] = ""
-        a_bogus = BogusManager.ab_model_2_endpoint(params, user_agent)
+        a_bogus = await signing_service.run(BogusManager.ab_model_2_endpoint, params, user_agent)
         result = {
             "url": f"{endpoint}?{urlencode(params)}&a_bogus={a_bogus}",
             "a_bogus": a_bogus,
@@ -36,6 +36,16 @@
 import time
 import base64
 import hashlib
+from functools import lru_cache
+
+# X-Bogus 使用的自定义 base64 字母表 (Custom base64 alphabet used by X-Bogus)
+_CHARACTER = "Dkdpgh4ZKsQB80/Mfvw36XI1R25-WUAlEi7NLboqYTOPuzmFjJnryx9HVGcaStCe="
+_B64_TRANSLATE = bytes.maketrans(
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=", _CHARACTER.encode("ascii")
+)
+# 常量 "d41d8cd98f00b204e9800998ecf8427e" 的MD5，与UA和URL无关
+# MD5 of the constant "d41d8cd98f00b204e9800998ecf8427e", independent of the UA and the URL
+_ARRAY2 = hashlib.md5(bytes.fromhex("d41d8cd98f00b204e9800998ecf8427e")).digest()
 
 
 class XBogus:
@@ -49,7 +59,7 @@ class XBogus:
             None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None,
             None, None, None, None, None, None, None, None, None, None, None, None, 10, 11, 12, 13, 14, 15
         ]
-        self.character = "Dkdpgh4ZKsQB80/Mfvw36XI1R25-WUAlEi7NLboqYTOPuzmFjJnryx9HVGcaStCe="
+        self.character = _CHARACTER
         # fmt: on
         self.ua_key = b"\x00\x01\x0c"
         self.user_agent = (
@@ -76,11 +86,41 @@ class XBogus:
                 idx += 2
             return array
 
+    @classmethod
+    @lru_cache(maxsize=64)
+    def signer(cls, user_agent: str = None) -> "XBogus":
+        """
+        获取按UA缓存的签名对象 (Get the signer cached per user agent)
+
+        getXBogus 只读取实例状态，同一个对象可以在多个线程中复用。
+        (getXBogus only reads instance state, so one object is safe to share across threads.)
+        """
+        return cls(user_agent)
+
+    @classmethod
+    @lru_cache(maxsize=256)
+    def ua_array(cls, user_agent: str) -> bytes:
+        """
+        UA 经 RC4、base64 与 MD5 得到的数组，按UA缓存
+        (Array derived from the UA through RC4, base64 and MD5, cached per UA)
+        """
+        instance = cls(user_agent)
+        return bytes(instance.md5_str_to_array(
+            instance.md5(
+                base64.b64encode(
+                    instance.rc4_encrypt(instance.ua_key, instance.user_agent.encode("ISO-8859-1"))
+                ).decode("ISO-8859-1")
+            )
+        ))
+
     def md5_encrypt(self, url_path):
         """
         使用多轮md5哈希算法对URL路径进行加密。
         Encrypt the URL path using multiple rounds of md5 hashing.
         """
+        if len(url_path) > 32:
+            # 长字符串按字符编码处理，两轮MD5直接在字节上计算 / Long strings are taken char by char, hash the bytes directly
+            return hashlib.md5(hashlib.md5(url_path.encode("ISO-8859-1")).digest()).digest()
         hashed_url_path = self.md5_str_to_array(
             self.md5(self.md5_str_to_array(self.md5(url_path)))
         )
@@ -122,20 +162,27 @@ class XBogus:
         """
         return chr(a) + chr(b) + c
 
-    def rc4_encrypt(self, key, data):
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def rc4_key_schedule(key: bytes) -> list:
         """
-        使用RC4算法对数据进行加密。
-        Encrypt data using the RC4 algorithm.
+        RC4 的 S 盒初始化，密钥固定时只计算一次。
+        Initialize the RC4 S box, computed once per key.
         """
         S = list(range(256))
         j = 0
-        encrypted_data = bytearray()
-
-        # 初始化 S 盒
-        # Initialize the S box
         for i in range(256):
             j = (j + S[i] + key[i % len(key)]) % 256
             S[i], S[j] = S[j], S[i]
+        return S
+
+    def rc4_encrypt(self, key, data):
+        """
+        使用RC4算法对数据进行加密。
+        Encrypt data using the RC4 algorithm.
+        """
+        S = self.rc4_key_schedule(bytes(key))[:]
+        encrypted_data = bytearray()
 
         # 生成密文
         # Generate the ciphertext
@@ -164,78 +211,46 @@ class XBogus:
             + self.character[x3 & 63]
         )
 
-    def getXBogus(self, url_path):
+    def getXBogus(self, url_path, timer=None):
         """
-        获取 X-Bogus 值。
-        Get the X-Bogus value.
+        获取 X-Bogus 值，批量签名时可传入共用的时间戳。
+        Get the X-Bogus value; batch signing may pass a shared timestamp.
         """
 
-        array1 = self.md5_str_to_array(
-            self.md5(
-                base64.b64encode(
-                    self.rc4_encrypt(self.ua_key, self.user_agent.encode("ISO-8859-1"))
-                ).decode("ISO-8859-1")
-            )
-        )
-
-        array2 = self.md5_str_to_array(
-            self.md5(self.md5_str_to_array("d41d8cd98f00b204e9800998ecf8427e"))
-        )
+        array1 = self.ua_array(self.user_agent)
+        array2 = _ARRAY2
         url_path_array = self.md5_encrypt(url_path)
 
-        timer = int(time.time())
+        if timer is None:
+            timer = int(time.time())
         ct = 536919696
-        array3 = []
-        array4 = []
-        xb_ = ""
+        # 第二个元素原为 0.00390625，参与计算时取整为 0 / The second item used to be 0.00390625, which truncates to 0
         # fmt: off
         new_array = [
-            64, 0.00390625, 1, 12,
+            64, 0, 1, 12,
             url_path_array[14], url_path_array[15], array2[14], array2[15], array1[14], array1[15],
             timer >> 24 & 255, timer >> 16 & 255, timer >> 8 & 255, timer & 255,
             ct >> 24 & 255, ct >> 16 & 255, ct >> 8 & 255, ct & 255
         ]
         # fmt: on
-        xor_result = new_array[0]
-        for i in range(1, len(new_array)):
-            b = new_array[i]
-            if isinstance(b, float):
-                b = int(b)
+        xor_result = 0
+        for b in new_array:
             xor_result ^= b
-
         new_array.append(xor_result)
 
-        idx = 0
-        while idx < len(new_array):
-            array3.append(new_array[idx])
-            try:
-                array4.append(new_array[idx + 1])
-            except IndexError:
-                pass
-            idx += 2
-
-        merge_array = array3 + array4
-
-        garbled_code = self.encoding_conversion2(
-            2,
-            255,
-            self.rc4_encrypt(
-                "ÿ".encode("ISO-8859-1"),
-                self.encoding_conversion(*merge_array).encode("ISO-8859-1"),
-            ).decode("ISO-8859-1"),
+        # 偶数位在前、奇数位在后 / Even positions first, then odd positions
+        merge_array = new_array[0::2] + new_array[1::2]
+
+        garbled_code = b"\x02\xff" + self.rc4_encrypt(
+            b"\xff", self.encoding_conversion(*merge_array).encode("ISO-8859-1")
         )
+        # 每3个字节对应4个字符，与 base64 相同，只是字母表不同 / 3 bytes to 4 chars, i.e. base64 with another alphabet
+        xb_ = base64.b64encode(garbled_code).translate(_B64_TRANSLATE).decode("ascii")
 
-        idx = 0
-        while idx < len(garbled_code):
-            xb_ += self.calculation(
-                ord(garbled_code[idx]),
-                ord(garbled_code[idx + 1]),
-                ord(garbled_code[idx + 2]),
-            )
-            idx += 3
-        self.params = "%s&X-Bogus=%s" % (url_path, xb_)
-        self.xb = xb_
-        return (self.params, self.xb, self.user_agent)
+        # 结果只通过返回值传出，不写回实例，共享的签名对象才可以跨线程使用
+        # (Results only leave through the return value and are never stored on the instance,
+        # which is what lets a shared signer be used across threads)
+        return ("%s&X-Bogus=%s" % (url_path, xb_), xb_, self.user_agent)
 
 
 if __name__ == "__main__":
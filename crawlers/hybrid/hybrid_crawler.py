@@ -36,6 +36,67 @@ import asyncio
 from crawlers.douyin.web.web_crawler import DouyinWebCrawler  # 导入抖音Web爬虫
 from crawlers.tiktok.web.web_crawler import TikTokWebCrawler  # 导入TikTok Web爬虫
 from crawlers.tiktok.app.app_crawler import TikTokAPPCrawler  # 导入TikTok App爬虫
+from crawlers.utils.batch import batch_runner  # 导入批量执行器
+from crawlers.utils.projection import Projection  # 导入字段投影
+
+"""
+最小数据的投影规则，导入时编译一次，路径语法见 crawlers/utils/projection.py
+Projection specs of the minimal data, compiled once at import, see crawlers/utils/projection.py for the path syntax
+"""
+
+# 通用字段/Common fields
+COMMON_SPEC = {
+    'desc': 'desc',
+    'create_time': 'create_time',
+    'author': 'author',
+    'music': 'music',
+    'statistics': 'statistics',
+    'cover_data': {
+        'cover': 'video.cover',
+        'origin_cover': 'video.origin_cover',
+        'dynamic_cover': 'video.dynamic_cover',
+    },
+    'hashtags': 'text_extra',
+}
+
+MINIMAL_SPECS = {
+    # 抖音视频数据/Douyin video data
+    ('douyin', 'video'): {
+        'video_data': {
+            'wm_video_url': ('video.play_addr.uri',
+                             lambda uri: f"https://aweme.snssdk.com/aweme/v1/playwm/?video_id={uri}&radio=1080p&line=0"),
+            'wm_video_url_HQ': 'video.play_addr.url_list[0]',
+            'nwm_video_url': ('video.play_addr.uri',
+                              lambda uri: f"https://aweme.snssdk.com/aweme/v1/play/?video_id={uri}&ratio=1080p&line=0"),
+            'nwm_video_url_HQ': ('video.play_addr.url_list[0]', lambda url: url.replace('playwm', 'play')),
+        }
+    },
+    # 抖音图片数据/Douyin image data
+    ('douyin', 'image'): {
+        'image_data': {
+            'no_watermark_image_list': 'images[*].url_list[0]',
+            'watermark_image_list': 'images[*].download_url_list[0]',
+        }
+    },
+    # TikTok视频数据/TikTok video data
+    ('tiktok', 'video'): {
+        'video_data': {
+            'wm_video_url': 'video.download_addr.url_list[0]',
+            'wm_video_url_HQ': 'video.download_addr.url_list[0]',
+            'nwm_video_url': 'video.play_addr.url_list[0]',
+            'nwm_video_url_HQ': 'video.bit_rate[0].play_addr.url_list[0]',
+        }
+    },
+    # TikTok图片数据/TikTok image data
+    ('tiktok', 'image'): {
+        'image_data': {
+            'no_watermark_image_list': 'image_post_info.images[*].display_image.url_list[0]',
+            'watermark_image_list': 'image_post_info.images[*].owner_watermark_image.url_list[0]',
+        }
+    },
+}
+
+MINIMAL_PROJECTIONS = {key: Projection({**COMMON_SPEC, **spec}) for key, spec in MINIMAL_SPECS.items()}
 
 
 class HybridCrawler:
@@ -92,115 +153,40 @@ class HybridCrawler:
         # print(f"url_type: {url_type}")
 
         """
-        以下为(视频||图片)数据处理的四个方法,如果你需要自定义数据处理请在这里修改.
-        The following are four methods of (video || image) data processing. 
-        If you need to customize data processing, please modify it here.
-        """
-
-        """
-        创建已知数据字典(索引相同)，稍后使用.update()方法更新数据
-        Create a known data dictionary (index the same), 
-        and then use the .update() method to update the data
+        (视频||图片)数据的投影规则定义在本文件顶部的 MINIMAL_SPECS 中，如果你需要自定义数据处理请在那里修改.
+        The projection specs for (video || image) data are defined in MINIMAL_SPECS at the top of this file.
+        If you need to customize data processing, please modify them there.
         """
-
         result_data = {
             'type': url_type,
             'platform': platform,
             'aweme_id': aweme_id,
-            'desc': data.get("desc"),
-            'create_time': data.get("create_time"),
-            'author': data.get("author"),
-            'music': data.get("music"),
-            'statistics': data.get("statistics"),
-            'cover_data': {
-                'cover': data.get("video").get("cover"),
-                'origin_cover': data.get("video").get("origin_cover"),
-                'dynamic_cover': data.get("video").get("dynamic_cover")
-            },
-            'hashtags': data.get('text_extra'),
         }
-        # 创建一个空变量，稍后使用.update()方法更新数据/Create an empty variable and use the .update() method to update the data
-        api_data = None
-        # 判断链接类型并处理数据/Judge link type and process data
-        # 抖音数据处理/Douyin data processing
-        if platform == 'douyin':
-            # 抖音视频数据处理/Douyin video data processing
-            if url_type == 'video':
-                # 将信息储存在字典中/Store information in a dictionary
-                uri = data['video']['play_addr']['uri']
-                wm_video_url_HQ = data['video']['play_addr']['url_list'][0]
-                wm_video_url = f"https://aweme.snssdk.com/aweme/v1/playwm/?video_id={uri}&radio=1080p&line=0"
-                nwm_video_url_HQ = wm_video_url_HQ.replace('playwm', 'play')
-                nwm_video_url = f"https://aweme.snssdk.com/aweme/v1/play/?video_id={uri}&ratio=1080p&line=0"
-                api_data = {
-                    'video_data':
-                        {
-                            'wm_video_url': wm_video_url,
-                            'wm_video_url_HQ': wm_video_url_HQ,
-                            'nwm_video_url': nwm_video_url,
-                            'nwm_video_url_HQ': nwm_video_url_HQ
-                        }
-                }
-            # 抖音图片数据处理/Douyin image data processing
-            elif url_type == 'image':
-                # 无水印图片列表/No watermark image list
-                no_watermark_image_list = []
-                # 有水印图片列表/With watermark image list
-                watermark_image_list = []
-                # 遍历图片列表/Traverse image list
-                for i in data['images']:
-                    no_watermark_image_list.append(i['url_list'][0])
-                    watermark_image_list.append(i['download_url_list'][0])
-                api_data = {
-                    'image_data':
-                        {
-                            'no_watermark_image_list': no_watermark_image_list,
-                            'watermark_image_list': watermark_image_list
-                        }
-                }
-        # TikTok数据处理/TikTok data processing
-        elif platform == 'tiktok':
-            # TikTok视频数据处理/TikTok video data processing
-            if url_type == 'video':
-                # 将信息储存在字典中/Store information in a dictionary
-                # wm_video = data['video']['downloadAddr']
-                # wm_video = data['video']['download_addr']['url_list'][0]
-                wm_video = (
-                    data.get('video', {})
-                    .get('download_addr', {})
-                    .get('url_list', [None])[0]
-                )
-
-                api_data = {
-                    'video_data':
-                        {
-                            'wm_video_url': wm_video,
-                            'wm_video_url_HQ': wm_video,
-                            # 'nwm_video_url': data['video']['playAddr'],
-                            'nwm_video_url': data['video']['play_addr']['url_list'][0],
-                            # 'nwm_video_url_HQ': data['video']['bitrateInfo'][0]['PlayAddr']['UrlList'][0]
-                            'nwm_video_url_HQ': data['video']['bit_rate'][0]['play_addr']['url_list'][0]
-                        }
-                }
-            # TikTok图片数据处理/TikTok image data processing
-            elif url_type == 'image':
-                # 无水印图片列表/No watermark image list
-                no_watermark_image_list = []
-                # 有水印图片列表/With watermark image list
-                watermark_image_list = []
-                for i in data['image_post_info']['images']:
-                    no_watermark_image_list.append(i['display_image']['url_list'][0])
-                    watermark_image_list.append(i['owner_watermark_image']['url_list'][0])
-                api_data = {
-                    'image_data':
-                        {
-                            'no_watermark_image_list': no_watermark_image_list,
-                            'watermark_image_list': watermark_image_list
-                        }
-                }
-        # 更新数据/Update data
-        result_data.update(api_data)
-        return result_data
+        return MINIMAL_PROJECTIONS[(platform, url_type)](data, into=result_data)
+
+    async def hybrid_parsing_videos(self, urls: list, minimal: bool = False, concurrency: int = None):
+        """
+        批量混合解析，按完成顺序逐个产出结果 (Hybrid parse a batch, yielding results in completion order)
+
+        Args:
+            urls: list: 视频链接、分享链接或分享文本列表 (Video links, share links or share texts)
+            minimal: bool: 是否只返回最小数据 (Whether to return minimal data only)
+            concurrency: int: 同时解析的最大数量，默认使用 BatchRunner 的配置 (Maximum parsed at once, BatchRunner's setting by default)
+
+        Return:
+            AsyncIterator[Tuple[int, BatchResult]]: 输入下标与结果 (Input index and result)
+        """
+
+        async def parse(url: str):
+            return await self.hybrid_parsing_single_video(url, minimal=minimal)
+
+        results = batch_runner.stream(urls, parse, concurrency=concurrency)
+        try:
+            async for item in results:
+                yield item
+        finally:
+            # 调用方提前停止时取消剩余的解析 / Cancel the remaining parses when the caller stops early
+            await results.aclose()
 
     async def main(self):
         # 测试混合解析单一视频接口/Test hybrid parsing single video endpoint
@@ -44,7 +44,10 @@ from crawlers.tiktok.app.endpoints import TikTokAPIEndpoints
 from crawlers.utils.utils import model_to_query_string
 
 # 重试机制
-from tenacity import *
+from crawlers.utils.retry import RetryPolicy
+# 失败结果缓存
+from crawlers.utils.negative_cache import negative_cache, NegativeCache
+from crawlers.utils.api_exceptions import APIDataMismatchError, APINotFoundError, APIResponseError
 
 # TikTok接口数据请求模型
 from crawlers.tiktok.app.models import (
@@ -61,6 +64,13 @@ path = os.path.abspath(os.path.dirname(__file__))
 with open(f"{path}/config.yaml", "r", encoding="utf-8") as f:
     config = yaml.safe_load(f)
 
+# Feed接口偶尔返回其他作品，按指数退避重试 / The feed occasionally returns another post, retry with exponential backoff
+feed_retry_policy = RetryPolicy.from_config(max_attempts=10)
+# 只重试Feed返回了错误作品的情况，连接失败、5xx与空响应已由 BaseCrawler 重试，其余错误直接抛出
+# Only retry the feed returning the wrong post; connection errors, 5xx and empty bodies are
+# already retried by BaseCrawler and every other error raises immediately
+FEED_RETRY_ON = (APIDataMismatchError,)
+
 
 class TikTokAPPCrawler:
 
@@ -83,21 +93,37 @@ class TikTokAPPCrawler:
 
     # 获取单个作品数据
     # @deprecated("TikTok APP fetch_one_video is deprecated and will be removed in a future release. Use Web API instead. | TikTok APP fetch_one_video 已弃用，将在将来的版本中删除。请改用Web API。")
-    @retry(stop=stop_after_attempt(10), wait=wait_fixed(1))
     async def fetch_one_video(self, aweme_id: str):
+        # 已确认删除或私密的作品直接失败 / Known deleted or private posts fail fast
+        negative_cache.check(NegativeCache.TIKTOK_ITEM_ID, aweme_id)
+        try:
+            return await self._fetch_one_video(aweme_id)
+        except APINotFoundError:
+            # 只有上游明确返回404时才视为已删除或不可见；Feed返回其他作品只是暂时的，不记录
+            # Only a definitive 404 from upstream marks the post as deleted or hidden; the feed
+            # returning another post is transient and never recorded
+            negative_cache.add(NegativeCache.TIKTOK_ITEM_ID, aweme_id, "作品不存在或不可见")
+            raise
+
+    @feed_retry_policy.retry(exceptions=FEED_RETRY_ON)
+    async def _fetch_one_video(self, aweme_id: str):
         # 获取TikTok的实时Cookie
         kwargs = await self.get_tiktok_headers()
         params = FeedVideoDetail(aweme_id=aweme_id)
         param_str = model_to_query_string(params)
         url = f"{TikTokAPIEndpoints.HOME_FEED}?{param_str}"
         # 创建一个基础爬虫
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="tiktok")
         async with base_crawler as crawler:
             response = await crawler.fetch_get_json(url)
-            response = response.get("aweme_list")[0]
-            if response.get("aweme_id") != aweme_id:
-                raise Exception("作品ID错误/Video ID error")
-        return response
+        aweme_list = response.get("aweme_list")
+        if aweme_list is None:
+            raise APIResponseError("Feed响应中没有 aweme_list/No aweme_list in the feed response")
+        if not aweme_list:
+            raise APIDataMismatchError("Feed未返回作品/The feed returned no post")
+        if aweme_list[0].get("aweme_id") != aweme_id:
+            raise APIDataMismatchError("Feed返回了其他作品/The feed returned another post")
+        return aweme_list[0]
 
     """-------------------------------------------------------main------------------------------------------------------"""
 
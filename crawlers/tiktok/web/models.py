@@ -1,8 +1,8 @@
 from typing import Any
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from urllib.parse import quote, unquote
 
-from crawlers.tiktok.web.utils import TokenManager
+from crawlers.tiktok.web.utils import TokenManager, ms_token_pool
 from crawlers.utils.utils import get_timestamp
 
 
@@ -41,7 +41,7 @@ class BaseRequestModel(BaseModel):
     webcast_language: str = "en"
     tz_name: str = quote("America/Tijuana", safe="")
     # verifyFp: str = VerifyFpManager.gen_verify_fp()
-    msToken: str = TokenManager.gen_real_msToken()
+    msToken: str = Field(default_factory=ms_token_pool.current)
 
 
 # router model
@@ -3,17 +3,23 @@ import re
 import json
 import yaml
 import httpx
-import asyncio
+import time
 
-from typing import Union
+from typing import Optional, Union
 from pathlib import Path
 
+from crawlers.utils.batch import batch_runner
+from crawlers.utils.client_pool import client_pool
 from crawlers.utils.logger import logger
+from crawlers.utils.redirects import first_group, walk_redirects
+from crawlers.utils.resolution_cache import resolution_cache, ResolutionCache
+from crawlers.utils.token_pool import TokenPool, token_pools
 from crawlers.douyin.web.xbogus import XBogus as XB
 from crawlers.utils.utils import (
     gen_random_str,
     get_timestamp,
     extract_valid_urls,
+    match_canonical_url,
     split_filename,
 )
 from crawlers.utils.api_exceptions import (
@@ -51,20 +57,7 @@ class TokenManager:
         (Generate a real msToken and return a false value when an error occurs)
         """
 
-        payload = json.dumps(
-            {
-                "magic": cls.token_conf["magic"],
-                "version": cls.token_conf["version"],
-                "dataType": cls.token_conf["dataType"],
-                "strData": cls.token_conf["strData"],
-                "tspFromClient": get_timestamp(),
-            }
-        )
-
-        headers = {
-            "User-Agent": cls.token_conf["User-Agent"],
-            "Content-Type": "application/json",
-        }
+        payload, headers = cls._ms_token_request()
 
         transport = httpx.HTTPTransport(retries=5)
         with httpx.Client(transport=transport, proxies=cls.proxies) as client:
@@ -107,6 +100,41 @@ class TokenManager:
                 logger.info("如果你不需要使用TikTok相关API，请忽略此消息。")
                 return cls.gen_false_msToken()
 
+    @classmethod
+    def _ms_token_request(cls) -> tuple:
+        """构造msToken请求的内容与请求头 (Build the msToken request body and headers)"""
+        payload = json.dumps(
+            {
+                "magic": cls.token_conf["magic"],
+                "version": cls.token_conf["version"],
+                "dataType": cls.token_conf["dataType"],
+                "strData": cls.token_conf["strData"],
+                "tspFromClient": get_timestamp(),
+            }
+        )
+        headers = {
+            "User-Agent": cls.token_conf["User-Agent"],
+            "Content-Type": "application/json",
+        }
+        return payload, headers
+
+    @classmethod
+    async def agen_real_msToken(cls) -> str:
+        """
+        异步生成真实的msToken，出现错误时抛出异常，由调用方决定是否使用虚假的值
+        (Generate a real msToken asynchronously, raising on error so the caller decides on a fallback)
+        """
+        payload, headers = cls._ms_token_request()
+        transport = httpx.AsyncHTTPTransport(retries=5)
+        async with httpx.AsyncClient(transport=transport, proxies=cls.proxies) as client:
+            response = await client.post(cls.token_conf["url"], content=payload, headers=headers)
+            response.raise_for_status()
+
+        msToken = response.cookies.get("msToken")
+        if not msToken:
+            raise APIResponseError("TikTok msToken API 的响应中没有 msToken。")
+        return msToken
+
     @classmethod
     def gen_false_msToken(cls) -> str:
         """生成随机msToken (Generate random msToken)"""
@@ -200,6 +228,13 @@ class TokenManager:
                     )
 
 
+# 轮换使用的msToken，首次使用时生成并在后台补充 (Rotating msTokens, generated on first use and refilled in the background)
+ms_token_pool = token_pools.register(
+    TokenPool.from_config("tiktok_msToken", TokenManager.agen_real_msToken, TokenManager.gen_false_msToken),
+    param="msToken",
+)
+
+
 class BogusManager:
     @classmethod
     def xb_str_2_endpoint(
@@ -208,7 +243,7 @@ class BogusManager:
             endpoint: str,
     ) -> str:
         try:
-            final_endpoint = XB(user_agent).getXBogus(endpoint)
+            final_endpoint = XB.signer(user_agent).getXBogus(endpoint)
         except Exception as e:
             raise RuntimeError("生成X-Bogus失败: {0})".format(e))
 
@@ -218,17 +253,19 @@ class BogusManager:
     def model_2_endpoint(
             cls,
             base_endpoint: str,
-            params: dict,
+            params: dict | str,
             user_agent: str,
     ) -> str:
-        # 检查params是否是一个字典 (Check if params is a dict)
-        if not isinstance(params, dict):
-            raise TypeError("参数必须是字典类型")
-
-        param_str = "&".join([f"{k}={v}" for k, v in params.items()])
+        # 也接受 QueryTemplate.join() 生成的查询字符串 (Also accepts a query string from QueryTemplate.join())
+        if isinstance(params, str):
+            param_str = params
+        elif isinstance(params, dict):
+            param_str = "&".join([f"{k}={v}" for k, v in params.items()])
+        else:
+            raise TypeError("参数必须是字典或字符串类型")
 
         try:
-            xb_value = XB(user_agent).getXBogus(param_str)
+            xb_value = XB.signer(user_agent).getXBogus(param_str)
         except Exception as e:
             raise RuntimeError("生成X-Bogus失败: {0})".format(e))
 
@@ -239,6 +276,40 @@ class BogusManager:
 
         return final_endpoint
 
+    # 批量生成带X-Bogus参数的Endpoint，同一UA的签名器只取一次，整批共用一个时间戳
+    # Batch X-Bogus endpoints, the UA signer is looked up once and the batch shares one timestamp
+    @classmethod
+    def sign_many(
+            cls,
+            params_list: list,
+            base_endpoint: str,
+            user_agent: str,
+    ) -> list:
+        """
+        批量签名，结果与 params_list 顺序一致 (Sign a batch, results keep the order of params_list)
+
+        Args:
+            params_list (list): 参数字典或 QueryTemplate.join() 生成的查询字符串 (Param dicts or QueryTemplate.join() queries)
+            base_endpoint (str): 接口地址 (Endpoint base URL)
+            user_agent (str): 用户代理 (User agent)
+
+        Returns:
+            list: 带X-Bogus参数的Endpoint (Endpoints carrying X-Bogus)
+        """
+        signer = XB.signer(user_agent)
+        separator = "&" if "?" in base_endpoint else "?"
+        timer = int(time.time())
+
+        endpoints = []
+        for params in params_list:
+            param_str = params if isinstance(params, str) else "&".join([f"{k}={v}" for k, v in params.items()])
+            try:
+                xb_value = signer.getXBogus(param_str, timer)
+            except Exception as e:
+                raise RuntimeError("生成X-Bogus失败: {0})".format(e))
+            endpoints.append(f"{base_endpoint}{separator}{param_str}&X-Bogus={xb_value[1]}")
+        return endpoints
+
 
 class SecUserIdFetcher:
     # 预编译正则表达式
@@ -247,6 +318,15 @@ class SecUserIdFetcher:
     )
     _TIKTOK_UNIQUEID_PARREN = re.compile(r"/@([^/?]*)")
     _TIKTOK_NOTFOUND_PARREN = re.compile(r"notfound")
+    _UNIQUEID_PATTERN = re.compile(r"[\w.-]+")
+
+    # 可在本地解析的规范域名 (Canonical hosts that can be parsed locally)
+    _CANONICAL_HOSTS = frozenset({"www.tiktok.com", "tiktok.com", "m.tiktok.com"})
+
+    @classmethod
+    def match_local_uniqueid(cls, url: str) -> Optional[str]:
+        """从规范的用户主页链接中直接提取unique_id (Extract unique_id from a canonical profile link directly)"""
+        return match_canonical_url(url, cls._CANONICAL_HOSTS, (cls._TIKTOK_UNIQUEID_PARREN,), cls._UNIQUEID_PATTERN)
 
     @classmethod
     async def get_secuid(cls, url: str) -> str:
@@ -270,46 +350,53 @@ class SecUserIdFetcher:
                 APINotFoundError("输入的URL不合法。类名：{0}".format(cls.__name__))
             )
 
-        transport = httpx.AsyncHTTPTransport(retries=5)
-        async with httpx.AsyncClient(
-                transport=transport, proxies=TokenManager.proxies, timeout=10
-        ) as client:
-            try:
-                response = await client.get(url, follow_redirects=True)
-                # 444一般为Nginx拦截，不返回状态 (444 is generally intercepted by Nginx and does not return status)
-                if response.status_code in {200, 444}:
-                    if cls._TIKTOK_NOTFOUND_PARREN.search(str(response.url)):
-                        raise APINotFoundError("页面不可用，可能是由于区域限制（代理）造成的。类名: {0}"
-                                               .format(cls.__name__)
-                                               )
-
-                    match = cls._TIKTOK_SECUID_PARREN.search(str(response.text))
-                    if not match:
-                        raise APIResponseError("未在响应中找到 {0}，检查链接是否为用户主页。类名: {1}"
-                                               .format("sec_uid", cls.__name__)
-                                               )
-
-                    # 提取SIGI_STATE对象中的sec_uid
-                    data = json.loads(match.group(1))
-                    default_scope = data.get("__DEFAULT_SCOPE__", {})
-                    user_detail = default_scope.get("webapp.user-detail", {})
-                    user_info = user_detail.get("userInfo", {}).get("user", {})
-                    sec_uid = user_info.get("secUid")
+        # 同一链接总是解析出同一ID，优先使用缓存 / A link always resolves to the same ID, prefer the cache
+        return await resolution_cache.resolve(
+            ResolutionCache.TIKTOK_SEC_UID, url, lambda: cls._fetch_secuid(url)
+        )
 
-                    if sec_uid is None:
-                        raise RuntimeError(
-                            "获取 {0} 失败，{1}".format(sec_uid, user_info)
-                        )
+    @classmethod
+    async def _fetch_secuid(cls, url: str) -> str:
+        """请求用户主页并从页面数据中提取sec_uid (Request the profile page and extract sec_uid from its data)"""
+        try:
+            # 需要读取页面数据，复用共享客户端而非逐个创建
+            # The page body is needed, so reuse the shared client instead of creating one per call
+            client = client_pool.get_client("tiktok_resolve", proxies=TokenManager.proxies)
+            response = await client.get(url, follow_redirects=True)
+            # 444一般为Nginx拦截，不返回状态 (444 is generally intercepted by Nginx and does not return status)
+            if response.status_code in {200, 444}:
+                if cls._TIKTOK_NOTFOUND_PARREN.search(str(response.url)):
+                    raise APINotFoundError("页面不可用，可能是由于区域限制（代理）造成的。类名: {0}"
+                                           .format(cls.__name__)
+                                           )
+
+                match = cls._TIKTOK_SECUID_PARREN.search(str(response.text))
+                if not match:
+                    raise APIResponseError("未在响应中找到 {0}，检查链接是否为用户主页。类名: {1}"
+                                           .format("sec_uid", cls.__name__)
+                                           )
+
+                # 提取SIGI_STATE对象中的sec_uid
+                data = json.loads(match.group(1))
+                default_scope = data.get("__DEFAULT_SCOPE__", {})
+                user_detail = default_scope.get("webapp.user-detail", {})
+                user_info = user_detail.get("userInfo", {}).get("user", {})
+                sec_uid = user_info.get("secUid")
+
+                if sec_uid is None:
+                    raise RuntimeError(
+                        "获取 {0} 失败，{1}".format(sec_uid, user_info)
+                    )
 
-                    return sec_uid
-                else:
-                    raise ConnectionError("接口状态码异常, 请检查重试")
+                return sec_uid
+            else:
+                raise ConnectionError("接口状态码异常, 请检查重试")
 
-            except httpx.RequestError as exc:
-                # 捕获所有与 httpx 请求相关的异常情况 (Captures all httpx request-related exceptions)
-                raise APIConnectionError("请求端点失败，请检查当前网络环境。 链接：{0}，代理：{1}，异常类名：{2}，异常详细信息：{3}"
-                                         .format(url, TokenManager.proxies, cls.__name__, exc)
-                                         )
+        except httpx.RequestError as exc:
+            # 捕获所有与 httpx 请求相关的异常情况 (Captures all httpx request-related exceptions)
+            raise APIConnectionError("请求端点失败，请检查当前网络环境。 链接：{0}，代理：{1}，异常类名：{2}，异常详细信息：{3}"
+                                     .format(url, TokenManager.proxies, cls.__name__, exc)
+                                     )
 
     @classmethod
     async def get_all_secuid(cls, urls: list) -> list:
@@ -321,6 +408,7 @@ class SecUserIdFetcher:
 
         Return:
             secuids: list: 用户secuid列表 (User secuid list)
+                每项包含 input、data、error (Each item has input, data and error)
         """
 
         if not isinstance(urls, list):
@@ -336,8 +424,10 @@ class SecUserIdFetcher:
                 )
             )
 
-        secuids = [cls.get_secuid(url) for url in urls]
-        return await asyncio.gather(*secuids)
+        # 有并发上限地逐项解析，单个链接失败不影响其余结果
+        # Resolve each link under a concurrency cap; one failing link does not affect the others
+        results = await batch_runner.run(urls, cls.get_secuid)
+        return [result.to_dict() for result in results]
 
     @classmethod
     async def get_uniqueid(cls, url: str) -> str:
@@ -361,42 +451,42 @@ class SecUserIdFetcher:
                 APINotFoundError("输入的URL不合法。类名：{0}".format(cls.__name__))
             )
 
-        transport = httpx.AsyncHTTPTransport(retries=5)
-        async with httpx.AsyncClient(
-                transport=transport, proxies=TokenManager.proxies, timeout=10
-        ) as client:
-            try:
-                response = await client.get(url, follow_redirects=True)
-
-                if response.status_code in {200, 444}:
-                    if cls._TIKTOK_NOTFOUND_PARREN.search(str(response.url)):
-                        raise APINotFoundError("页面不可用，可能是由于区域限制（代理）造成的。类名: {0}"
-                                               .format(cls.__name__)
-                                               )
-
-                    match = cls._TIKTOK_UNIQUEID_PARREN.search(str(response.url))
-                    if not match:
-                        raise APIResponseError(
-                            "未在响应中找到 {0}".format("unique_id")
-                        )
+        # 规范链接在本地提取，只有短链接或未知格式才请求网络 / Canonical links are parsed locally, only short links or unknown shapes hit the network
+        unique_id = cls.match_local_uniqueid(url)
+        if unique_id is not None:
+            return unique_id
 
-                    unique_id = match.group(1)
-
-                    if unique_id is None:
-                        raise RuntimeError(
-                            "获取 {0} 失败，{1}".format("unique_id", response.url)
-                        )
-
-                    return unique_id
-                else:
-                    raise ConnectionError(
-                        "接口状态码异常 {0}, 请检查重试".format(response.status_code)
-                    )
+        # 同一链接总是解析出同一ID，优先使用缓存 / A link always resolves to the same ID, prefer the cache
+        return await resolution_cache.resolve(
+            ResolutionCache.TIKTOK_UNIQUE_ID, url, lambda: cls._fetch_uniqueid(url)
+        )
 
-            except httpx.RequestError:
-                raise APIConnectionError("连接端点失败，检查网络环境或代理：{0} 代理：{1} 类名：{2}"
-                                         .format(url, TokenManager.proxies, cls.__name__),
-                                         )
+    @classmethod
+    async def _fetch_uniqueid(cls, url: str) -> str:
+        """逐跳跟随重定向，从地址中提取unique_id (Follow redirects hop by hop and extract unique_id from the URL)"""
+        try:
+            client = client_pool.get_client("tiktok_resolve", proxies=TokenManager.proxies)
+            result = await walk_redirects(client, url, first_group(cls._TIKTOK_UNIQUEID_PARREN))
+        except httpx.RequestError:
+            raise APIConnectionError("连接端点失败，检查网络环境或代理：{0} 代理：{1} 类名：{2}"
+                                     .format(url, TokenManager.proxies, cls.__name__),
+                                     )
+
+        if result.match is not None:
+            return result.match
+
+        if result.status_code in {200, 444}:
+            if cls._TIKTOK_NOTFOUND_PARREN.search(result.url):
+                raise APINotFoundError("页面不可用，可能是由于区域限制（代理）造成的。类名: {0}"
+                                       .format(cls.__name__)
+                                       )
+            raise APIResponseError(
+                "未在响应中找到 {0}".format("unique_id")
+            )
+        else:
+            raise ConnectionError(
+                "接口状态码异常 {0}, 请检查重试".format(result.status_code)
+            )
 
     @classmethod
     async def get_all_uniqueid(cls, urls: list) -> list:
@@ -408,6 +498,7 @@ class SecUserIdFetcher:
 
         Return:
             unique_ids: list: 用户unique_id列表 (User unique_id list)
+                每项包含 input、data、error (Each item has input, data and error)
         """
 
         if not isinstance(urls, list):
@@ -423,8 +514,10 @@ class SecUserIdFetcher:
                 )
             )
 
-        unique_ids = [cls.get_uniqueid(url) for url in urls]
-        return await asyncio.gather(*unique_ids)
+        # 有并发上限地逐项解析，单个链接失败不影响其余结果
+        # Resolve each link under a concurrency cap; one failing link does not affect the others
+        results = await batch_runner.run(urls, cls.get_uniqueid)
+        return [result.to_dict() for result in results]
 
 
 class AwemeIdFetcher:
@@ -436,6 +529,20 @@ class AwemeIdFetcher:
     _TIKTOK_AWEMEID_PATTERN = re.compile(r"video/(\d+)")
     _TIKTOK_PHOTOID_PATTERN = re.compile(r"photo/(\d+)")
     _TIKTOK_NOTFOUND_PATTERN = re.compile(r"notfound")
+    _AWEME_ID_PATTERN = re.compile(r"\d+")
+
+    # 可在本地解析的规范域名 (Canonical hosts that can be parsed locally)
+    _CANONICAL_HOSTS = frozenset({"www.tiktok.com", "tiktok.com", "m.tiktok.com"})
+
+    @classmethod
+    def match_local(cls, url: str) -> Optional[str]:
+        """从规范的作品链接中直接提取aweme_id或photo_id (Extract aweme_id or photo_id from a canonical post link directly)"""
+        return match_canonical_url(
+            url,
+            cls._CANONICAL_HOSTS,
+            (cls._TIKTOK_AWEMEID_PATTERN, cls._TIKTOK_PHOTOID_PATTERN),
+            cls._AWEME_ID_PATTERN,
+        )
 
     @classmethod
     async def get_aweme_id(cls, url: str) -> str:
@@ -457,57 +564,41 @@ class AwemeIdFetcher:
         if url is None:
             raise APINotFoundError("输入的URL不合法。类名：{0}".format(cls.__name__))
 
-        # 处理不是短连接的情况
-        if "tiktok" and "@" in url:
-            print(f"输入的URL无需重定向: {url}")
-            video_match = cls._TIKTOK_AWEMEID_PATTERN.search(url)
-            photo_match = cls._TIKTOK_PHOTOID_PATTERN.search(url)
-
-            if not video_match and not photo_match:
-                raise APIResponseError("未在响应中找到 aweme_id 或 photo_id")
-
-            aweme_id = video_match.group(1) if video_match else photo_match.group(1)
-
-            if aweme_id is None:
-                raise RuntimeError("获取 aweme_id 或 photo_id 失败，{0}".format(url))
-
+        # 规范链接在本地提取，只有短链接或未知格式才请求网络 / Canonical links are parsed locally, only short links or unknown shapes hit the network
+        aweme_id = cls.match_local(url)
+        if aweme_id is not None:
             return aweme_id
 
-        # 处理短连接的情况，根据重定向后的链接获取aweme_id
-        print(f"输入的URL需要重定向: {url}")
-        transport = httpx.AsyncHTTPTransport(retries=10)
-        async with httpx.AsyncClient(
-                transport=transport, proxies=TokenManager.proxies, timeout=10
-        ) as client:
-            try:
-                response = await client.get(url, follow_redirects=True)
-
-                if response.status_code in {200, 444}:
-                    if cls._TIKTOK_NOTFOUND_PATTERN.search(str(response.url)):
-                        raise APINotFoundError("页面不可用，可能是由于区域限制（代理）造成的。类名: {0}"
-                                               .format(cls.__name__)
-                                               )
-
-                    video_match = cls._TIKTOK_AWEMEID_PATTERN.search(str(response.url))
-                    photo_match = cls._TIKTOK_PHOTOID_PATTERN.search(str(response.url))
-
-                    if not video_match and not photo_match:
-                        raise APIResponseError("未在响应中找到 aweme_id 或 photo_id")
-
-                    aweme_id = video_match.group(1) if video_match else photo_match.group(1)
-
-                    if aweme_id is None:
-                        raise RuntimeError("获取 aweme_id 或 photo_id 失败，{0}".format(response.url))
-
-                    return aweme_id
-                else:
-                    raise ConnectionError("接口状态码异常 {0}，请检查重试".format(response.status_code))
+        # 同一链接总是解析出同一ID，优先使用缓存 / A link always resolves to the same ID, prefer the cache
+        return await resolution_cache.resolve(
+            ResolutionCache.TIKTOK_AWEME_ID, url, lambda: cls._fetch_aweme_id(url)
+        )
 
-            except httpx.RequestError as exc:
-                # 捕获所有与 httpx 请求相关的异常情况
-                raise APIConnectionError("请求端点失败，请检查当前网络环境。 链接：{0}，代理：{1}，异常类名：{2}，异常详细信息：{3}"
-                                         .format(url, TokenManager.proxies, cls.__name__, exc)
-                                         )
+    @classmethod
+    async def _fetch_aweme_id(cls, url: str) -> str:
+        """处理短连接的情况，逐跳跟随重定向获取aweme_id (Resolve a short link hop by hop to get aweme_id)"""
+        try:
+            client = client_pool.get_client("tiktok_resolve", proxies=TokenManager.proxies)
+            result = await walk_redirects(
+                client, url, first_group(cls._TIKTOK_AWEMEID_PATTERN, cls._TIKTOK_PHOTOID_PATTERN)
+            )
+        except httpx.RequestError as exc:
+            # 捕获所有与 httpx 请求相关的异常情况
+            raise APIConnectionError("请求端点失败，请检查当前网络环境。 链接：{0}，代理：{1}，异常类名：{2}，异常详细信息：{3}"
+                                     .format(url, TokenManager.proxies, cls.__name__, exc)
+                                     )
+
+        if result.match is not None:
+            return result.match
+
+        if result.status_code in {200, 444}:
+            if cls._TIKTOK_NOTFOUND_PATTERN.search(result.url):
+                raise APINotFoundError("页面不可用，可能是由于区域限制（代理）造成的。类名: {0}"
+                                       .format(cls.__name__)
+                                       )
+            raise APIResponseError("未在响应中找到 aweme_id 或 photo_id")
+        else:
+            raise ConnectionError("接口状态码异常 {0}，请检查重试".format(result.status_code))
 
     @classmethod
     async def get_all_aweme_id(cls, urls: list) -> list:
@@ -519,6 +610,7 @@ class AwemeIdFetcher:
 
         Return:
             aweme_ids: list: 视频的唯一标识，返回列表 (The unique identifier of the video, return list)
+                每项包含 input、data、error (Each item has input, data and error)
         """
 
         if not isinstance(urls, list):
@@ -534,8 +626,10 @@ class AwemeIdFetcher:
                 )
             )
 
-        aweme_ids = [cls.get_aweme_id(url) for url in urls]
-        return await asyncio.gather(*aweme_ids)
+        # 有并发上限地逐项解析，单个链接失败不影响其余结果
+        # Resolve each link under a concurrency cap; one failing link does not affect the others
+        results = await batch_runner.run(urls, cls.get_aweme_id)
+        return [result.to_dict() for result in results]
 
 
 def format_file_name(
@@ -36,10 +36,17 @@
 import asyncio  # 异步I/O
 import time  # 时间操作
 import yaml  # 配置文件
+from typing import Any, Callable  # 类型注解
 import os  # 系统操作
 
 # 基础爬虫客户端和TikTokAPI端点
 from crawlers.base_crawler import BaseCrawler
+from crawlers.utils.batch import batch_runner
+from crawlers.utils.cache import first_page, response_cache
+from crawlers.utils.query_template import QueryTemplate
+from crawlers.utils.signing import signing_service
+from crawlers.utils.negative_cache import negative_cache, NegativeCache
+from crawlers.utils.api_exceptions import APINotFoundError
 from crawlers.tiktok.web.endpoints import TikTokAPIEndpoints
 from crawlers.utils.utils import extract_valid_urls
 
@@ -48,7 +55,8 @@ from crawlers.tiktok.web.utils import (
     AwemeIdFetcher,
     BogusManager,
     SecUserIdFetcher,
-    TokenManager
+    TokenManager,
+    ms_token_pool
 )
 
 # TikTok接口数据请求模型
@@ -74,14 +82,29 @@ path = os.path.abspath(os.path.dirname(__file__))
 with open(f"{path}/config.yaml", "r", encoding="utf-8") as f:
     config = yaml.safe_load(f)
 
+# 各端点的响应缓存时间(秒)，未注册的端点及使用用户Cookie的接口不缓存
+# Response cache TTLs per endpoint (seconds), unregistered endpoints and user-cookie handlers are not cached
+response_cache.register(TikTokAPIEndpoints.POST_DETAIL, ttl=3600)  # 作品详情 / Post detail
+response_cache.register(TikTokAPIEndpoints.USER_DETAIL, ttl=600)  # 用户信息 / User profile
+response_cache.register(
+    TikTokAPIEndpoints.USER_POST, ttl=300, bypass=first_page("cursor")
+)  # 用户作品，第一页用于轮询最新作品，不缓存 / User posts, first pages poll for the latest posts and are not cached
+response_cache.register(TikTokAPIEndpoints.USER_MIX, ttl=600)  # 合集作品 / Mix posts
+response_cache.register(TikTokAPIEndpoints.POST_COMMENT, ttl=120)  # 作品评论 / Post comments
+response_cache.register(TikTokAPIEndpoints.POST_COMMENT_REPLY, ttl=120)  # 评论回复 / Comment replies
+
 
 class TikTokWebCrawler:
+    # 用户详情中表示用户不存在或被封禁的状态码 / User detail status codes meaning the user is missing or banned
+    _USER_NOT_FOUND_CODES = {10202, 10221}
 
     def __init__(self):
         self.proxy_pool = None
 
     # 从配置文件中获取TikTok的请求头
     async def get_tiktok_headers(self):
+        # 冷启动时等待首批msToken，之后由令牌池在后台补充 / Wait for the first msTokens on a cold start, the pool refills in the background afterwards
+        await ms_token_pool.ready()
         tiktok_config = config["TokenManager"]["tiktok"]
         kwargs = {
             "headers": {
@@ -98,65 +121,141 @@ class TikTokWebCrawler:
 
     # 获取单个作品数据
     async def fetch_one_video(self, itemId: str):
+        # 已确认删除或私密的作品直接失败 / Known deleted or private posts fail fast
+        negative_cache.check(NegativeCache.TIKTOK_ITEM_ID, itemId)
         # 获取TikTok的实时Cookie
         kwargs = await self.get_tiktok_headers()
         # 创建一个基础爬虫
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="tiktok")
         async with base_crawler as crawler:
-            # 创建一个作品详情的BaseModel参数
-            params = PostDetail(itemId=itemId)
+            # 创建一个作品详情的查询参数
+            params = QueryTemplate.of(PostDetail).join(itemId=itemId)
             # 生成一个作品详情的带有加密参数的Endpoint
-            endpoint = BogusManager.model_2_endpoint(
-                TikTokAPIEndpoints.POST_DETAIL, params.dict(), kwargs["headers"]["User-Agent"]
+            endpoint = await signing_service.run(
+                BogusManager.model_2_endpoint,
+                TikTokAPIEndpoints.POST_DETAIL, params, kwargs["headers"]["User-Agent"]
             )
-            response = await crawler.fetch_get_json(endpoint)
+            try:
+                response = await crawler.fetch_get_json(endpoint)
+            except APINotFoundError:
+                negative_cache.add(NegativeCache.TIKTOK_ITEM_ID, itemId, "作品不存在")
+                raise
+
+        # 10204: 作品不存在 / Item doesn't exist
+        if response.get("statusCode") == 10204:
+            reason = response.get("statusMsg") or "作品不存在"
+            negative_cache.add(NegativeCache.TIKTOK_ITEM_ID, itemId, reason)
+            raise APINotFoundError("{0}：{1}".format(reason, itemId))
         return response
 
     # 获取用户的个人信息
     async def fetch_user_profile(self, secUid: str, uniqueId: str):
+        # 已确认不存在或被封禁的用户直接失败 / Known missing or banned users fail fast
+        negative_cache.check(NegativeCache.SEC_USER_ID, secUid)
+        negative_cache.check(NegativeCache.UNIQUE_ID, uniqueId)
         # 获取TikTok的实时Cookie
         kwargs = await self.get_tiktok_headers()
         # 创建一个基础爬虫
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="tiktok")
         async with base_crawler as crawler:
-            # 创建一个用户详情的BaseModel参数
-            params = UserProfile(secUid=secUid, uniqueId=uniqueId)
+            # 创建一个用户详情的查询参数
+            params = QueryTemplate.of(UserProfile).join(secUid=secUid, uniqueId=uniqueId)
             # 生成一个用户详情的带有加密参数的Endpoint
-            endpoint = BogusManager.model_2_endpoint(
-                TikTokAPIEndpoints.USER_DETAIL, params.dict(), kwargs["headers"]["User-Agent"]
+            endpoint = await signing_service.run(
+                BogusManager.model_2_endpoint,
+                TikTokAPIEndpoints.USER_DETAIL, params, kwargs["headers"]["User-Agent"]
             )
-            response = await crawler.fetch_get_json(endpoint)
+            try:
+                response = await crawler.fetch_get_json(endpoint)
+            except APINotFoundError:
+                self._remember_missing_user(secUid, uniqueId, "用户不存在")
+                raise
+
+        # 10202: 用户不存在，10221: 用户已被封禁 / 10202: user doesn't exist, 10221: user is banned
+        if response.get("statusCode") in self._USER_NOT_FOUND_CODES:
+            reason = response.get("statusMsg") or "用户不存在或已被封禁"
+            self._remember_missing_user(secUid, uniqueId, reason)
+            raise APINotFoundError("{0}：{1}".format(reason, secUid or uniqueId))
         return response
 
+    @staticmethod
+    def _remember_missing_user(secUid: str, uniqueId: str, reason: str):
+        negative_cache.add(NegativeCache.SEC_USER_ID, secUid, reason)
+        negative_cache.add(NegativeCache.UNIQUE_ID, uniqueId, reason)
+
     # 获取用户的作品列表
     async def fetch_user_post(self, secUid: str, cursor: int = 0, count: int = 35, coverFormat: int = 2):
         # 获取TikTok的实时Cookie
         kwargs = await self.get_tiktok_headers()
         # proxies = {"http://": 'http://43.159.29.191:24144', "https://": 'http://43.159.29.191:24144'}
         # 创建一个基础爬虫
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="tiktok")
         async with base_crawler as crawler:
-            # 创建一个用户作品的BaseModel参数
-            params = UserPost(secUid=secUid, cursor=cursor, count=count, coverFormat=coverFormat)
+            # 创建一个用户作品的查询参数
+            params = QueryTemplate.of(UserPost).join(secUid=secUid, cursor=cursor, count=count, coverFormat=coverFormat)
             # 生成一个用户作品的带有加密参数的Endpoint
-            endpoint = BogusManager.model_2_endpoint(
-                TikTokAPIEndpoints.USER_POST, params.dict(), kwargs["headers"]["User-Agent"]
+            endpoint = await signing_service.run(
+                BogusManager.model_2_endpoint,
+                TikTokAPIEndpoints.USER_POST, params, kwargs["headers"]["User-Agent"]
             )
             response = await crawler.fetch_get_json(endpoint)
         return response
 
+    # 流式获取用户的作品列表，逐个返回 itemList 中的作品，project 为可选的投影函数，
+    # 传入 envelope 字典时结束后写入 cursor、hasMore 等分页字段
+    # Stream a user's posts one itemList item at a time, optionally projected;
+    # paging fields such as cursor and hasMore are written into `envelope` when given
+    async def stream_user_post(self, secUid: str, cursor: int = 0, count: int = 35, coverFormat: int = 2,
+                               project: Callable[[dict], Any] = None, envelope: dict = None):
+        kwargs = await self.get_tiktok_headers()
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="tiktok")
+        async with base_crawler as crawler:
+            params = QueryTemplate.of(UserPost).join(secUid=secUid, cursor=cursor, count=count, coverFormat=coverFormat)
+            endpoint = await signing_service.run(
+                BogusManager.model_2_endpoint,
+                TikTokAPIEndpoints.USER_POST, params, kwargs["headers"]["User-Agent"]
+            )
+            async for item in crawler.stream_get_json_items(endpoint, "itemList", project):
+                yield item
+            if envelope is not None:
+                envelope.update(crawler.last_envelope or {})
+
+    # 批量获取多个用户的作品列表，整批查询一次签名，再由批量执行器有并发上限地请求，结果与输入顺序一致
+    # Fetch the posts of many users: the whole batch is signed in one go, then requested under the batch
+    # runner's concurrency cap; results keep the input order
+    async def fetch_many_user_post(self, secUids: list, cursor: int = 0, count: int = 35, coverFormat: int = 2) -> list:
+        kwargs = await self.get_tiktok_headers()
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="tiktok")
+        async with base_crawler as crawler:
+            unique_ids = list(dict.fromkeys(secUids))
+            queries = [
+                QueryTemplate.of(UserPost).join(secUid=secUid, cursor=cursor, count=count, coverFormat=coverFormat)
+                for secUid in unique_ids
+            ]
+            endpoints = await signing_service.run_many(
+                BogusManager.sign_many, queries, TikTokAPIEndpoints.USER_POST, kwargs["headers"]["User-Agent"]
+            )
+            endpoints = dict(zip(unique_ids, endpoints))
+
+            async def fetch(secUid: str) -> dict:
+                return await crawler.fetch_get_json(endpoints[secUid])
+
+            results = await batch_runner.run(secUids, fetch)
+        return [result.to_dict() for result in results]
+
     # 获取用户的点赞列表
     async def fetch_user_like(self, secUid: str, cursor: int = 0, count: int = 30, coverFormat: int = 2):
         # 获取TikTok的实时Cookie
         kwargs = await self.get_tiktok_headers()
         # 创建一个基础爬虫
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="tiktok")
         async with base_crawler as crawler:
-            # 创建一个用户点赞的BaseModel参数
-            params = UserLike(secUid=secUid, cursor=cursor, count=count, coverFormat=coverFormat)
+            # 创建一个用户点赞的查询参数
+            params = QueryTemplate.of(UserLike).join(secUid=secUid, cursor=cursor, count=count, coverFormat=coverFormat)
             # 生成一个用户点赞的带有加密参数的Endpoint
-            endpoint = BogusManager.model_2_endpoint(
-                TikTokAPIEndpoints.USER_LIKE, params.dict(), kwargs["headers"]["User-Agent"]
+            endpoint = await signing_service.run(
+                BogusManager.model_2_endpoint,
+                TikTokAPIEndpoints.USER_LIKE, params, kwargs["headers"]["User-Agent"]
             )
             response = await crawler.fetch_get_json(endpoint)
         return response
@@ -170,11 +269,14 @@ class TikTokWebCrawler:
         # 创建一个基础爬虫
         base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
         async with base_crawler as crawler:
-            # 创建一个用户收藏的BaseModel参数
-            params = UserCollect(cookie=cookie, secUid=secUid, cursor=cursor, count=count, coverFormat=coverFormat)
+            # 创建一个用户收藏的查询参数
+            params = QueryTemplate.of(UserCollect).join(
+                cookie=cookie, secUid=secUid, cursor=cursor, count=count, coverFormat=coverFormat
+            )
             # 生成一个用户收藏的带有加密参数的Endpoint
-            endpoint = BogusManager.model_2_endpoint(
-                TikTokAPIEndpoints.USER_COLLECT, params.dict(), kwargs["headers"]["User-Agent"]
+            endpoint = await signing_service.run(
+                BogusManager.model_2_endpoint,
+                TikTokAPIEndpoints.USER_COLLECT, params, kwargs["headers"]["User-Agent"]
             )
             response = await crawler.fetch_get_json(endpoint)
         return response
@@ -184,13 +286,14 @@ class TikTokWebCrawler:
         # 获取TikTok的实时Cookie
         kwargs = await self.get_tiktok_headers()
         # 创建一个基础爬虫
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="tiktok")
         async with base_crawler as crawler:
-            # 创建一个用户播放列表的BaseModel参数
-            params = UserPlayList(secUid=secUid, cursor=cursor, count=count)
+            # 创建一个用户播放列表的查询参数
+            params = QueryTemplate.of(UserPlayList).join(secUid=secUid, cursor=cursor, count=count)
             # 生成一个用户播放列表的带有加密参数的Endpoint
-            endpoint = BogusManager.model_2_endpoint(
-                TikTokAPIEndpoints.USER_PLAY_LIST, params.dict(), kwargs["headers"]["User-Agent"]
+            endpoint = await signing_service.run(
+                BogusManager.model_2_endpoint,
+                TikTokAPIEndpoints.USER_PLAY_LIST, params, kwargs["headers"]["User-Agent"]
             )
             response = await crawler.fetch_get_json(endpoint)
         return response
@@ -200,13 +303,14 @@ class TikTokWebCrawler:
         # 获取TikTok的实时Cookie
         kwargs = await self.get_tiktok_headers()
         # 创建一个基础爬虫
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="tiktok")
         async with base_crawler as crawler:
-            # 创建一个用户合辑的BaseModel参数
-            params = UserMix(mixId=mixId, cursor=cursor, count=count)
+            # 创建一个用户合辑的查询参数
+            params = QueryTemplate.of(UserMix).join(mixId=mixId, cursor=cursor, count=count)
             # 生成一个用户合辑的带有加密参数的Endpoint
-            endpoint = BogusManager.model_2_endpoint(
-                TikTokAPIEndpoints.USER_MIX, params.dict(), kwargs["headers"]["User-Agent"]
+            endpoint = await signing_service.run(
+                BogusManager.model_2_endpoint,
+                TikTokAPIEndpoints.USER_MIX, params, kwargs["headers"]["User-Agent"]
             )
             response = await crawler.fetch_get_json(endpoint)
         return response
@@ -217,13 +321,16 @@ class TikTokWebCrawler:
         kwargs = await self.get_tiktok_headers()
         # proxies = {"http://": 'http://43.159.18.174:25263', "https://": 'http://43.159.18.174:25263'}
         # 创建一个基础爬虫
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="tiktok")
         async with base_crawler as crawler:
-            # 创建一个作品评论的BaseModel参数
-            params = PostComment(aweme_id=aweme_id, cursor=cursor, count=count, current_region=current_region)
+            # 创建一个作品评论的查询参数
+            params = QueryTemplate.of(PostComment).join(
+                aweme_id=aweme_id, cursor=cursor, count=count, current_region=current_region
+            )
             # 生成一个作品评论的带有加密参数的Endpoint
-            endpoint = BogusManager.model_2_endpoint(
-                TikTokAPIEndpoints.POST_COMMENT, params.dict(), kwargs["headers"]["User-Agent"]
+            endpoint = await signing_service.run(
+                BogusManager.model_2_endpoint,
+                TikTokAPIEndpoints.POST_COMMENT, params, kwargs["headers"]["User-Agent"]
             )
             response = await crawler.fetch_get_json(endpoint)
         return response
@@ -234,14 +341,16 @@ class TikTokWebCrawler:
         # 获取TikTok的实时Cookie
         kwargs = await self.get_tiktok_headers()
         # 创建一个基础爬虫
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="tiktok")
         async with base_crawler as crawler:
-            # 创建一个作品评论的BaseModel参数
-            params = PostCommentReply(item_id=item_id, comment_id=comment_id, cursor=cursor, count=count,
-                                      current_region=current_region)
+            # 创建一个作品评论的查询参数
+            params = QueryTemplate.of(PostCommentReply).join(
+                item_id=item_id, comment_id=comment_id, cursor=cursor, count=count, current_region=current_region
+            )
             # 生成一个作品评论的带有加密参数的Endpoint
-            endpoint = BogusManager.model_2_endpoint(
-                TikTokAPIEndpoints.POST_COMMENT_REPLY, params.dict(), kwargs["headers"]["User-Agent"]
+            endpoint = await signing_service.run(
+                BogusManager.model_2_endpoint,
+                TikTokAPIEndpoints.POST_COMMENT_REPLY, params, kwargs["headers"]["User-Agent"]
             )
             response = await crawler.fetch_get_json(endpoint)
         return response
@@ -251,13 +360,14 @@ class TikTokWebCrawler:
         # 获取TikTok的实时Cookie
         kwargs = await self.get_tiktok_headers()
         # 创建一个基础爬虫
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="tiktok")
         async with base_crawler as crawler:
-            # 创建一个用户关注的BaseModel参数
-            params = UserFans(secUid=secUid, count=count, maxCursor=maxCursor, minCursor=minCursor)
+            # 创建一个用户关注的查询参数
+            params = QueryTemplate.of(UserFans).join(secUid=secUid, count=count, maxCursor=maxCursor, minCursor=minCursor)
             # 生成一个用户关注的带有加密参数的Endpoint
-            endpoint = BogusManager.model_2_endpoint(
-                TikTokAPIEndpoints.USER_FANS, params.dict(), kwargs["headers"]["User-Agent"]
+            endpoint = await signing_service.run(
+                BogusManager.model_2_endpoint,
+                TikTokAPIEndpoints.USER_FANS, params, kwargs["headers"]["User-Agent"]
             )
             response = await crawler.fetch_get_json(endpoint)
         return response
@@ -267,13 +377,14 @@ class TikTokWebCrawler:
         # 获取TikTok的实时Cookie
         kwargs = await self.get_tiktok_headers()
         # 创建一个基础爬虫
-        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"])
+        base_crawler = BaseCrawler(proxies=kwargs["proxies"], crawler_headers=kwargs["headers"], platform="tiktok")
         async with base_crawler as crawler:
-            # 创建一个用户关注的BaseModel参数
-            params = UserFollow(secUid=secUid, count=count, maxCursor=maxCursor, minCursor=minCursor)
+            # 创建一个用户关注的查询参数
+            params = QueryTemplate.of(UserFollow).join(secUid=secUid, count=count, maxCursor=maxCursor, minCursor=minCursor)
             # 生成一个用户关注的带有加密参数的Endpoint
-            endpoint = BogusManager.model_2_endpoint(
-                TikTokAPIEndpoints.USER_FOLLOW, params.dict(), kwargs["headers"]["User-Agent"]
+            endpoint = await signing_service.run(
+                BogusManager.model_2_endpoint,
+                TikTokAPIEndpoints.USER_FOLLOW, params, kwargs["headers"]["User-Agent"]
             )
             response = await crawler.fetch_get_json(endpoint)
         return response
@@ -283,20 +394,20 @@ class TikTokWebCrawler:
     # 生成真实msToken
     async def fetch_real_msToken(self):
         result = {
-            "msToken": TokenManager().gen_real_msToken()
+            "msToken": await ms_token_pool.get()
         }
         return result
 
     # 生成ttwid
     async def gen_ttwid(self, cookie: str):
         result = {
-            "ttwid": TokenManager().gen_ttwid(cookie)
+            "ttwid": await asyncio.to_thread(TokenManager.gen_ttwid, cookie)
         }
         return result
 
     # 生成xbogus
     async def gen_xbogus(self, url: str, user_agent: str):
-        url = BogusManager.xb_str_2_endpoint(user_agent, url)
+        url = await signing_service.run(BogusManager.xb_str_2_endpoint, user_agent, url)
         result = {
             "url": url,
             "x_bogus": url.split("&X-Bogus=")[1],
@@ -103,3 +103,10 @@ class APIRetryExhaustedError(APIError):
 
     def display_error(self):
         return f"API Retry Exhausted Error: {self.args[0]}."
+
+
+class APIDataMismatchError(APIError):
+    """当API返回的数据与请求的对象不一致时抛出，通常是暂时性的，可以重试"""
+
+    def display_error(self):
+        return f"API Data Mismatch Error: {self.args[0]}."
@@ -0,0 +1,194 @@
+# ==============================================================================
+# Copyright (C) 2021 Evil0ctal
+#
+# This file is part of the Douyin_TikTok_Download_API project.
+#
+# This project is licensed under the Apache License 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+# 　　　　 　　  ＿＿
+# 　　　 　　 ／＞　　フ
+# 　　　 　　| 　_　 _ l
+# 　 　　 　／` ミ＿xノ
+# 　　 　 /　　　 　 |       Feed me Stars ⭐
+# 　　　 /　 ヽ　　 ﾉ
+# 　 　 │　　|　|　|
+# 　／￣|　　 |　|　|
+# 　| (￣ヽ＿_ヽ_)__)
+# 　＼二つ
+# ==============================================================================
+#
+# Contributor Link:
+# - https://github.com/Evil0ctal
+# - https://github.com/Johnserf-Seed
+#
+# ==============================================================================
+
+
+import asyncio
+import os
+from typing import Any, AsyncIterator, Awaitable, Callable, Hashable, Iterable, Optional, Tuple
+
+import yaml
+
+from crawlers.utils.api_exceptions import APIError
+
+# 配置文件路径
+path = os.path.abspath(os.path.dirname(__file__))
+
+# 读取配置文件
+with open(f"{path}/config.yaml", "r", encoding="utf-8") as f:
+    config = yaml.safe_load(f)
+
+
+class BatchResult:
+    """
+    批量任务中单项的结果 (Result of a single item in a batch)
+
+    成功时 data 为返回值，失败时 error 记录异常，单项失败不影响其余项。
+    (data holds the return value on success and error the exception on failure;
+    one failed item does not affect the others.)
+    """
+
+    __slots__ = ("input", "data", "error")
+
+    def __init__(self, input: Any, data: Any = None, error: Optional[BaseException] = None):
+        self.input = input
+        self.data = data
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @staticmethod
+    def describe_error(error: BaseException) -> dict:
+        """将异常转换为可序列化的错误对象 (Convert an exception into a serializable error object)"""
+        if isinstance(error, APIError) and error.args:
+            message = error.display_error()
+        else:
+            message = str(error) or error.__class__.__name__
+        return {"type": error.__class__.__name__, "message": message}
+
+    def to_dict(self) -> dict:
+        return {
+            "input": self.input,
+            "data": self.data,
+            "error": None if self.error is None else self.describe_error(self.error),
+        }
+
+    def __repr__(self):
+        return "BatchResult(input={0!r}, data={1!r}, error={2!r})".format(self.input, self.data, self.error)
+
+
+class BatchRunner:
+    """
+    有并发上限的批量执行器 (Batch runner with a concurrency cap)
+
+    相同的输入只执行一次，每批最多同时执行 concurrency 个任务，每项的异常单独记录在结果中。
+    (Identical inputs run once, at most concurrency items of a batch run at the
+    same time, and each item's exception is recorded in its own result.)
+    """
+
+    def __init__(self, concurrency: int = 16, max_items: int = 1000):
+        if concurrency < 1:
+            raise ValueError("并发上限必须大于0：{0}".format(concurrency))
+
+        self.concurrency = concurrency
+        self.max_items = max_items
+
+        self.batches = 0
+        self.items = 0
+        self.deduplicated = 0
+        self.failed = 0
+
+    async def stream(
+            self,
+            inputs: Iterable,
+            func: Callable[[Any], Awaitable[Any]],
+            key: Callable[[Any], Hashable] = None,
+            concurrency: int = None,
+    ) -> AsyncIterator[Tuple[int, BatchResult]]:
+        """按完成顺序逐项产出结果 (Yield results one by one in completion order)
+
+        重复的输入会在其结果完成时一并产出。提前停止迭代会取消未完成的任务。
+        (Duplicate inputs are yielded together when their shared result completes.
+        Stopping the iteration early cancels the unfinished tasks.)
+
+        Args:
+            inputs (Iterable): 输入列表 (Inputs)
+            func (Callable): 处理单项的协程函数 (Coroutine function for one item)
+            key (Callable): 去重键，默认为输入本身 (Deduplication key, the input itself by default)
+            concurrency (int): 本批的并发上限，默认使用配置值 (Concurrency cap of this batch, the configured one by default)
+
+        Returns:
+            AsyncIterator[Tuple[int, BatchResult]]: 输入下标与结果 (Input index and result)
+        """
+        inputs = list(inputs)
+        if self.max_items and len(inputs) > self.max_items:
+            raise ValueError("单批最多 {0} 项，当前 {1} 项".format(self.max_items, len(inputs)))
+
+        # 按去重键分组，记录每组对应的输入下标 / Group inputs by key and keep their indexes
+        groups: "dict[Hashable, list]" = {}
+        for index, item in enumerate(inputs):
+            groups.setdefault(key(item) if key else item, []).append(index)
+
+        self.batches += 1
+        self.items += len(inputs)
+        self.deduplicated += len(inputs) - len(groups)
+
+        semaphore = asyncio.Semaphore(concurrency or self.concurrency)
+
+        async def run(indexes: list):
+            async with semaphore:
+                try:
+                    return indexes, await func(inputs[indexes[0]]), None
+                except Exception as e:
+                    self.failed += 1
+                    return indexes, None, e
+
+        tasks = [asyncio.ensure_future(run(indexes)) for indexes in groups.values()]
+        try:
+            for future in asyncio.as_completed(tasks):
+                indexes, data, error = await future
+                for index in indexes:
+                    yield index, BatchResult(inputs[index], data, error)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def run(
+            self,
+            inputs: Iterable,
+            func: Callable[[Any], Awaitable[Any]],
+            key: Callable[[Any], Hashable] = None,
+            concurrency: int = None,
+    ) -> "list[BatchResult]":
+        """执行整批任务，结果与输入顺序一致 (Run the whole batch, results keep the input order)"""
+        inputs = list(inputs)
+        results: "list[Optional[BatchResult]]" = [None] * len(inputs)
+        async for index, result in self.stream(inputs, func, key=key, concurrency=concurrency):
+            results[index] = result
+        return results
+
+    def stats(self) -> dict:
+        """获取批量执行状态 (Get batch runner statistics)"""
+        return {
+            "concurrency": self.concurrency,
+            "batches": self.batches,
+            "items": self.items,
+            "deduplicated": self.deduplicated,
+            "failed": self.failed,
+        }
+
+
+# 进程级共享实例 (Process-wide shared instance)
+batch_runner = BatchRunner(**config.get("BatchRunner", {}))
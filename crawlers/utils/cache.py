@@ -0,0 +1,292 @@
+# ==============================================================================
+# Copyright (C) 2021 Evil0ctal
+#
+# This file is part of the Douyin_TikTok_Download_API project.
+#
+# This project is licensed under the Apache License 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+# 　　　　 　　  ＿＿
+# 　　　 　　 ／＞　　フ
+# 　　　 　　| 　_　 _ l
+# 　 　　 　／` ミ＿xノ
+# 　　 　 /　　　 　 |       Feed me Stars ⭐
+# 　　　 /　 ヽ　　 ﾉ
+# 　 　 │　　|　|　|
+# 　／￣|　　 |　|　|
+# 　| (￣ヽ＿_ヽ_)__)
+# 　＼二つ
+# ==============================================================================
+#
+# Contributor Link:
+# - https://github.com/Evil0ctal
+# - https://github.com/Johnserf-Seed
+#
+# ==============================================================================
+
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import yaml
+
+from crawlers.utils.disk_cache import DiskCache
+from crawlers.utils.logger import logger
+
+# 配置文件路径
+path = os.path.abspath(os.path.dirname(__file__))
+
+# 读取配置文件
+with open(f"{path}/config.yaml", "r", encoding="utf-8") as f:
+    config = yaml.safe_load(f)
+
+
+def endpoint_path(url: str) -> str:
+    """去掉查询参数，得到用于匹配TTL的端点路径 (Drop the query to get the endpoint path used for TTL lookup)"""
+    parts = urlsplit(url)
+    return "{0}{1}".format(parts.netloc.lower(), parts.path.rstrip("/"))
+
+
+def first_page(cursor_param: str) -> Callable[[str], bool]:
+    """
+    生成判断URL是否请求第一页的函数，游标为0或缺省时即最新内容
+    (Build a predicate telling whether a URL asks for the first page, i.e. the latest items when the cursor is 0 or absent)
+
+    Args:
+        cursor_param (str): 游标参数名 (Name of the cursor parameter)
+
+    Returns:
+        Callable: 接受URL的判断函数 (Predicate taking a URL)
+    """
+
+    def check(url: str) -> bool:
+        values = parse_qs(urlsplit(url).query).get(cursor_param)
+        return not values or values[0] in ("", "0")
+
+    return check
+
+
+class CacheEntry:
+    """
+    缓存条目 (Cache entry)
+    """
+
+    __slots__ = ("value", "size", "expires_at", "stale_until")
+
+    def __init__(self, value: Any, size: int, ttl: float, stale_ttl: float):
+        now = time.monotonic()
+        self.value = value
+        self.size = size
+        self.expires_at = now + ttl
+        self.stale_until = self.expires_at + stale_ttl
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.expires_at
+
+    def is_usable(self, now: float) -> bool:
+        return now < self.stale_until
+
+
+class ResponseCache:
+    """
+    带TTL的LRU响应缓存，支持过期后先返回旧值再后台刷新
+    (LRU response cache with TTLs and stale-while-revalidate)
+
+    TTL 按端点路径注册，未注册的端点不缓存；条目数和总字节数均有上限。
+    (TTLs are registered per endpoint path and unregistered endpoints are not
+    cached; both the entry count and the total byte size are bounded.)
+    """
+
+    def __init__(
+            self,
+            enable: bool = True,
+            max_entries: int = 2048,
+            max_bytes: int = 64 * 1024 * 1024,
+            stale_ttl: float = 60,
+            disk: dict = None,
+    ):
+        self.enable = enable
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stale_ttl = stale_ttl
+        self._ttls: "dict[str, float]" = {}
+        self._validators: "dict[str, Callable[[Any], bool]]" = {}
+        self._bypasses: "dict[str, Callable[[str], bool]]" = {}
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._refreshing: "dict[Hashable, asyncio.Task]" = {}
+        self._writes: "set[asyncio.Task]" = set()
+        # 可选的磁盘二级缓存 / Optional on-disk second level
+        disk = dict(disk or {})
+        self.disk = DiskCache(**disk) if enable and disk.pop("enable", False) else None
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def register(
+            self,
+            endpoint: str,
+            ttl: float,
+            validate: Callable[[Any], bool] = None,
+            bypass: Callable[[str], bool] = None,
+    ):
+        """注册端点的缓存时间 (Register the cache TTL of an endpoint)
+
+        Args:
+            endpoint (str): 端点URL，查询参数会被忽略 (Endpoint URL, the query is ignored)
+            ttl (float): 缓存秒数 (TTL in seconds)
+            validate (Callable): 判断响应是否可缓存的函数 (Predicate deciding whether a payload may be cached)
+            bypass (Callable): 对完整URL返回True时不使用缓存，例如轮询最新内容的第一页
+            (Predicate on the full URL that skips the cache when True, e.g. first pages polled for the latest items)
+        """
+        key = endpoint_path(endpoint)
+        self._ttls[key] = ttl
+        if validate is not None:
+            self._validators[key] = validate
+        if bypass is not None:
+            self._bypasses[key] = bypass
+
+    def accepts(self, url: str, value: Any) -> bool:
+        """按端点注册的校验函数判断响应是否可缓存 (Check a payload against the endpoint's validator)"""
+        validate = self._validators.get(endpoint_path(url))
+        return validate is None or bool(validate(value))
+
+    def ttl_for(self, url: str) -> Optional[float]:
+        """获取URL对应端点的缓存时间，不缓存时返回None (Get the TTL for a URL, None if it is not cached)"""
+        if not self.enable:
+            return None
+        key = endpoint_path(url)
+        bypass = self._bypasses.get(key)
+        if bypass is not None and bypass(url):
+            return None
+        return self._ttls.get(key)
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        """获取可用的缓存条目，包括已过期但仍在宽限期内的 (Get a usable entry, including stale ones within the grace period)"""
+        return self._count(self._lookup(key))
+
+    async def aget(self, key: Hashable) -> Optional[CacheEntry]:
+        """先查内存再查磁盘，磁盘命中后提升到内存 (Check memory then disk, promoting disk hits into memory)"""
+        entry = self._lookup(key)
+        if entry is None and self.disk is not None:
+            cached = await self.disk.get(key)
+            if cached is not None:
+                value, size, expires_at, stale_until = cached
+                # 磁盘使用墙钟时间，换算为剩余秒数 / The disk stores wall-clock times, convert to remaining seconds
+                entry = CacheEntry(value, size, expires_at - time.time(), stale_until - expires_at)
+                self._store(key, entry)
+        return self._count(entry)
+
+    def _lookup(self, key: Hashable) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if not entry.is_usable(time.monotonic()):
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _count(self, entry: Optional[CacheEntry]) -> Optional[CacheEntry]:
+        if entry is None:
+            self.misses += 1
+        elif entry.is_fresh(time.monotonic()):
+            self.hits += 1
+        else:
+            self.stale_hits += 1
+        return entry
+
+    def set(self, key: Hashable, value: Any, ttl: float, size: int = 0):
+        """写入缓存并按LRU淘汰 (Store a value and evict in LRU order)
+
+        Args:
+            key (Hashable): 缓存键 (Cache key)
+            value (Any): 缓存值，调用方不应修改 (Cached value, must not be mutated by callers)
+            ttl (float): 缓存秒数 (TTL in seconds)
+            size (int): 估算的字节数 (Estimated size in bytes)
+        """
+        if size > self.max_bytes:
+            return
+        self._store(key, CacheEntry(value, size, ttl, self.stale_ttl))
+
+        if self.disk is not None:
+            task = asyncio.ensure_future(self.disk.set(key, value, ttl, self.stale_ttl))
+            self._writes.add(task)
+            task.add_done_callback(self._writes.discard)
+
+    def _store(self, key: Hashable, entry: CacheEntry):
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = entry
+        self._bytes += entry.size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def refresh(self, key: Hashable, func: Callable[[], Awaitable[Any]]):
+        """后台刷新过期条目，同一个键同时只刷新一次 (Refresh a stale entry in the background, once per key at a time)
+
+        Args:
+            key (Hashable): 缓存键 (Cache key)
+            func (Callable): 重新获取并写入缓存的协程函数 (Coroutine function that refetches and stores the value)
+        """
+        if key in self._refreshing:
+            return
+
+        async def run():
+            try:
+                await func()
+            except Exception as e:
+                # 刷新失败时保留旧值直到宽限期结束 / Keep serving the stale value until the grace period ends
+                logger.warning("后台刷新缓存失败：{0}".format(e))
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.ensure_future(run())
+
+    def clear(self):
+        """清空内存缓存 (Clear the in-memory cache)"""
+        self._entries.clear()
+        self._bytes = 0
+
+    async def aclose(self):
+        """等待未完成的磁盘写入并关闭磁盘缓存 (Wait for pending disk writes and close the disk cache)"""
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+        if self.disk is not None:
+            self.disk.close()
+
+    def stats(self) -> dict:
+        """获取缓存状态 (Get cache statistics)"""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "disk": self.disk.stats() if self.disk is not None else None,
+        }
+
+
+# 进程级共享实例 (Process-wide shared instance)
+response_cache = ResponseCache(**config.get("ResponseCache", {}))
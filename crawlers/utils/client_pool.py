@@ -0,0 +1,178 @@
+# ==============================================================================
+# Copyright (C) 2021 Evil0ctal
+#
+# This file is part of the Douyin_TikTok_Download_API project.
+#
+# This project is licensed under the Apache License 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+# 　　　　 　　  ＿＿
+# 　　　 　　 ／＞　　フ
+# 　　　 　　| 　_　 _ l
+# 　 　　 　／` ミ＿xノ
+# 　　 　 /　　　 　 |       Feed me Stars ⭐
+# 　　　 /　 ヽ　　 ﾉ
+# 　 　 │　　|　|　|
+# 　／￣|　　 |　|　|
+# 　| (￣ヽ＿_ヽ_)__)
+# 　＼二つ
+# ==============================================================================
+#
+# Contributor Link:
+# - https://github.com/Evil0ctal
+# - https://github.com/Johnserf-Seed
+#
+# ==============================================================================
+
+import asyncio
+import os
+from collections import OrderedDict
+
+import httpx
+import yaml
+
+from crawlers.utils.logger import logger
+
+# 配置文件路径
+path = os.path.abspath(os.path.dirname(__file__))
+
+# 读取配置文件
+with open(f"{path}/config.yaml", "r", encoding="utf-8") as f:
+    config = yaml.safe_load(f)
+
+
+class ClientPool:
+    """
+    进程级共享的异步HTTP客户端池 (Process-wide shared async HTTP client pool)
+
+    按 (平台, 代理, 请求头) 缓存长连接客户端，避免每次请求都重新建立TLS连接。
+    (Caches keep-alive clients by (platform, proxies, headers) so that requests
+    do not pay for a new TLS handshake every time.)
+
+    爬虫实例按请求创建，同时进行的请求数也按平台在这里限制。
+    (Crawlers are created per request, so the cap on concurrent requests lives here, per platform.)
+    """
+
+    def __init__(
+            self,
+            max_clients: int = 32,
+            max_connections: int = 100,
+            max_keepalive_connections: int = 20,
+            keepalive_expiry: float = 30,
+            retries: int = 3,
+            timeout: float = 10,
+            max_tasks: int = 50,
+    ):
+        self._max_clients = max_clients
+        self._max_tasks = max_tasks
+        self._retries = retries
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(timeout)
+        self._clients: "OrderedDict[tuple, httpx.AsyncClient]" = OrderedDict()
+        self._semaphores = {}
+
+    @staticmethod
+    def make_key(platform: str, proxies: dict = None, headers: dict = None) -> tuple:
+        """生成客户端缓存键 (Build the client cache key)
+
+        Args:
+            platform (str): 平台名称 (Platform name)
+            proxies (dict): 代理配置 (Proxy configuration)
+            headers (dict): 请求头 (Request headers)
+
+        Returns:
+            tuple: 可哈希的缓存键 (Hashable cache key)
+        """
+        proxy_key = tuple(sorted((proxies or {}).items(), key=lambda i: i[0]))
+        header_key = tuple(sorted((headers or {}).items(), key=lambda i: i[0].lower()))
+        return platform, proxy_key, header_key
+
+    def get_client(self, platform: str, proxies: dict = None, headers: dict = None) -> httpx.AsyncClient:
+        """获取共享客户端，不存在时创建 (Get a shared client, creating it if needed)
+
+        Args:
+            platform (str): 平台名称 (Platform name)
+            proxies (dict): 代理配置 (Proxy configuration)
+            headers (dict): 请求头 (Request headers)
+
+        Returns:
+            httpx.AsyncClient: 共享的异步客户端 (Shared async client)
+        """
+        key = self.make_key(platform, proxies, headers)
+        client = self._clients.get(key)
+        if client is not None and not client.is_closed:
+            self._clients.move_to_end(key)
+            return client
+
+        client = httpx.AsyncClient(
+            headers=headers or {},
+            proxies=proxies,
+            timeout=self.timeout,
+            limits=self.limits,
+            transport=httpx.AsyncHTTPTransport(retries=self._retries, limits=self.limits),
+        )
+        self._clients[key] = client
+        logger.info("创建共享HTTP客户端：{0}，当前客户端数：{1}".format(platform, len(self._clients)))
+
+        while len(self._clients) > self._max_clients:
+            _, evicted = self._clients.popitem(last=False)
+            self._close_later(evicted)
+
+        return client
+
+    def get_semaphore(self, platform: str) -> asyncio.Semaphore:
+        """获取平台共享的并发信号量 (Get the concurrency semaphore shared by a platform)
+
+        Args:
+            platform (str): 平台名称 (Platform name)
+
+        Returns:
+            asyncio.Semaphore: 限制该平台同时进行的请求数 (Caps concurrent requests to the platform)
+        """
+        semaphore = self._semaphores.get(platform)
+        if semaphore is None:
+            semaphore = self._semaphores[platform] = asyncio.Semaphore(self._max_tasks)
+        return semaphore
+
+    def _close_later(self, client: httpx.AsyncClient):
+        """在超时时间后关闭被淘汰的客户端，让进行中的请求先完成
+        (Close an evicted client after the timeout so in-flight requests can finish)
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        delay = self.timeout.read or 10
+        loop.call_later(delay, lambda: loop.create_task(client.aclose()))
+
+    def stats(self) -> dict:
+        """获取客户端池状态 (Get client pool statistics)"""
+        return {
+            "clients": len(self._clients),
+            "max_clients": self._max_clients,
+            "max_tasks": self._max_tasks,
+            "platforms": sorted({key[0] for key in self._clients}),
+        }
+
+    async def aclose(self):
+        """关闭所有共享客户端 (Close all shared clients)"""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
+
+
+# 进程级共享实例 (Process-wide shared instance)
+client_pool = ClientPool(**config.get("ClientPool", {}))
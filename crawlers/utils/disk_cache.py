@@ -0,0 +1,199 @@
+# ==============================================================================
+# Copyright (C) 2021 Evil0ctal
+#
+# This file is part of the Douyin_TikTok_Download_API project.
+#
+# This project is licensed under the Apache License 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+# 　　　　 　　  ＿＿
+# 　　　 　　 ／＞　　フ
+# 　　　 　　| 　_　 _ l
+# 　 　　 　／` ミ＿xノ
+# 　　 　 /　　　 　 |       Feed me Stars ⭐
+# 　　　 /　 ヽ　　 ﾉ
+# 　 　 │　　|　|　|
+# 　／￣|　　 |　|　|
+# 　| (￣ヽ＿_ヽ_)__)
+# 　＼二つ
+# ==============================================================================
+#
+# Contributor Link:
+# - https://github.com/Evil0ctal
+# - https://github.com/Johnserf-Seed
+#
+# ==============================================================================
+
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Hashable, Optional, Tuple
+
+import lz4.frame
+
+from crawlers.utils import json_codec
+from crawlers.utils.logger import logger
+
+
+class DiskCache:
+    """
+    基于SQLite的二级响应缓存，数据使用lz4压缩 (SQLite-backed second-level response cache, compressed with lz4)
+
+    进程重启后仍然有效，总大小超过配额时按最近访问时间淘汰。
+    (Survives restarts and evicts by last access time once the quota is exceeded.)
+    """
+
+    def __init__(self, path: str = "cache/response_cache.db", max_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._bytes = 0
+
+    @staticmethod
+    def make_key(key: Hashable) -> str:
+        """将内存缓存键转换为稳定的字符串，请求头中的Cookie不会明文落盘
+        (Turn a memory cache key into a stable string so cookies in headers never hit the disk in clear text)
+        """
+        return hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires_at REAL NOT NULL,
+                    stale_until REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed_at ON responses (accessed_at)")
+            conn.execute("DELETE FROM responses WHERE stale_until < ?", (time.time(),))
+            conn.commit()
+            self._bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    def _get(self, key: str) -> Optional[Tuple[Any, int, float, float]]:
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, expires_at, stale_until FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            now = time.time()
+            if row[2] < now:
+                self._delete(conn, key)
+                conn.commit()
+                return None
+
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+
+        data = lz4.frame.decompress(row[0])
+        return json_codec.loads(data), len(data), row[1], row[2]
+
+    def _set(self, key: str, value: Any, ttl: float, stale_ttl: float):
+        blob = lz4.frame.compress(json_codec.dumps(value))
+        if len(blob) > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            self._delete(conn, key)
+            conn.execute(
+                "INSERT INTO responses (key, value, size, expires_at, stale_until, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now + ttl, now + ttl + stale_ttl, now),
+            )
+            self._bytes += len(blob)
+            if self._bytes > self.max_bytes:
+                self._evict(conn)
+            conn.commit()
+
+    def _delete(self, conn: sqlite3.Connection, key: str):
+        row = conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._bytes -= row[0]
+
+    def _evict(self, conn: sqlite3.Connection):
+        """先删除过期条目，再按最近访问时间淘汰到配额的90% (Drop expired rows, then evict by access time down to 90% of the quota)"""
+        conn.execute("DELETE FROM responses WHERE stale_until < ?", (time.time(),))
+        self._bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+        target = self.max_bytes * 0.9
+        if self._bytes <= target:
+            return
+
+        evicted = []
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            evicted.append((key,))
+            self._bytes -= size
+            if self._bytes <= target:
+                break
+        conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        logger.info("磁盘缓存超出配额，淘汰 {0} 条记录".format(len(evicted)))
+
+    async def get(self, key: Hashable) -> Optional[Tuple[Any, int, float, float]]:
+        """读取缓存 (Read from the cache)
+
+        Args:
+            key (Hashable): 内存缓存键 (Memory cache key)
+
+        Returns:
+            Optional[tuple]: (值, 解压后字节数, 过期时间戳, 宽限期结束时间戳)，不存在时返回None
+            ((value, uncompressed size, expiry timestamp, end of grace period timestamp), None if absent)
+        """
+        try:
+            return await asyncio.to_thread(self._get, self.make_key(key))
+        except (sqlite3.Error, OSError, ValueError, RuntimeError) as e:
+            logger.warning("读取磁盘缓存失败：{0}".format(e))
+            return None
+
+    async def set(self, key: Hashable, value: Any, ttl: float, stale_ttl: float = 0):
+        """写入缓存 (Write to the cache)
+
+        Args:
+            key (Hashable): 内存缓存键 (Memory cache key)
+            value (Any): 可JSON序列化的值 (JSON-serializable value)
+            ttl (float): 缓存秒数 (TTL in seconds)
+            stale_ttl (float): 过期后的宽限秒数 (Grace period after expiry in seconds)
+        """
+        try:
+            await asyncio.to_thread(self._set, self.make_key(key), value, ttl, stale_ttl)
+        except (sqlite3.Error, OSError, TypeError, ValueError) as e:
+            logger.warning("写入磁盘缓存失败：{0}".format(e))
+
+    def stats(self) -> dict:
+        """获取磁盘缓存状态 (Get disk cache statistics)"""
+        return {"path": self.path, "bytes": self._bytes, "max_bytes": self.max_bytes}
+
+    def close(self):
+        """关闭数据库连接 (Close the database connection)"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
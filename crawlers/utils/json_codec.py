@@ -0,0 +1,304 @@
+# ==============================================================================
+# Copyright (C) 2021 Evil0ctal
+#
+# This file is part of the Douyin_TikTok_Download_API project.
+#
+# This project is licensed under the Apache License 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+# 　　　　 　　  ＿＿
+# 　　　 　　 ／＞　　フ
+# 　　　 　　| 　_　 _ l
+# 　 　　 　／` ミ＿xノ
+# 　　 　 /　　　 　 |       Feed me Stars ⭐
+# 　　　 /　 ヽ　　 ﾉ
+# 　 　 │　　|　|　|
+# 　／￣|　　 |　|　|
+# 　| (￣ヽ＿_ヽ_)__)
+# 　＼二つ
+# ==============================================================================
+#
+# Contributor Link:
+# - https://github.com/Evil0ctal
+# - https://github.com/Johnserf-Seed
+#
+# ==============================================================================
+
+
+import json
+import re
+from typing import Any, Callable, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖 / orjson is an optional dependency
+    orjson = None
+
+# 扫描内嵌JSON时最多检查的字节数 / Maximum number of bytes inspected when scanning for embedded JSON
+MAX_SCAN_BYTES = 32 * 1024 * 1024
+
+# 只用于定位对象结尾的标准库解码器，扫描在C中完成 / Stdlib decoder used only to find where the object ends, the scan runs in C
+_SCANNER = json.JSONDecoder()
+
+
+def _stdlib_loads(data: Union[bytes, str]) -> Any:
+    return json.loads(data)
+
+
+def _orjson_loads(data: Union[bytes, str]) -> Any:
+    return orjson.loads(data)
+
+
+# 可用的解码器，两者在解析失败时都抛出 ValueError 的子类
+# Available decoders, both raise a ValueError subclass on failure
+DECODERS = {"json": _stdlib_loads}
+if orjson is not None:
+    DECODERS["orjson"] = _orjson_loads
+
+
+def get_decoder(backend: str = "auto") -> Callable[[Union[bytes, str]], Any]:
+    """获取JSON解码器 (Get a JSON decoder)
+
+    Args:
+        backend (str): "auto"、"orjson" 或 "json"，auto 在安装了 orjson 时优先使用它
+        ("auto", "orjson" or "json", auto prefers orjson when it is installed)
+
+    Returns:
+        Callable: 接受 bytes 或 str 的解码函数 (Decoder accepting bytes or str)
+    """
+    if backend == "auto":
+        backend = "orjson" if orjson is not None else "json"
+    if backend not in DECODERS:
+        raise ValueError("不可用的JSON解码器：{0}".format(backend))
+    return DECODERS[backend]
+
+
+# 默认解码器 (Default decoder)
+loads = get_decoder()
+
+
+def dumps(value: Any) -> bytes:
+    """编码为紧凑的UTF-8 JSON，安装了 orjson 时使用它 (Encode as compact UTF-8 JSON, using orjson when installed)"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value)
+        except TypeError:
+            # 超出64位的整数、非字符串键等 orjson 不支持的值改用标准库 / Fall back for values orjson rejects, e.g. ints over 64 bits
+            pass
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _skip_string(data: bytes, pos: int, end: int) -> int:
+    """跳过JSON字符串，返回结束引号之后的位置，未闭合时返回-1
+    (Skip a JSON string and return the position after its closing quote, -1 if unterminated)
+    """
+    while True:
+        quote = data.find(b'"', pos, end)
+        if quote < 0:
+            return -1
+        # 引号前连续反斜杠为奇数个时是转义引号 / An odd run of backslashes before the quote escapes it
+        backslashes = 0
+        i = quote - 1
+        while i >= pos and data[i] == 0x5C:
+            backslashes += 1
+            i -= 1
+        if backslashes % 2 == 0:
+            return quote + 1
+        pos = quote + 1
+
+
+def _scan_json_object(data: bytes, max_bytes: int) -> Tuple[Any, Optional[bytes]]:
+    """解码第一个 "{" 开始的JSON对象，返回对象与其字节串 (Decode the JSON object at the first "{", returning it and its bytes)"""
+    start = data.find(b"{")
+    if start < 0:
+        return None, None
+
+    # surrogateescape 保证任意字节都能往返，字符下标可以换算回字节偏移
+    # surrogateescape round-trips any byte, so the character index maps back to a byte offset
+    text = data[start:start + max_bytes].decode("utf-8", "surrogateescape")
+    try:
+        value, end = _SCANNER.raw_decode(text)
+    except ValueError:
+        return None, None
+    return value, data[start:start + len(text[:end].encode("utf-8", "surrogateescape"))]
+
+
+def extract_json_object(data: bytes, max_bytes: int = MAX_SCAN_BYTES) -> Optional[bytes]:
+    """从混杂内容中截取第一个完整的JSON对象 (Cut the first complete JSON object out of mixed content)
+
+    由标准库的C解码器从第一个 "{" 开始解析，在对象结束处停下，正确处理字符串中的括号与转义，
+    耗时与对象长度成线性且扫描长度有上限。
+    (The stdlib C decoder parses from the first "{" and stops where the object
+    ends, so braces and escapes inside strings are handled exactly; the cost is
+    linear in the object size and the scan is bounded.)
+
+    Args:
+        data (bytes): 原始响应内容 (Raw response body)
+        max_bytes (int): 最多扫描的字节数 (Maximum number of bytes to scan)
+
+    Returns:
+        Optional[bytes]: JSON对象的字节串，找不到时返回None (Bytes of the JSON object, None if not found)
+    """
+    return _scan_json_object(data, max_bytes)[1]
+
+
+def loads_embedded(data: bytes, decoder: Callable[[Union[bytes, str]], Any] = None,
+                   max_bytes: int = MAX_SCAN_BYTES) -> Any:
+    """解析混有非JSON内容的响应 (Decode a body that has non-JSON content around the object)
+
+    先尝试第一个 "{" 到最后一个 "}" 之间的内容，失败后再从第一个 "{" 解析到对象结束处。
+    (First tries the span from the first "{" to the last "}", then falls back to
+    decoding from the first "{" up to where that object ends.)
+
+    Args:
+        data (bytes): 原始响应内容 (Raw response body)
+        decoder (Callable): JSON解码器，默认使用 loads (JSON decoder, defaults to loads)
+        max_bytes (int): 最多扫描的字节数 (Maximum number of bytes to scan)
+
+    Returns:
+        Any: 解析后的数据 (Decoded data)
+
+    Raises:
+        ValueError: 找不到可解析的JSON对象 (No decodable JSON object was found)
+    """
+    decoder = decoder or loads
+    start = data.find(b"{")
+    if start < 0:
+        raise ValueError("响应中没有JSON对象")
+
+    end = data.rfind(b"}", start, start + max_bytes)
+    try:
+        return decoder(data[start:end + 1])
+    except ValueError:
+        pass
+
+    value, fragment = _scan_json_object(data, max_bytes)
+    if fragment is None:
+        raise ValueError("响应中没有完整的JSON对象")
+    # 标准库解码器已经得到结果，无需再解码一次 / The stdlib decoder already produced the value, skip decoding twice
+    if decoder is _stdlib_loads:
+        return value
+    return decoder(fragment)
+
+
+# 流式解析使用的结构字符 / Structural characters used by the streaming parser
+_STREAM_TOKENS = re.compile(rb'[{}\[\]"]')
+
+
+class JSONArrayStream:
+    """
+    增量解析顶层对象中的数组字段 (Incrementally parse an array field of the top-level object)
+
+    逐块喂入响应内容，每当数组中的一个元素完整到达就立即解码并返回，内存中只保留当前元素。
+    其余顶层字段（游标、has_more等）保存在外层对象中，解析结束后由 close() 返回。
+    (Feed the body chunk by chunk; every element of the array is decoded and
+    returned as soon as it is complete, so only the current element is held in
+    memory. The remaining top-level fields such as cursors and has_more are kept
+    in the envelope that close() returns.)
+
+    数组元素须为对象或数组 (Array elements must be objects or arrays)
+    """
+
+    def __init__(self, field: str, decoder: Callable[[Union[bytes, str]], Any] = None):
+        self.field = field.encode("utf-8")
+        self.decoder = decoder or loads
+        self.count = 0
+        self._buffer = bytearray()
+        self._envelope = bytearray()
+        self._pos = 0
+        self._flushed = 0
+        self._depth = 0
+        self._last_key = None
+        self._in_array = False
+        self._item_start = None
+
+    def feed(self, chunk: bytes) -> list:
+        """喂入一块数据 (Feed one chunk)
+
+        Args:
+            chunk (bytes): 响应内容片段 (Piece of the response body)
+
+        Returns:
+            list: 本次完整解析出的元素 (Elements completed by this chunk)
+        """
+        buffer = self._buffer
+        buffer += chunk
+        items = []
+        pos = self._pos
+
+        while True:
+            match = _STREAM_TOKENS.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+
+            index = match.start()
+            char = buffer[index]
+            if char == 0x22:  # '"'
+                end = _skip_string(buffer, index + 1, len(buffer))
+                if end < 0:
+                    # 字符串未接收完整，等待下一块 / The string is incomplete, wait for the next chunk
+                    pos = index
+                    break
+                if self._depth == 1:
+                    # 顶层 "[" 之前的最后一个字符串一定是它的键 / The last string before a top-level "[" is its key
+                    self._last_key = bytes(buffer[index + 1:end - 1])
+                pos = end
+                continue
+
+            pos = index + 1
+            if char in (0x7B, 0x5B):  # '{' '['
+                if self._depth == 1 and char == 0x5B and self._last_key == self.field:
+                    self._in_array = True
+                    self._envelope += buffer[self._flushed:pos]
+                    self._flushed = pos
+                elif self._in_array and self._depth == 2:
+                    self._item_start = index
+                self._depth += 1
+                continue
+
+            self._depth -= 1  # '}' ']'
+            if self._in_array and self._depth == 2 and self._item_start is not None:
+                items.append(self.decoder(bytes(buffer[self._item_start:pos])))
+                self._item_start = None
+                # 丢弃元素及其后的分隔符 / Drop the element and the separator after it
+                self._flushed = pos
+            elif self._in_array and self._depth == 1:
+                self._in_array = False
+                self._last_key = None
+                # 外层对象中保留空数组 / Keep an empty array in the envelope
+                self._flushed = index
+
+        # 保留未完成的元素或字符串，其余部分移入外层对象或丢弃
+        # Keep the unfinished element or string, move the rest into the envelope or drop it
+        keep = self._item_start if self._item_start is not None else pos
+        if not self._in_array:
+            self._envelope += buffer[self._flushed:keep]
+        del buffer[:keep]
+        self._pos = pos - keep
+        self._flushed = 0
+        if self._item_start is not None:
+            self._item_start = 0
+
+        self.count += len(items)
+        return items
+
+    def close(self) -> Any:
+        """结束解析并返回外层对象，数组字段为空列表 (Finish parsing and return the envelope with an empty array field)
+
+        Raises:
+            ValueError: 响应不完整或不是JSON (The body is incomplete or not JSON)
+        """
+        if self._in_array or self._depth != 0:
+            raise ValueError("JSON响应不完整")
+        self._envelope += self._buffer
+        self._buffer.clear()
+        return self.decoder(bytes(self._envelope))
@@ -0,0 +1,131 @@
+# ==============================================================================
+# Copyright (C) 2021 Evil0ctal
+#
+# This file is part of the Douyin_TikTok_Download_API project.
+#
+# This project is licensed under the Apache License 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+# 　　　　 　　  ＿＿
+# 　　　 　　 ／＞　　フ
+# 　　　 　　| 　_　 _ l
+# 　 　　 　／` ミ＿xノ
+# 　　 　 /　　　 　 |       Feed me Stars ⭐
+# 　　　 /　 ヽ　　 ﾉ
+# 　 　 │　　|　|　|
+# 　／￣|　　 |　|　|
+# 　| (￣ヽ＿_ヽ_)__)
+# 　＼二つ
+# ==============================================================================
+#
+# Contributor Link:
+# - https://github.com/Evil0ctal
+# - https://github.com/Johnserf-Seed
+#
+# ==============================================================================
+
+
+import os
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import yaml
+
+from crawlers.utils.api_exceptions import APINotFoundError
+from crawlers.utils.logger import logger
+
+# 配置文件路径
+path = os.path.abspath(os.path.dirname(__file__))
+
+# 读取配置文件
+with open(f"{path}/config.yaml", "r", encoding="utf-8") as f:
+    config = yaml.safe_load(f)
+
+
+class NegativeCache:
+    """
+    失败结果缓存 (Negative result cache)
+
+    记录已删除/私密的作品、不存在或被封禁的用户、无法解析的短链接等确定不存在的输入，在较短的TTL内直接拒绝重复请求。
+    (Remembers inputs known not to exist, such as deleted or private posts,
+    missing or banned users and unresolvable short links, and rejects repeats for a short TTL.)
+    """
+
+    # 键的类别 (Key kinds)
+    AWEME_ID = "aweme_id"
+    TIKTOK_ITEM_ID = "tiktok_item_id"
+    BV_ID = "bv_id"
+    SEC_USER_ID = "sec_user_id"
+    UNIQUE_ID = "unique_id"
+    SHORT_URL = "short_url"
+
+    def __init__(self, enable: bool = True, ttl: float = 600, max_entries: int = 10000):
+        self.enable = enable
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self.hits = 0
+
+    def get(self, kind: str, value: str) -> Optional[str]:
+        """查询失败原因，未记录或已过期时返回None (Get the recorded failure reason, None if absent or expired)"""
+        key = (kind, value)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        reason, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        return reason
+
+    def check(self, kind: str, value: str):
+        """命中失败缓存时直接抛出异常 (Raise immediately when the input is a known failure)
+
+        Args:
+            kind (str): 键的类别 (Key kind)
+            value (str): 作品ID、用户ID或链接 (Post ID, user ID or link)
+
+        Raises:
+            APINotFoundError: 输入在失败缓存中 (The input is in the negative cache)
+        """
+        if not self.enable:
+            return
+        reason = self.get(kind, value)
+        if reason is not None:
+            self.hits += 1
+            raise APINotFoundError("{0}（已缓存的失败结果 / cached failure）：{1}".format(reason, value))
+
+    def add(self, kind: str, value: str, reason: str, ttl: float = None):
+        """记录失败结果 (Record a failure)
+
+        Args:
+            kind (str): 键的类别 (Key kind)
+            value (str): 作品ID、用户ID或链接 (Post ID, user ID or link)
+            reason (str): 失败原因 (Failure reason)
+            ttl (float): 缓存秒数，默认使用配置值 (TTL in seconds, defaults to the configured value)
+        """
+        if not self.enable or not value:
+            return
+        key = (kind, value)
+        self._entries.pop(key, None)
+        self._entries[key] = (reason, time.monotonic() + (self.ttl if ttl is None else ttl))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        logger.info("记录失败结果 {0}={1}：{2}".format(kind, value, reason))
+
+    def stats(self) -> dict:
+        """获取失败缓存状态 (Get negative cache statistics)"""
+        return {"entries": len(self._entries), "max_entries": self.max_entries, "hits": self.hits}
+
+
+# 进程级共享实例 (Process-wide shared instance)
+negative_cache = NegativeCache(**config.get("NegativeCache", {}))
@@ -0,0 +1,215 @@
+# ==============================================================================
+# Copyright (C) 2021 Evil0ctal
+#
+# This file is part of the Douyin_TikTok_Download_API project.
+#
+# This project is licensed under the Apache License 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+# 　　　　 　　  ＿＿
+# 　　　 　　 ／＞　　フ
+# 　　　 　　| 　_　 _ l
+# 　 　　 　／` ミ＿xノ
+# 　　 　 /　　　 　 |       Feed me Stars ⭐
+# 　　　 /　 ヽ　　 ﾉ
+# 　 　 │　　|　|　|
+# 　／￣|　　 |　|　|
+# 　| (￣ヽ＿_ヽ_)__)
+# 　＼二つ
+# ==============================================================================
+#
+# Contributor Link:
+# - https://github.com/Evil0ctal
+# - https://github.com/Johnserf-Seed
+#
+# ==============================================================================
+
+
+"""
+声明式字段投影 (Declarative field projection)
+
+路径语法 (Path syntax):
+    video.play_addr.url_list[0]          取字典键和列表下标 / dict keys and list indexes
+    images[*].url_list[0]                [*] 对列表的每个元素继续取值 / [*] maps the rest over a list
+    items[-1].id                         支持负下标 / negative indexes are allowed
+
+投影规则是一个字典，值可以是路径、(路径, 转换函数) 或嵌套的规则字典，在导入时编译一次。
+(A spec is a dict whose values are a path, a (path, transform) pair or a nested
+spec; it is compiled once at import time.)
+"""
+
+import functools
+import re
+from typing import Any, Callable, List, Tuple, Union
+
+# 单段路径：键名后跟若干下标 / One path segment: a key followed by any number of indexes
+_SEGMENT = re.compile(r"^([^\[\]]*)((?:\[(?:-?\d+|\*)\])*)$")
+_INDEX = re.compile(r"\[(-?\d+|\*)\]")
+
+# 每个字段参数最多包含的路径数 / Maximum number of paths in one fields parameter
+MAX_FIELDS = 64
+
+
+def parse_path(path: str) -> List[Tuple[str, Any]]:
+    """将路径解析为步骤列表 (Parse a path into a list of steps)
+
+    Args:
+        path (str): 字段路径 (Field path)
+
+    Returns:
+        list: [("key", name) | ("index", i) | ("each", None)]
+
+    Raises:
+        ValueError: 路径格式不合法 (Malformed path)
+    """
+    if not path or not path.strip():
+        raise ValueError("字段路径不能为空")
+
+    steps = []
+    for segment in path.strip().split("."):
+        match = _SEGMENT.match(segment)
+        if match is None or (not match.group(1) and not match.group(2)):
+            raise ValueError("字段路径不合法：{0}".format(path))
+        if match.group(1):
+            steps.append(("key", match.group(1)))
+        for index in _INDEX.findall(match.group(2)):
+            steps.append(("each", None) if index == "*" else ("index", int(index)))
+    return steps
+
+
+def _compile_steps(steps: List[Tuple[str, Any]]) -> Callable[[Any], Any]:
+    if not steps:
+        return lambda value: value
+
+    # 连续的键合并为一个循环，减少函数调用 / Consecutive keys become one loop to save calls
+    keys = []
+    while steps and steps[0][0] == "key":
+        keys.append(steps[0][1])
+        steps = steps[1:]
+
+    if keys:
+        rest = _compile_steps(steps) if steps else None
+
+        def get_keys(value):
+            for key in keys:
+                if not isinstance(value, dict):
+                    return None
+                value = value.get(key)
+            if rest is None or value is None:
+                return value
+            return rest(value)
+
+        return get_keys
+
+    kind, arg = steps[0]
+    rest = _compile_steps(steps[1:])
+
+    if kind == "index":
+        def get_index(value):
+            if isinstance(value, list) and -len(value) <= arg < len(value):
+                item = value[arg]
+                return None if item is None else rest(item)
+            return None
+
+        return get_index
+
+    def get_each(value):
+        if not isinstance(value, list):
+            return None
+        return [rest(item) for item in value]
+
+    return get_each
+
+
+def compile_path(path: str) -> Callable[[Any], Any]:
+    """编译路径为取值函数，路径不存在时返回None (Compile a path into an accessor that returns None when missing)"""
+    return _compile_steps(parse_path(path))
+
+
+class Projection:
+    """
+    编译后的投影规则 (Compiled projection spec)
+
+    Example:
+        spec = Projection({
+            "desc": "desc",
+            "cover": "video.cover.url_list[0]",
+            "images": "images[*].url_list[0]",
+            "play": ("video.play_addr.uri", lambda uri: f"https://example.com/?id={uri}"),
+            "stats": {"likes": "statistics.digg_count"},
+        })
+        result = spec(aweme)
+    """
+
+    def __init__(self, spec: dict):
+        self._fields = []
+        for name, rule in spec.items():
+            if isinstance(rule, dict):
+                accessor = Projection(rule)
+            elif isinstance(rule, tuple):
+                path, transform = rule
+                accessor = self._with_transform(compile_path(path), transform)
+            elif isinstance(rule, str):
+                accessor = compile_path(rule)
+            else:
+                raise TypeError("不支持的投影规则：{0}={1!r}".format(name, rule))
+            self._fields.append((name, accessor))
+
+    @staticmethod
+    def _with_transform(accessor: Callable[[Any], Any], transform: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        def get(value):
+            result = accessor(value)
+            return None if result is None else transform(result)
+
+        return get
+
+    def __call__(self, data: Any, into: dict = None) -> dict:
+        """应用投影 (Apply the projection)
+
+        Args:
+            data (Any): 源数据 (Source data)
+            into (dict): 写入结果的字典，默认新建 (Dict that receives the result, a new one by default)
+
+        Returns:
+            dict: 投影结果 (Projected result)
+        """
+        result = {} if into is None else into
+        for name, accessor in self._fields:
+            result[name] = accessor(data)
+        return result
+
+
+@functools.lru_cache(maxsize=256)
+def compile_fields(fields: str) -> Projection:
+    """编译逗号分隔的 fields 查询参数，结果以路径本身为键 (Compile a comma-separated fields query parameter, keyed by the paths themselves)
+
+    Args:
+        fields (str): 例如 "aweme_id,author.nickname,video.cover.url_list[0]"
+
+    Returns:
+        Projection: 编译后的投影 (Compiled projection)
+
+    Raises:
+        ValueError: 路径格式不合法或数量过多 (Malformed paths or too many of them)
+    """
+    paths = [path.strip() for path in fields.split(",") if path.strip()]
+    if not paths:
+        raise ValueError("fields 参数不能为空")
+    if len(paths) > MAX_FIELDS:
+        raise ValueError("fields 参数最多包含 {0} 个字段".format(MAX_FIELDS))
+    return Projection({path: path for path in paths})
+
+
+def project_fields(data: Any, fields: Union[str, None]) -> Any:
+    """按 fields 参数投影数据，未指定时原样返回 (Project data by a fields parameter, unchanged when it is not given)"""
+    if not fields:
+        return data
+    return compile_fields(fields)(data)
@@ -0,0 +1,149 @@
+# ==============================================================================
+# Copyright (C) 2021 Evil0ctal
+#
+# This file is part of the Douyin_TikTok_Download_API project.
+#
+# This project is licensed under the Apache License 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+# 　　　　 　　  ＿＿
+# 　　　 　　 ／＞　　フ
+# 　　　 　　| 　_　 _ l
+# 　 　　 　／` ミ＿xノ
+# 　　 　 /　　　 　 |       Feed me Stars ⭐
+# 　　　 /　 ヽ　　 ﾉ
+# 　 　 │　　|　|　|
+# 　／￣|　　 |　|　|
+# 　| (￣ヽ＿_ヽ_)__)
+# 　＼二つ
+# ==============================================================================
+#
+# Contributor Link:
+# - https://github.com/Evil0ctal
+# - https://github.com/Johnserf-Seed
+#
+# ==============================================================================
+
+
+from functools import lru_cache
+from typing import Any, Iterable, Type
+from urllib.parse import quote_plus
+
+from pydantic import BaseModel
+
+
+class QueryTemplate:
+    """
+    由请求模型生成的查询字符串模板 (Query string template built from a request model)
+
+    有固定默认值的字段在创建模板时编码一次，之后每次只编码必填字段与 default_factory 字段
+    (如轮换的 msToken)，不经过 Pydantic 校验。字段顺序与 model.dict() 相同。
+    (Fields with a fixed default are encoded once when the template is built;
+    each render only encodes required fields and default_factory fields such as
+    the rotating msToken, without Pydantic validation. Field order matches
+    model.dict().)
+    """
+
+    def __init__(self, model: Type[BaseModel], dynamic: Iterable[str] = ()):
+        """
+        Args:
+            model (Type[BaseModel]): 请求模型 (Request model)
+            dynamic (Iterable[str]): 虽有默认值但每次都可能变化的字段 (Fields with a default that may still change per call)
+        """
+        self.model = model
+        dynamic = set(dynamic)
+        self.fields = tuple(model.model_fields)
+
+        # 常量片段与动态字段交替排列，动态字段的位置先以None占位
+        # Constant chunks interleave with dynamic fields, whose positions hold None until rendered
+        self._encoded: list = []
+        self._raw: list = []
+        # (位置, 字段名, 默认值, default_factory, 是否必填) / (position, name, default, default_factory, required)
+        self._slots: list = []
+        encoded_run, raw_run = [], []
+
+        def flush():
+            if encoded_run:
+                self._encoded.append("&".join(encoded_run))
+                self._raw.append("&".join(raw_run))
+                encoded_run.clear()
+                raw_run.clear()
+
+        for name, field in model.model_fields.items():
+            required = field.is_required()
+            if required or field.default_factory is not None or name in dynamic:
+                flush()
+                self._slots.append((len(self._encoded), name, field.default, field.default_factory, required))
+                self._encoded.append(None)
+                self._raw.append(None)
+            else:
+                encoded_run.append("{0}={1}".format(quote_plus(name), quote_plus(str(field.default))))
+                raw_run.append("{0}={1}".format(name, field.default))
+        flush()
+
+        self._encoded_keys = {name: quote_plus(name) + "=" for name in self.fields}
+        self._dynamic = frozenset(slot[1] for slot in self._slots)
+        self._constants = frozenset(self.fields) - self._dynamic
+        # 调用时覆盖了常量字段的模板变体，按覆盖的字段集合缓存
+        # Variants for calls that override constant fields, cached by the overridden field set
+        self._variants: "dict[frozenset, QueryTemplate]" = {}
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def of(cls, model: Type[BaseModel]) -> "QueryTemplate":
+        """获取模型的共享模板 (Get the shared template of a model)"""
+        return cls(model)
+
+    def _resolve(self, values: dict) -> "QueryTemplate":
+        """覆盖了常量字段时改用把这些字段当作动态字段的变体 (Use a variant treating overridden constant fields as dynamic)"""
+        overridden = self._constants.intersection(values)
+        if not overridden:
+            return self
+        variant = self._variants.get(overridden)
+        if variant is None:
+            variant = self._variants[overridden] = QueryTemplate(self.model, self._dynamic | overridden)
+        return variant
+
+    def _values(self, values: dict):
+        unknown = set(values).difference(self.fields)
+        if unknown:
+            raise TypeError("{0} 没有字段：{1}".format(self.model.__name__, ", ".join(sorted(unknown))))
+
+        for position, name, default, factory, required in self._slots:
+            if name in values:
+                value = values[name]
+            elif factory is not None:
+                value = factory()
+            elif required:
+                raise TypeError("{0} 缺少必填字段：{1}".format(self.model.__name__, name))
+            else:
+                value = default
+            yield position, name, value
+
+    def encode(self, **values: Any) -> str:
+        """生成 urlencode 编码的查询字符串，等同于 urlencode(model(**values).dict())
+        (Render the urlencoded query, equivalent to urlencode(model(**values).dict()))
+        """
+        template = self._resolve(values)
+        parts = template._encoded[:]
+        for position, name, value in template._values(values):
+            parts[position] = template._encoded_keys[name] + quote_plus(str(value))
+        return "&".join(parts)
+
+    def join(self, **values: Any) -> str:
+        """生成未编码的查询字符串，等同于 "&".join(f"{k}={v}" ...)
+        (Render the unencoded query, equivalent to "&".join(f"{k}={v}" ...))
+        """
+        template = self._resolve(values)
+        parts = template._raw[:]
+        for position, name, value in template._values(values):
+            parts[position] = "{0}={1}".format(name, value)
+        return "&".join(parts)
@@ -0,0 +1,177 @@
+# ==============================================================================
+# Copyright (C) 2021 Evil0ctal
+#
+# This file is part of the Douyin_TikTok_Download_API project.
+#
+# This project is licensed under the Apache License 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+# 　　　　 　　  ＿＿
+# 　　　 　　 ／＞　　フ
+# 　　　 　　| 　_　 _ l
+# 　 　　 　／` ミ＿xノ
+# 　　 　 /　　　 　 |       Feed me Stars ⭐
+# 　　　 /　 ヽ　　 ﾉ
+# 　 　 │　　|　|　|
+# 　／￣|　　 |　|　|
+# 　| (￣ヽ＿_ヽ_)__)
+# 　＼二つ
+# ==============================================================================
+#
+# Contributor Link:
+# - https://github.com/Evil0ctal
+# - https://github.com/Johnserf-Seed
+#
+# ==============================================================================
+
+import asyncio
+import os
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional, Tuple
+from urllib.parse import urlsplit
+
+import yaml
+
+from crawlers.utils.logger import logger
+
+# 配置文件路径
+path = os.path.abspath(os.path.dirname(__file__))
+
+# 读取配置文件
+with open(f"{path}/config.yaml", "r", encoding="utf-8") as f:
+    config = yaml.safe_load(f)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析 Retry-After 响应头 (Parse the Retry-After response header)
+
+    Args:
+        value (str): 秒数或HTTP日期 (Delay in seconds or an HTTP date)
+
+    Returns:
+        float: 需要等待的秒数，无法解析时返回None (Seconds to wait, None if unparseable)
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class TokenBucket:
+    """
+    令牌桶限速器 (Token bucket rate limiter)
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """获取一个令牌，必要时等待 (Take one token, waiting if necessary)"""
+        # 锁保证等待者按先后顺序获取令牌 / The lock hands out tokens in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def block(self, seconds: float):
+        """在指定时间内暂停发放令牌 (Stop handing out tokens for the given time)"""
+        now = time.monotonic()
+        self._blocked_until = max(self._blocked_until, now + seconds)
+        self._refill(now)
+        self._tokens = 0.0
+
+
+class HostRateLimiter:
+    """
+    按上游域名共享的限速器 (Rate limiter shared per upstream host)
+
+    同一进程内所有爬虫实例共用，保证批量任务与交互请求的总速率不超过上游阈值。
+    (Shared by every crawler in the process so that batch jobs and interactive
+    requests together stay under the upstream threshold.)
+    """
+
+    def __init__(
+            self,
+            hosts: dict = None,
+            enable: bool = True,
+            default_retry_after: float = 1,
+            max_retry_after: float = 30,
+    ):
+        self.enable = enable
+        self.default_retry_after = default_retry_after
+        self.max_retry_after = max_retry_after
+        self._buckets = {
+            host: TokenBucket(rate=conf["rate"], burst=conf["burst"])
+            for host, conf in (hosts or {}).items()
+        }
+
+    def bucket_for(self, url: str) -> Optional[TokenBucket]:
+        """按域名后缀查找令牌桶 (Find the bucket matching the host suffix)"""
+        host = (urlsplit(url).hostname or "").lower()
+        for suffix, bucket in self._buckets.items():
+            if host == suffix or host.endswith("." + suffix):
+                return bucket
+        return None
+
+    async def acquire(self, url: str):
+        """请求上游前调用 (Call before sending a request upstream)"""
+        if not self.enable:
+            return
+        bucket = self.bucket_for(url)
+        if bucket is not None:
+            await bucket.acquire()
+
+    def penalize(self, url: str, retry_after: Optional[float] = None) -> Tuple[float, bool]:
+        """上游返回429后暂停该域名的请求 (Pause the host after an upstream 429)
+
+        Args:
+            url (str): 触发限速的地址 (URL that was throttled)
+            retry_after (float): Retry-After 秒数 (Retry-After in seconds)
+
+        Returns:
+            tuple: (应等待的秒数, 是否已由令牌桶暂停该域名)
+            (Seconds to wait, whether a bucket now holds the host for that long)
+        """
+        delay = self.default_retry_after if retry_after is None else retry_after
+        bucket = self.bucket_for(url) if self.enable else None
+        if bucket is not None:
+            bucket.block(min(delay, self.max_retry_after))
+        logger.warning("上游限速，{0} 秒后重试：{1}".format(delay, urlsplit(url).hostname))
+        return delay, bucket is not None
+
+
+# 进程级共享实例 (Process-wide shared instance)
+rate_limiter = HostRateLimiter(**config.get("RateLimiter", {}))
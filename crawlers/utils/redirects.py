@@ -0,0 +1,136 @@
+# ==============================================================================
+# Copyright (C) 2021 Evil0ctal
+#
+# This file is part of the Douyin_TikTok_Download_API project.
+#
+# This project is licensed under the Apache License 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+# 　　　　 　　  ＿＿
+# 　　　 　　 ／＞　　フ
+# 　　　 　　| 　_　 _ l
+# 　 　　 　／` ミ＿xノ
+# 　　 　 /　　　 　 |       Feed me Stars ⭐
+# 　　　 /　 ヽ　　 ﾉ
+# 　 　 │　　|　|　|
+# 　／￣|　　 |　|　|
+# 　| (￣ヽ＿_ヽ_)__)
+# 　＼二つ
+# ==============================================================================
+#
+# Contributor Link:
+# - https://github.com/Evil0ctal
+# - https://github.com/Johnserf-Seed
+#
+# ==============================================================================
+
+
+import re
+from typing import Callable, Optional
+from urllib.parse import urljoin, urlsplit
+
+import httpx
+
+
+class RedirectResult:
+    """
+    重定向解析结果 (Result of walking a redirect chain)
+
+    Attributes:
+        url (str): 停止时的地址 (URL where the walk stopped)
+        status_code (Optional[int]): 最后一次响应的状态码，未发出请求时为None (Status of the last response, None if nothing was sent)
+        match (Optional[str]): 从地址中提取出的ID (ID extracted from the URL)
+        hops (int): 跟随的重定向次数 (Number of redirects followed)
+    """
+
+    __slots__ = ("url", "status_code", "match", "hops")
+
+    def __init__(self, url: str, status_code: Optional[int], match: Optional[str], hops: int):
+        self.url = url
+        self.status_code = status_code
+        self.match = match
+        self.hops = hops
+
+    def landed_on(self, hosts: frozenset, pattern: re.Pattern) -> bool:
+        """是否经重定向停在指定域名下与 pattern 匹配的页面 (Whether redirects ended on a page of hosts matching pattern)
+
+        用于确认短链接指向了另一类页面；未发生重定向或停在验证页等未知页面时返回False。
+        (Used to confirm a short link points to a different kind of page; False when
+        nothing redirected or the walk stopped on an unknown page such as a captcha.)
+        """
+        if not self.hops:
+            return False
+        parts = urlsplit(self.url)
+        return parts.hostname in hosts and pattern.search(parts.path) is not None
+
+
+def first_group(*patterns: re.Pattern) -> Callable[[str], Optional[str]]:
+    """按顺序尝试正则，返回第一个匹配的第一个分组 (Try patterns in order and return group 1 of the first match)"""
+
+    def match(url: str) -> Optional[str]:
+        for pattern in patterns:
+            found = pattern.search(url)
+            if found:
+                return found.group(1)
+        return None
+
+    return match
+
+
+async def walk_redirects(
+        client: httpx.AsyncClient,
+        url: str,
+        match: Callable[[str], Optional[str]],
+        max_hops: int = 10,
+        method: str = "GET",
+) -> RedirectResult:
+    """手动逐跳跟随重定向，地址中出现ID即停止 (Follow redirects hop by hop and stop once a URL carries the ID)
+
+    每一跳都不自动跟随重定向且不读取响应体，只检查 Location，因此分享短链接通常一次请求即可解析，
+    不会下载最终的落地页。
+    (Each hop is sent without following redirects and its body is never read;
+    only Location is inspected, so a share link usually resolves in one
+    request without downloading the landing page.)
+
+    Args:
+        client (httpx.AsyncClient): 发送请求的客户端 (Client used to send requests)
+        url (str): 起始地址 (Starting URL)
+        match (Callable): 从地址中提取ID的函数，未找到时返回None (Extracts the ID from a URL, None when absent)
+        max_hops (int): 最多跟随的重定向次数 (Maximum redirects to follow)
+        method (str): 请求方法，部分服务器不支持HEAD，默认GET (Request method, GET by default since some servers reject HEAD)
+
+    Returns:
+        RedirectResult: 找到ID或到达非重定向响应时的结果 (Result once the ID is found or a non-redirect response is reached)
+
+    Raises:
+        httpx.TooManyRedirects: 重定向次数超过 max_hops (More than max_hops redirects)
+    """
+    status_code = None
+    hops = 0
+    while True:
+        found = match(url)
+        if found is not None:
+            return RedirectResult(url, status_code, found, hops)
+
+        request = client.build_request(method, url)
+        response = await client.send(request, stream=True, follow_redirects=False)
+        # 关闭响应而不读取响应体 / Close the response without reading its body
+        await response.aclose()
+        status_code = response.status_code
+
+        location = response.headers.get("location")
+        if not response.is_redirect or not location:
+            return RedirectResult(url, status_code, None, hops)
+
+        hops += 1
+        if hops > max_hops:
+            raise httpx.TooManyRedirects("重定向次数超过 {0} 次：{1}".format(max_hops, url), request=request)
+        url = urljoin(url, location)
@@ -0,0 +1,251 @@
+# ==============================================================================
+# Copyright (C) 2021 Evil0ctal
+#
+# This file is part of the Douyin_TikTok_Download_API project.
+#
+# This project is licensed under the Apache License 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+# 　　　　 　　  ＿＿
+# 　　　 　　 ／＞　　フ
+# 　　　 　　| 　_　 _ l
+# 　 　　 　／` ミ＿xノ
+# 　　 　 /　　　 　 |       Feed me Stars ⭐
+# 　　　 /　 ヽ　　 ﾉ
+# 　 　 │　　|　|　|
+# 　／￣|　　 |　|　|
+# 　| (￣ヽ＿_ヽ_)__)
+# 　＼二つ
+# ==============================================================================
+#
+# Contributor Link:
+# - https://github.com/Evil0ctal
+# - https://github.com/Johnserf-Seed
+#
+# ==============================================================================
+
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import yaml
+
+from crawlers.utils.logger import logger
+from crawlers.utils.single_flight import single_flight
+
+# 配置文件路径
+path = os.path.abspath(os.path.dirname(__file__))
+
+# 读取配置文件
+with open(f"{path}/config.yaml", "r", encoding="utf-8") as f:
+    config = yaml.safe_load(f)
+
+
+def normalize_url(url: str) -> str:
+    """规范化分享链接，使同一链接的不同写法得到同一个键 (Normalize a share link so variants of one link share a key)
+
+    协议统一为https，域名转小写，去掉片段与路径末尾的斜杠，查询参数排序；路径区分大小写，保持不变。
+    (Forces https, lowercases the host, drops the fragment and trailing slash
+    and sorts the query; the path is case-sensitive and kept as is.)
+    """
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    normalized = "https://{0}{1}".format(parts.netloc.lower(), parts.path.rstrip("/") or "/")
+    return "{0}?{1}".format(normalized, query) if query else normalized
+
+
+class ResolutionCache:
+    """
+    分享链接解析结果缓存 (Share link resolution cache)
+
+    将规范化后的链接映射到解析出的ID，内存LRU在前，SQLite持久化在后，进程重启后仍然有效。
+    同一链接的并发解析只会发出一次请求。
+    (Maps normalized links to the IDs resolved from them with an in-memory LRU
+    in front of a SQLite table, so results survive restarts. Concurrent
+    resolutions of one link make a single upstream request.)
+    """
+
+    # 键的类别 (Key kinds)
+    DOUYIN_AWEME_ID = "douyin_aweme_id"
+    DOUYIN_SEC_USER_ID = "douyin_sec_user_id"
+    DOUYIN_WEBCAST_ID = "douyin_webcast_id"
+    TIKTOK_AWEME_ID = "tiktok_aweme_id"
+    TIKTOK_SEC_UID = "tiktok_sec_uid"
+    TIKTOK_UNIQUE_ID = "tiktok_unique_id"
+
+    def __init__(
+            self,
+            enable: bool = True,
+            max_entries: int = 10000,
+            ttl: float = 30 * 86400,
+            path: str = "cache/resolution_cache.db",
+    ):
+        self.enable = enable
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS resolutions (
+                    kind TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (kind, url)
+                )
+            """)
+            conn.execute("DELETE FROM resolutions WHERE expires_at < ?", (time.time(),))
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _load(self, kind: str, url: str) -> Optional[tuple]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT value, expires_at FROM resolutions WHERE kind = ? AND url = ?", (kind, url)
+            ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return row
+
+    def _save(self, kind: str, url: str, value: str, expires_at: float):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO resolutions (kind, url, value, expires_at) VALUES (?, ?, ?, ?)",
+                (kind, url, value, expires_at),
+            )
+            conn.commit()
+
+    def _remember(self, key: tuple, value: str, expires_at: float):
+        self._entries.pop(key, None)
+        self._entries[key] = (value, expires_at)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, kind: str, url: str) -> Optional[str]:
+        """查询解析结果，先查内存再查磁盘 (Look up a resolved ID, memory first, then disk)
+
+        Args:
+            kind (str): 键的类别 (Key kind)
+            url (str): 分享链接 (Share link)
+
+        Returns:
+            Optional[str]: 解析出的ID，未缓存时返回None (Resolved ID, None when not cached)
+        """
+        if not self.enable:
+            return None
+
+        key = (kind, normalize_url(url))
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[1] >= time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            del self._entries[key]
+
+        try:
+            row = await asyncio.to_thread(self._load, *key)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("读取解析缓存失败：{0}".format(e))
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+
+        self._remember(key, row[0], row[1])
+        self.disk_hits += 1
+        return row[0]
+
+    async def set(self, kind: str, url: str, value: str):
+        """记录解析结果 (Record a resolved ID)
+
+        Args:
+            kind (str): 键的类别 (Key kind)
+            url (str): 分享链接 (Share link)
+            value (str): 解析出的ID (Resolved ID)
+        """
+        if not self.enable or not value:
+            return
+
+        key = (kind, normalize_url(url))
+        expires_at = time.time() + self.ttl
+        self._remember(key, value, expires_at)
+        try:
+            await asyncio.to_thread(self._save, *key, value, expires_at)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("写入解析缓存失败：{0}".format(e))
+
+    async def resolve(self, kind: str, url: str, func: Callable[[], Awaitable[str]]) -> str:
+        """先查缓存，未命中时执行解析并记录结果 (Check the cache, resolve and record on a miss)
+
+        Args:
+            kind (str): 键的类别 (Key kind)
+            url (str): 分享链接 (Share link)
+            func (Callable): 发起网络请求的无参协程函数 (Zero-argument coroutine function doing the network lookup)
+
+        Returns:
+            str: 解析出的ID (Resolved ID)
+        """
+        cached = await self.get(kind, url)
+        if cached is not None:
+            return cached
+
+        async def run() -> str:
+            value = await func()
+            await self.set(kind, url, value)
+            return value
+
+        return await single_flight.do(("resolve", kind, normalize_url(url)), run)
+
+    def stats(self) -> dict:
+        """获取解析缓存状态 (Get resolution cache statistics)"""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "path": self.path,
+        }
+
+    def close(self):
+        """关闭数据库连接 (Close the database connection)"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# 进程级共享实例 (Process-wide shared instance)
+resolution_cache = ResolutionCache(**config.get("ResolutionCache", {}))
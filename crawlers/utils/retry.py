@@ -0,0 +1,164 @@
+# ==============================================================================
+# Copyright (C) 2021 Evil0ctal
+#
+# This file is part of the Douyin_TikTok_Download_API project.
+#
+# This project is licensed under the Apache License 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+# 　　　　 　　  ＿＿
+# 　　　 　　 ／＞　　フ
+# 　　　 　　| 　_　 _ l
+# 　 　　 　／` ミ＿xノ
+# 　　 　 /　　　 　 |       Feed me Stars ⭐
+# 　　　 /　 ヽ　　 ﾉ
+# 　 　 │　　|　|　|
+# 　／￣|　　 |　|　|
+# 　| (￣ヽ＿_ヽ_)__)
+# 　＼二つ
+# ==============================================================================
+#
+# Contributor Link:
+# - https://github.com/Evil0ctal
+# - https://github.com/Johnserf-Seed
+#
+# ==============================================================================
+
+import asyncio
+import functools
+import os
+import random
+import time
+from typing import Optional
+
+import yaml
+
+from crawlers.utils.logger import logger
+
+# 配置文件路径
+path = os.path.abspath(os.path.dirname(__file__))
+
+# 读取配置文件
+with open(f"{path}/config.yaml", "r", encoding="utf-8") as f:
+    config = yaml.safe_load(f)
+
+
+class RetryPolicy:
+    """
+    指数退避 + 全抖动的重试策略 (Exponential backoff with full jitter)
+
+    每次等待时间在 [0, min(max_delay, base_delay * 2^n)] 之间随机选取，并受总时限约束。
+    (Each wait is drawn uniformly from [0, min(max_delay, base_delay * 2^n)] and
+    bounded by a total deadline.)
+    """
+
+    # 错误类别 (Error classes)
+    EMPTY_BODY = "empty_body"
+    CONNECT_ERROR = "connect_error"
+    SERVER_ERROR = "server_error"
+    RATE_LIMITED = "rate_limited"
+
+    def __init__(
+            self,
+            max_attempts: int = 3,
+            base_delay: float = 0.5,
+            max_delay: float = 5,
+            deadline: float = 20,
+            retry_on: dict = None,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.retry_on = {
+            self.EMPTY_BODY: True,
+            self.CONNECT_ERROR: True,
+            self.SERVER_ERROR: True,
+            self.RATE_LIMITED: True,
+        }
+        self.retry_on.update(retry_on or {})
+
+    @classmethod
+    def from_config(cls, **overrides) -> "RetryPolicy":
+        """根据配置文件创建策略 (Create a policy from the configuration file)"""
+        kwargs = dict(config.get("RetryPolicy", {}))
+        kwargs.update(overrides)
+        return cls(**kwargs)
+
+    def backoff(self, attempt: int) -> float:
+        """第 attempt 次失败后的等待时间 (Wait time after the given failed attempt)
+
+        Args:
+            attempt (int): 已失败的次数，从1开始 (Number of failed attempts, starting at 1)
+
+        Returns:
+            float: 等待秒数 (Seconds to wait)
+        """
+        cap = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, cap)
+
+    def next_delay(
+            self,
+            error_class: str,
+            attempt: int,
+            started: float,
+            min_delay: float = 0,
+    ) -> Optional[float]:
+        """判断是否重试并返回等待时间 (Decide whether to retry and return the wait time)
+
+        Args:
+            error_class (str): 错误类别 (Error class)
+            attempt (int): 已失败的次数，从1开始 (Number of failed attempts, starting at 1)
+            started (float): 首次请求的 time.monotonic() (time.monotonic() of the first attempt)
+            min_delay (float): 上游要求的最短等待时间 (Minimum wait requested by upstream)
+
+        Returns:
+            Optional[float]: 等待秒数，不再重试时返回None (Seconds to wait, None to give up)
+        """
+        if not self.retry_on.get(error_class, False) or attempt >= self.max_attempts:
+            return None
+
+        delay = max(self.backoff(attempt), min_delay)
+        if time.monotonic() + delay - started > self.deadline:
+            return None
+        return delay
+
+    def retry(self, exceptions: tuple = (Exception,)):
+        """
+        异步函数的重试装饰器，失败时按本策略退避 (Retry decorator for coroutines using this policy's backoff)
+
+        Args:
+            exceptions (tuple): 需要重试的异常类型 (Exception types that trigger a retry)
+        """
+
+        def decorator(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                started = time.monotonic()
+                attempt = 0
+                while True:
+                    attempt += 1
+                    try:
+                        return await func(*args, **kwargs)
+                    except exceptions as e:
+                        if attempt >= self.max_attempts:
+                            raise
+                        delay = self.backoff(attempt)
+                        if time.monotonic() + delay - started > self.deadline:
+                            raise
+                        logger.warning("{0} 第 {1} 次失败：{2}，{3:.2f} 秒后重试".format(
+                            func.__qualname__, attempt, e, delay)
+                        )
+                        await asyncio.sleep(delay)
+
+            return wrapper
+
+        return decorator
@@ -0,0 +1,246 @@
+# ==============================================================================
+# Copyright (C) 2021 Evil0ctal
+#
+# This file is part of the Douyin_TikTok_Download_API project.
+#
+# This project is licensed under the Apache License 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+# 　　　　 　　  ＿＿
+# 　　　 　　 ／＞　　フ
+# 　　　 　　| 　_　 _ l
+# 　 　　 　／` ミ＿xノ
+# 　　 　 /　　　 　 |       Feed me Stars ⭐
+# 　　　 /　 ヽ　　 ﾉ
+# 　 　 │　　|　|　|
+# 　／￣|　　 |　|　|
+# 　| (￣ヽ＿_ヽ_)__)
+# 　＼二つ
+# ==============================================================================
+#
+# Contributor Link:
+# - https://github.com/Evil0ctal
+# - https://github.com/Johnserf-Seed
+#
+# ==============================================================================
+
+
+import asyncio
+import functools
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Sequence
+
+import yaml
+
+from crawlers.utils.logger import logger
+
+# 配置文件路径
+path = os.path.abspath(os.path.dirname(__file__))
+
+# 读取配置文件
+with open(f"{path}/config.yaml", "r", encoding="utf-8") as f:
+    config = yaml.safe_load(f)
+
+
+class LoopLagMonitor:
+    """
+    事件循环延迟监控 (Event loop lag monitor)
+
+    定时休眠 interval 秒，实际唤醒时间与预期之差即为事件循环被阻塞的时间。
+    (Sleeps for interval seconds in a loop; how late each wake-up is measures how
+    long the event loop was blocked.)
+    """
+
+    def __init__(self, interval: float = 0.5, alpha: float = 0.2):
+        self.interval = interval
+        self.alpha = alpha
+        self.last = 0.0
+        self.average = 0.0
+        self.max = 0.0
+        self.samples = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """在当前事件循环中启动监控 (Start monitoring on the running loop)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        """停止监控 (Stop monitoring)"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - expected)
+            self.last = lag
+            # 指数加权平均，平滑偶发的尖峰 / Exponentially weighted average smooths out single spikes
+            self.average = lag if not self.samples else self.average + self.alpha * (lag - self.average)
+            self.max = max(self.max, lag)
+            self.samples += 1
+
+    def stats(self) -> dict:
+        """获取延迟统计，单位毫秒 (Get lag statistics in milliseconds)"""
+        return {
+            "last_ms": round(self.last * 1000, 3),
+            "average_ms": round(self.average * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "samples": self.samples,
+        }
+
+
+class SigningService:
+    """
+    请求签名服务 (Request signing service)
+
+    a_bogus、X-Bogus、w_rid 等签名是纯Python的CPU密集计算。事件循环空闲时直接在循环内计算，
+    避免线程切换的开销；延迟超过 inline_max_lag 或已有任务排队时交给线程池或进程池执行。
+    (Signatures such as a_bogus, X-Bogus and w_rid are CPU-bound pure Python.
+    While the loop is idle they run inline to skip the executor hop; once lag
+    exceeds inline_max_lag or jobs are already queued they go to a thread or
+    process pool.)
+
+    签名线程虽然持有GIL，但解释器每个切换间隔(默认5ms)会交出GIL，事件循环的停顿因此受切换间隔限制，
+    而不是整批签名的耗时；进程池没有GIL限制，但每次调用都要序列化参数，只在多核机器上才能提高吞吐。
+    (Signing threads hold the GIL, but the interpreter hands it over every
+    switch interval (5ms by default), so loop stalls are bounded by that
+    interval instead of the whole burst. Process pools avoid the GIL but pickle
+    every call, which only pays off in throughput on multi-core machines.
+    Compare with python -m benchmarks.bench_signing --lag.)
+    """
+
+    INLINE = "inline"
+    THREAD = "thread"
+    PROCESS = "process"
+
+    def __init__(
+            self,
+            mode: str = THREAD,
+            max_workers: int = 4,
+            inline_max_lag: float = 0.005,
+            lag_interval: float = 0.5,
+    ):
+        if mode not in (self.INLINE, self.THREAD, self.PROCESS):
+            raise ValueError("未知的签名执行方式：{0}".format(mode))
+
+        self.mode = mode
+        self.max_workers = max_workers
+        self.inline_max_lag = inline_max_lag
+        self.monitor = LoopLagMonitor(interval=lag_interval)
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+
+        self.inline = 0
+        self.offloaded = 0
+        self.failed = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == self.PROCESS:
+                # 进程池只接受可按引用序列化的模块级函数 / Process pools only accept functions picklable by reference
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="signing")
+        return self._executor
+
+    def should_offload(self) -> bool:
+        """判断本次签名是否交给执行器 (Decide whether this signature goes to the executor)"""
+        if self.mode == self.INLINE:
+            return False
+        return self._pending > 0 or self.monitor.average > self.inline_max_lag
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """执行签名函数 (Run a signing function)
+
+        Args:
+            func (Callable): 同步签名函数，进程池模式下必须可序列化 (Sync signing function, picklable in process mode)
+
+        Returns:
+            Any: 签名函数的返回值 (Return value of the signing function)
+        """
+        self.monitor.start()
+
+        if not self.should_offload():
+            self.inline += 1
+            return func(*args, **kwargs)
+        return await self._offload(func, *args, **kwargs)
+
+    async def _offload(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        self._pending += 1
+        self.offloaded += 1
+        try:
+            return await loop.run_in_executor(self._get_executor(), functools.partial(func, *args, **kwargs))
+        except Exception as e:
+            self.failed += 1
+            logger.error("签名执行失败：{0}：{1}".format(getattr(func, "__qualname__", func), e))
+            raise
+        finally:
+            self._pending -= 1
+
+    async def run_many(self, func: Callable[..., list], items: Sequence, *args, min_chunk: int = 8) -> list:
+        """批量执行签名函数，结果与 items 顺序一致 (Run a batch signing function, results keep the order of items)
+
+        func(items, *args) 须返回与 items 等长的列表，例如 BogusManager.xb_sign_many。
+        不少于 min_chunk 个的批次总是交给执行器，进程池模式下再按工作进程数分块并行执行。
+        (func(items, *args) must return a list as long as items, e.g.
+        BogusManager.xb_sign_many. Batches of at least min_chunk items always go
+        to the executor, and in process mode they are split into one chunk per
+        worker and signed in parallel.)
+
+        Args:
+            func (Callable): 批量签名函数 (Batch signing function)
+            items (Sequence): 待签名的参数 (Parameters to sign)
+            min_chunk (int): 交给执行器及每块的最少数量 (Minimum size to offload and per chunk)
+
+        Returns:
+            list: 签名结果 (Signing results)
+        """
+        items = list(items)
+        if self.mode == self.INLINE or len(items) < min_chunk:
+            return await self.run(func, items, *args)
+
+        self.monitor.start()
+        if self.mode != self.PROCESS:
+            return await self._offload(func, items, *args)
+
+        size = max(min_chunk, -(-len(items) // self.max_workers))
+        chunks = [items[i:i + size] for i in range(0, len(items), size)]
+        results = await asyncio.gather(*(self._offload(func, chunk, *args) for chunk in chunks))
+        return [result for chunk in results for result in chunk]
+
+    def shutdown(self):
+        """关闭执行器并停止监控 (Shut down the executor and stop monitoring)"""
+        self.monitor.stop()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        """获取签名服务状态 (Get signing service statistics)"""
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "pending": self._pending,
+            "inline": self.inline,
+            "offloaded": self.offloaded,
+            "failed": self.failed,
+            "loop_lag": self.monitor.stats(),
+        }
+
+
+# 进程级共享实例 (Process-wide shared instance)
+signing_service = SigningService(**config.get("SigningService", {}))
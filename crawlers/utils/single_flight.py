@@ -0,0 +1,118 @@
+# ==============================================================================
+# Copyright (C) 2021 Evil0ctal
+#
+# This file is part of the Douyin_TikTok_Download_API project.
+#
+# This project is licensed under the Apache License 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+# 　　　　 　　  ＿＿
+# 　　　 　　 ／＞　　フ
+# 　　　 　　| 　_　 _ l
+# 　 　　 　／` ミ＿xノ
+# 　　 　 /　　　 　 |       Feed me Stars ⭐
+# 　　　 /　 ヽ　　 ﾉ
+# 　 　 │　　|　|　|
+# 　／￣|　　 |　|　|
+# 　| (￣ヽ＿_ヽ_)__)
+# 　＼二つ
+# ==============================================================================
+#
+# Contributor Link:
+# - https://github.com/Evil0ctal
+# - https://github.com/Johnserf-Seed
+#
+# ==============================================================================
+
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+# 每次签名都会变化的参数，不参与请求去重
+# Parameters that change on every signing and are ignored when deduplicating
+VOLATILE_PARAMS = frozenset({
+    "a_bogus",
+    "X-Bogus",
+    "_signature",
+    "msToken",
+    "w_rid",
+    "wts",
+    "verifyFp",
+    "fp",
+})
+
+
+def canonical_endpoint(url: str) -> str:
+    """去除签名参数并排序，得到规范化的端点 (Strip signature params and sort to get the canonical endpoint)
+
+    Args:
+        url (str): 已签名的完整URL (Fully signed URL)
+
+    Returns:
+        str: 规范化后的端点 (Canonical endpoint)
+    """
+    parts = urlsplit(url)
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k not in VOLATILE_PARAMS
+    )
+    return "{0}://{1}{2}?{3}".format(parts.scheme, parts.netloc, parts.path, urlencode(query))
+
+
+class SingleFlight:
+    """
+    进程内的请求合并 (In-process request coalescing)
+
+    相同键的并发调用只会执行一次，其余调用等待同一个结果；结果对象是共享的，调用方不应修改。
+    (Concurrent calls with the same key run once and the others await the same
+    result; the result object is shared and must not be mutated by callers.)
+    """
+
+    def __init__(self):
+        self._inflight: "dict[Hashable, asyncio.Task]" = {}
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """执行或等待同键的调用 (Run the call, or await the one already in flight for this key)
+
+        Args:
+            key (Hashable): 去重键 (Deduplication key)
+            func (Callable): 无参协程函数 (Zero-argument coroutine function)
+
+        Returns:
+            Any: 调用结果 (Call result)
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            # 在独立任务中执行，首个调用方被取消时其余等待者不受影响
+            # Run in its own task so cancelling the first caller does not affect the others
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 所有等待者都已取消时避免 "exception was never retrieved" 警告
+        # Avoid the "never retrieved" warning when every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        """获取请求合并状态 (Get coalescing statistics)"""
+        return {"inflight": len(self._inflight), "coalesced": self.coalesced}
+
+
+# 进程级共享实例 (Process-wide shared instance)
+single_flight = SingleFlight()
@@ -0,0 +1,343 @@
+# ==============================================================================
+# Copyright (C) 2021 Evil0ctal
+#
+# This file is part of the Douyin_TikTok_Download_API project.
+#
+# This project is licensed under the Apache License 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+# 　　　　 　　  ＿＿
+# 　　　 　　 ／＞　　フ
+# 　　　 　　| 　_　 _ l
+# 　 　　 　／` ミ＿xノ
+# 　　 　 /　　　 　 |       Feed me Stars ⭐
+# 　　　 /　 ヽ　　 ﾉ
+# 　 　 │　　|　|　|
+# 　／￣|　　 |　|　|
+# 　| (￣ヽ＿_ヽ_)__)
+# 　＼二つ
+# ==============================================================================
+#
+# Contributor Link:
+# - https://github.com/Evil0ctal
+# - https://github.com/Johnserf-Seed
+#
+# ==============================================================================
+
+
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Callable, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import yaml
+
+from crawlers.utils.api_exceptions import APIUnavailableError
+from crawlers.utils.logger import logger
+
+# 配置文件路径
+path = os.path.abspath(os.path.dirname(__file__))
+
+# 读取配置文件
+with open(f"{path}/config.yaml", "r", encoding="utf-8") as f:
+    config = yaml.safe_load(f)
+
+
+class PooledToken:
+    """池中的单个令牌 (A single pooled token)"""
+
+    __slots__ = ("value", "created_at", "expires_at", "last_used", "uses", "failures")
+
+    def __init__(self, value: str, ttl: float):
+        now = time.monotonic()
+        self.value = value
+        self.created_at = now
+        self.expires_at = now + ttl
+        self.last_used = 0.0
+        self.uses = 0
+        self.failures = 0
+
+
+class TokenPool:
+    """
+    轮换使用的令牌池 (Rotating token pool)
+
+    预先生成 size 个令牌并按轮询或最久未使用的顺序发放，把请求分摊到多个令牌上；被上游拒绝或临近
+    过期的令牌会被淘汰，并在后台异步补充。不在导入时发起网络请求。
+    (Keeps size pre-generated tokens and hands them out round-robin or least
+    recently used so load is spread across tokens; tokens rejected upstream or
+    close to expiry are retired and refilled in the background. Nothing touches
+    the network at import time.)
+    """
+
+    ROUND_ROBIN = "round_robin"
+    LEAST_RECENTLY_USED = "lru"
+
+    def __init__(
+            self,
+            name: str,
+            generate: Callable,
+            fallback: Callable[[], str] = None,
+            size: int = 4,
+            strategy: str = ROUND_ROBIN,
+            ttl: float = 1800,
+            refresh_margin: float = 300,
+            retry_after: float = 60,
+            max_failures: int = 2,
+            concurrency: int = 2,
+    ):
+        """
+        Args:
+            name (str): 令牌池名称，用于日志与统计 (Pool name for logs and statistics)
+            generate (Callable): 生成一个令牌，可以是协程函数；同步函数在线程中执行
+            (Generates one token, may be a coroutine function; sync functions run in a thread)
+            fallback (Callable): 池为空时使用的本地令牌，为None时抛出异常
+            (Local token used while the pool is empty, raises when None)
+        """
+        if strategy not in (self.ROUND_ROBIN, self.LEAST_RECENTLY_USED):
+            raise ValueError("未知的令牌发放策略：{0}".format(strategy))
+
+        self.name = name
+        self.generate = generate
+        self.fallback = fallback
+        self.size = size
+        self.strategy = strategy
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self.retry_after = retry_after
+        self.max_failures = max_failures
+        self.concurrency = concurrency
+
+        self._tokens: "deque[PooledToken]" = deque()
+        self._task: Optional[asyncio.Task] = None
+        # 生成失败后的下次补充时间 / Earliest refill time after a failed generation
+        self._next_fill_at = 0.0
+        self._last_error: Optional[BaseException] = None
+
+        self.handed_out = 0
+        self.generated = 0
+        self.retired = 0
+        self.failed = 0
+
+    @classmethod
+    def from_config(cls, name: str, generate: Callable, fallback: Callable[[], str] = None, **overrides):
+        """根据配置文件创建令牌池 (Create a pool from the configuration file)"""
+        kwargs = dict(config.get("TokenPool", {}))
+        kwargs.update(overrides)
+        return cls(name, generate, fallback, **kwargs)
+
+    def current(self) -> str:
+        """同步获取一个令牌，供模型的 default_factory 使用 (Take a token synchronously, for model default factories)
+
+        池为空时返回备用令牌并在后台开始补充。
+        (Returns the fallback token and starts refilling in the background while the pool is empty.)
+        """
+        value = self._take()
+        if value is None:
+            return self._fallback()
+        return value
+
+    async def get(self) -> str:
+        """获取一个令牌，池为空时等待补充 (Take a token, waiting for a refill while the pool is empty)"""
+        value = self._take()
+        if value is None and time.monotonic() >= self._next_fill_at:
+            await self.fill()
+            value = self._take()
+        if value is None:
+            return self._fallback()
+        return value
+
+    async def ready(self):
+        """
+        冷启动时等待首次补充，用于请求前预热 (Wait for the very first refill on a cold start, used to warm up before requests)
+
+        之后池为空时只在后台补充，不阻塞请求，期间由 current() 返回备用令牌；生成失败后也不再等待。
+        (Afterwards an empty pool is refilled in the background without blocking requests, with current() handing
+        out the fallback meanwhile; once a generation has failed, requests never wait for it again.)
+        """
+        if self._tokens:
+            return
+        if self.generated or self.failed:
+            self._schedule_fill()
+            return
+        if time.monotonic() >= self._next_fill_at:
+            await self.fill()
+
+    async def fill(self):
+        """补充令牌至 size 个，并发调用共享同一次补充 (Refill up to size tokens, concurrent callers share one refill)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._fill())
+        await asyncio.shield(self._task)
+
+    def reject(self, value: str):
+        """记录一次上游拒绝，达到 max_failures 次后淘汰该令牌 (Record an upstream rejection, retiring the token after max_failures)"""
+        for token in self._tokens:
+            if token.value == value:
+                token.failures += 1
+                if token.failures >= self.max_failures:
+                    self.retire(value)
+                return
+
+    def retire(self, value: str):
+        """淘汰令牌并在后台补充 (Retire a token and refill in the background)"""
+        for token in list(self._tokens):
+            if token.value == value:
+                self._tokens.remove(token)
+                self.retired += 1
+                logger.info("{0} 令牌已淘汰，使用次数：{1}".format(self.name, token.uses))
+        self._schedule_fill()
+
+    def _take(self) -> Optional[str]:
+        now = time.monotonic()
+        self._prune(now)
+        if self._fresh_count(now) < self.size:
+            self._schedule_fill()
+        if not self._tokens:
+            return None
+
+        if self.strategy == self.LEAST_RECENTLY_USED:
+            token = min(self._tokens, key=lambda t: t.last_used)
+        else:
+            token = self._tokens[0]
+            self._tokens.rotate(-1)
+        token.last_used = now
+        token.uses += 1
+        self.handed_out += 1
+        return token.value
+
+    def _fallback(self) -> str:
+        if self.fallback is not None:
+            return self.fallback()
+        if self._last_error is not None:
+            raise self._last_error
+        raise APIUnavailableError("{0} 令牌池为空".format(self.name))
+
+    def _prune(self, now: float):
+        if any(t.expires_at <= now for t in self._tokens):
+            self._tokens = deque(t for t in self._tokens if t.expires_at > now)
+
+    def _fresh_count(self, now: float) -> int:
+        return sum(1 for t in self._tokens if t.expires_at - self.refresh_margin > now)
+
+    def _schedule_fill(self):
+        if self._task is not None and not self._task.done():
+            return
+        if time.monotonic() < self._next_fill_at:
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # 没有运行中的事件循环时，等到下次在异步上下文中使用再补充 / Without a running loop, wait for the next async use
+            return
+        self._task = asyncio.ensure_future(self._fill())
+
+    async def _generate_one(self, semaphore: asyncio.Semaphore) -> str:
+        async with semaphore:
+            if asyncio.iscoroutinefunction(self.generate):
+                return await self.generate()
+            return await asyncio.to_thread(self.generate)
+
+    async def _fill(self):
+        missing = self.size - self._fresh_count(time.monotonic())
+        if missing <= 0:
+            return
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(
+            *(self._generate_one(semaphore) for _ in range(missing)), return_exceptions=True
+        )
+
+        failures = 0
+        for result in results:
+            if isinstance(result, BaseException) or not result:
+                failures += 1
+                if isinstance(result, BaseException):
+                    self._last_error = result
+                continue
+            self._tokens.append(PooledToken(result, self.ttl))
+            self.generated += 1
+
+        if failures:
+            self.failed += failures
+            self._next_fill_at = time.monotonic() + self.retry_after
+            logger.error("生成 {0} 失败 {1}/{2} 次：{3}，{4} 秒后重试".format(
+                self.name, failures, missing, self._last_error, self.retry_after)
+            )
+            if not self._tokens and self.fallback is not None:
+                logger.info("将使用本地生成的 {0}，以继续请求。".format(self.name))
+
+        # 新令牌到位后丢弃最早过期的多余令牌 / Drop the soonest-expiring extras once replacements arrive
+        if len(self._tokens) > self.size:
+            keep = sorted(self._tokens, key=lambda t: t.expires_at)[-self.size:]
+            self._tokens = deque(t for t in self._tokens if t in keep)
+
+    def stats(self) -> dict:
+        """获取令牌池深度与令牌年龄 (Get pool depth and token ages)"""
+        now = time.monotonic()
+        ages = [now - t.created_at for t in self._tokens]
+        return {
+            "name": self.name,
+            "strategy": self.strategy,
+            "size": self.size,
+            "depth": len(self._tokens),
+            "fresh": self._fresh_count(now),
+            "oldest_age": max(ages) if ages else None,
+            "mean_age": sum(ages) / len(ages) if ages else None,
+            "handed_out": self.handed_out,
+            "generated": self.generated,
+            "retired": self.retired,
+            "failed": self.failed,
+            "filling": self._task is not None and not self._task.done(),
+        }
+
+
+class TokenPoolRegistry:
+    """
+    按请求参数名登记令牌池 (Token pools registered by request parameter name)
+
+    请求被上游拒绝时，根据URL中的参数值找到对应的令牌并记录拒绝。
+    (When upstream rejects a request, the parameter values in its URL are used to
+    find and penalise the tokens that were sent.)
+    """
+
+    def __init__(self):
+        self._pools: "dict[str, TokenPool]" = {}
+        self._params: "dict[str, list[TokenPool]]" = {}
+
+    def register(self, pool: TokenPool, param: str = None) -> TokenPool:
+        """登记令牌池 (Register a pool)
+
+        Args:
+            pool (TokenPool): 令牌池 (Token pool)
+            param (str): 令牌在请求URL中的参数名 (Query parameter carrying the token)
+        """
+        self._pools[pool.name] = pool
+        if param:
+            self._params.setdefault(param, []).append(pool)
+        return pool
+
+    def reject(self, url: str):
+        """上游拒绝请求后调用 (Call after upstream rejected a request)"""
+        if not self._params:
+            return
+        for key, value in parse_qsl(urlsplit(url).query):
+            for pool in self._params.get(key, ()):
+                pool.reject(value)
+
+    def stats(self) -> dict:
+        """获取所有令牌池的状态 (Get statistics of every pool)"""
+        return {name: pool.stats() for name, pool in self._pools.items()}
+
+
+# 进程级共享实例 (Process-wide shared instance)
+token_pools = TokenPoolRegistry()
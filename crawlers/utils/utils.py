@@ -43,8 +43,8 @@ import importlib_resources
 
 from pydantic import BaseModel
 
-from urllib.parse import quote, urlencode  # URL编码
-from typing import Union, List, Any
+from urllib.parse import quote, urlencode, urlsplit  # URL编码
+from typing import Union, List, Any, Iterable, Optional
 from pathlib import Path
 
 # 生成一个 16 字节的随机字节串 (Generate a random byte string of 16 bytes)
@@ -200,6 +200,43 @@ def extract_valid_urls(inputs: Union[str, List[str]]) -> Union[str, List[str], N
         return valid_urls
 
 
+def match_canonical_url(
+        url: str,
+        hosts: frozenset,
+        patterns: Iterable[re.Pattern],
+        valid: re.Pattern = None,
+) -> Optional[str]:
+    """在本地从规范链接中提取ID，不发起网络请求 (Extract an ID from a canonical link locally, without a network request)
+
+    只处理域名属于 hosts 的链接，依次尝试 patterns，第一个分组需完整匹配 valid；
+    短链接与未知格式返回None，由调用方请求网络解析。
+    (Only links whose host is in hosts are handled; patterns are tried in
+    order and the first group must fully match valid. Short links and unknown
+    shapes return None so the caller resolves them over the network.)
+
+    Args:
+        url (str): 输入的链接 (Input link)
+        hosts (frozenset): 可在本地解析的域名 (Hosts that can be parsed locally)
+        patterns (Iterable[re.Pattern]): 按顺序尝试的正则，第一个分组为ID (Patterns tried in order, group 1 is the ID)
+        valid (re.Pattern): ID的格式 (ID format)
+
+    Returns:
+        Optional[str]: 提取出的ID，无法在本地确定时返回None (Extracted ID, None when it cannot be determined locally)
+    """
+    try:
+        host = urlsplit(url.strip()).hostname
+    except ValueError:
+        return None
+    if host not in hosts:
+        return None
+
+    for pattern in patterns:
+        match = pattern.search(url)
+        if match and (valid is None or valid.fullmatch(match.group(1))):
+            return match.group(1)
+    return None
+
+
 def _get_first_item_from_list(_list) -> list:
     # 检查是否是列表 (Check if it's a list)
     if _list and isinstance(_list, list):
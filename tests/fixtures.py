@@ -0,0 +1,84 @@
+# ==============================================================================
+# Copyright (C) 2021 Evil0ctal
+#
+# This file is part of the Douyin_TikTok_Download_API project.
+#
+# This project is licensed under the Apache License 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+# 　　　　 　　  ＿＿
+# 　　　 　　 ／＞　　フ
+# 　　　 　　| 　_　 _ l
+# 　 　　 　／` ミ＿xノ
+# 　　 　 /　　　 　 |       Feed me Stars ⭐
+# 　　　 /　 ヽ　　 ﾉ
+# 　 　 │　　|　|　|
+# 　／￣|　　 |　|　|
+# 　| (￣ヽ＿_ヽ_)__)
+# 　＼二つ
+# ==============================================================================
+#
+# Contributor Link:
+# - https://github.com/Evil0ctal
+# - https://github.com/Johnserf-Seed
+#
+# ==============================================================================
+
+
+"""
+测试与基准测试共用的固定输入和改动前的参考实现
+(Fixed inputs and pre-change reference implementations shared by the tests and benchmarks)
+"""
+
+from urllib.parse import urlencode
+
+PARAMS = {
+    "device_platform": "webapp",
+    "aid": "6383",
+    "channel": "channel_pc_web",
+    "pc_client_type": "1",
+    "version_code": "190500",
+    "version_name": "19.5.0",
+    "cookie_enabled": "true",
+    "browser_language": "zh-CN",
+    "browser_platform": "Win32",
+    "browser_name": "Firefox",
+    "browser_online": "true",
+    "engine_name": "Gecko",
+    "os_name": "Windows",
+    "os_version": "10",
+    "platform": "PC",
+    "screen_width": "1920",
+    "screen_height": "1080",
+    "browser_version": "124.0",
+    "engine_version": "122.0.0.0",
+    "cpu_core_num": "12",
+    "device_memory": "8",
+    "aweme_id": "7345492945006595379",
+    "msToken": "",
+}
+
+# 固定时间与随机数，使两种实现的结果可以逐字节比较 / Fixed time and randomness so both outputs compare byte for byte
+FIXED = dict(start_time=1718000000000, end_time=1718000000006,
+             random_num_1=1234.5, random_num_2=2345.6, random_num_3=3456.7)
+
+
+def legacy_encode_query(params: dict) -> str:
+    """改动前的 WridManager.get_encode_query (WridManager.get_encode_query before the change)"""
+    params = dict(params)
+    params['wts'] = params['wts'] + "ea1db124af3c7062474693fa704f4ff8"
+    params = dict(sorted(params.items()))
+    params = {
+        k: ''.join(filter(lambda chr: chr not in "!'()*", str(v)))
+        for k, v
+        in params.items()
+    }
+    return urlencode(params)
@@ -0,0 +1,85 @@
+# ==============================================================================
+# Copyright (C) 2021 Evil0ctal
+#
+# This file is part of the Douyin_TikTok_Download_API project.
+#
+# This project is licensed under the Apache License 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+# 　　　　 　　  ＿＿
+# 　　　 　　 ／＞　　フ
+# 　　　 　　| 　_　 _ l
+# 　 　　 　／` ミ＿xノ
+# 　　 　 /　　　 　 |       Feed me Stars ⭐
+# 　　　 /　 ヽ　　 ﾉ
+# 　 　 │　　|　|　|
+# 　／￣|　　 |　|　|
+# 　| (￣ヽ＿_ヽ_)__)
+# 　＼二つ
+# ==============================================================================
+#
+# Contributor Link:
+# - https://github.com/Evil0ctal
+# - https://github.com/Johnserf-Seed
+#
+# ==============================================================================
+
+
+"""
+X-Bogus 签名的回归测试 (Regression tests for X-Bogus signing)
+
+期望值由改动前的 xbogus.py 在固定UA与时间戳下算出，覆盖按十六进制解析的短输入(≤32字符)
+和按字节哈希的长输入(>32字符)两条路径。
+(Expected values come from the xbogus.py before the optimisation, for a fixed UA and timestamp,
+and cover both the hex-parsed short inputs (≤32 chars) and the byte-hashed long inputs (>32 chars).)
+"""
+
+from unittest import mock
+from urllib.parse import urlencode
+
+import pytest
+
+from crawlers.douyin.web import xbogus
+from crawlers.douyin.web.xbogus import XBogus
+from tests.fixtures import PARAMS
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/122.0.0.0 Safari/537.36 Edg/122.0.0.0"
+)
+# 固定的时间戳(秒) / Fixed timestamp (seconds)
+FIXED_TIME = 1718000000
+
+GOLDEN_X_BOGUS = [
+    ("d41d8cd98f00b204e9800998ecf8427e", FIXED_TIME, "DFSzswVYvqTANxTQtUsUae9WX7nz"),
+    ("d41d8cd98f00b204e9800998ecf8427e", 1700000000, "DFSzswVYvqTANxTQtmWx-e9WX7Jr"),
+    ("0123456789abcdef", FIXED_TIME, "DFSzswVY3L2ANxTQtUsUae9WX7n2"),
+    ("a" * 33, FIXED_TIME, "DFSzswVYqkbANxTQtUsUae9WX7j6"),
+    (urlencode(PARAMS), FIXED_TIME, "DFSzswVYNRiANxTQtUsUae9WX7n6"),
+]
+
+
+@pytest.mark.parametrize("shared", [False, True], ids=["new", "signer"])
+@pytest.mark.parametrize("url_path, timestamp, expected", GOLDEN_X_BOGUS,
+                         ids=["hex32", "hex32-other-time", "hex16", "len33", "params"])
+def test_golden_x_bogus(url_path, timestamp, expected, shared):
+    instance = XBogus.signer(USER_AGENT) if shared else XBogus(USER_AGENT)
+    with mock.patch.object(xbogus.time, "time", return_value=timestamp):
+        params, xb, user_agent = instance.getXBogus(url_path)
+    assert xb == expected
+    assert params == "%s&X-Bogus=%s" % (url_path, expected)
+    assert user_agent == USER_AGENT
+
+
+@pytest.mark.parametrize("url_path, timestamp, expected", GOLDEN_X_BOGUS,
+                         ids=["hex32", "hex32-other-time", "hex16", "len33", "params"])
+def test_shared_timer_matches_clock(url_path, timestamp, expected):
+    assert XBogus.signer(USER_AGENT).getXBogus(url_path, timestamp)[1] == expected